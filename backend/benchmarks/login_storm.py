@@ -0,0 +1,155 @@
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+from collections import Counter
+
+# Catalog latency while a burst of logins hashes passwords. The catalog
+# clients run alone first, then again while --login-concurrency clients log
+# in as fast as they can. Run from backend/:
+#
+#   python -m benchmarks.login_storm --logins 400 --login-concurrency 200
+#   python -m benchmarks.login_storm --password-workers 1 --bcrypt-rounds 12
+#
+# A 503 on login is the password pool shedding load, not a failure.
+
+CATALOG_SCENARIOS = ("book.list", "book.search", "category.list")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Benchmark catalog latency during a login storm.")
+    parser.add_argument("--database-url", help="Defaults to a temporary SQLite file")
+    parser.add_argument("--books", type=int, default=5000)
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--borrows", type=int, default=20000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--logins", type=int, default=400)
+    parser.add_argument("--login-concurrency", type=int, default=200)
+    parser.add_argument("--catalog-requests", type=int, default=1000, help="Requests in the idle phase")
+    parser.add_argument("--catalog-concurrency", type=int, default=10)
+    parser.add_argument("--password-workers", type=int, help="PASSWORD_POOL_WORKERS")
+    parser.add_argument("--bcrypt-rounds", type=int, default=12, help="BCRYPT_ROUNDS")
+    parser.add_argument("--async-db", action="store_true", help="Serve through the DB_ASYNC routers")
+    return parser.parse_args()
+
+
+async def drive(client, ctx, scenarios, concurrency: int, total: int = None, until=None) -> dict:
+    # Round-robin over `scenarios` for `total` requests, or until `until` is set
+    from benchmarks.run import summarize
+
+    latencies: list[float] = []
+    statuses: Counter = Counter()
+    sent = 0
+
+    async def worker():
+        nonlocal sent
+        while (total is None or sent < total) and not (until is not None and until.is_set()):
+            scenario = scenarios[sent % len(scenarios)]
+            sent += 1
+            started = time.perf_counter()
+            response = await client.request(scenario.method, **scenario.build(ctx))
+            latencies.append(time.perf_counter() - started)
+            statuses[response.status_code] += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return summarize(latencies, statuses, time.perf_counter() - started)
+
+
+async def storm(args) -> list[tuple[str, dict]]:
+    import httpx
+
+    import config.database as database
+    import main
+    from benchmarks.scenarios import SCENARIOS, BenchmarkContext
+    from benchmarks.seed import reset_schema, seed_dataset
+
+    reset_schema(database.engine)
+    db = database.SessionLocal()
+    try:
+        started = time.perf_counter()
+        seed_dataset(db, 20, args.books, args.users, args.borrows, args.seed)
+        print(f"Seeded {args.books} books, {args.users} users in {time.perf_counter() - started:.1f}s")
+        ctx = BenchmarkContext(db, 0, args.seed)
+    finally:
+        db.close()
+
+    by_name = {scenario.name: scenario for scenario in SCENARIOS}
+    catalog = [by_name[name] for name in CATALOG_SCENARIOS]
+    login = [by_name["auth.login"]]
+
+    client = httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=main.app), base_url="http://benchmark", timeout=120
+    )
+    lifespan = main.app.router.lifespan_context(main.app)
+    await lifespan.__aenter__()
+    try:
+        async with client:
+            await drive(client, ctx, catalog, args.catalog_concurrency, total=len(catalog) * 5)
+            idle = await drive(client, ctx, catalog, args.catalog_concurrency, total=args.catalog_requests)
+
+            done = asyncio.Event()
+
+            async def logins():
+                try:
+                    return await drive(client, ctx, login, args.login_concurrency, total=args.logins)
+                finally:
+                    done.set()
+
+            during, logged_in = await asyncio.gather(
+                drive(client, ctx, catalog, args.catalog_concurrency, until=done), logins()
+            )
+    finally:
+        await lifespan.__aexit__(None, None, None)
+
+    return [("catalog, idle", idle), ("catalog, login storm", during), ("login", logged_in)]
+
+
+def main():
+    args = parse_args()
+    path = None
+    if args.database_url:
+        os.environ["DATABASE_URL"] = args.database_url
+    else:
+        fd, path = tempfile.mkstemp(suffix=".db")
+        os.close(fd)
+        os.environ["DATABASE_URL"] = f"sqlite:///{path}"
+    os.environ.setdefault("SECRET_KEY", "benchmark-secret")
+    os.environ["SQL_METRICS"] = "false"
+    os.environ["DB_ASYNC"] = "true" if args.async_db else "false"
+    os.environ["DB_AUTO_MIGRATE"] = "false"
+    os.environ["BCRYPT_ROUNDS"] = str(args.bcrypt_rounds)
+    if args.password_workers:
+        os.environ["PASSWORD_POOL_WORKERS"] = str(args.password_workers)
+    # Background jobs would compete with the measured requests
+    for job in ("OVERDUE_SCAN", "STATS_RECONCILE", "BORROW_ARCHIVE"):
+        os.environ[f"{job}_INTERVAL_SECONDS"] = "0"
+    os.environ["TYPEAHEAD_REFRESH_SECONDS"] = "0"
+    os.environ["SEARCH_INDEX_REFRESH_SECONDS"] = "0"
+
+    try:
+        rows = asyncio.run(storm(args))
+    finally:
+        if path:
+            import config.database as database
+
+            database.engine.dispose()
+            os.remove(path)
+
+    print()
+    header = f"{'phase':<24}{'reqs':>7}{'rps':>9}{'p50':>9}{'p95':>9}{'p99':>9}   status"
+    print(header)
+    print("-" * len(header))
+    for name, row in rows:
+        status = ", ".join(f"{code}: {count}" for code, count in row["status"].items())
+        print(
+            f"{name:<24}{row['requests']:>7}{row['rps']:>9.1f}{row['p50_ms']:>9.2f}"
+            f"{row['p95_ms']:>9.2f}{row['p99_ms']:>9.2f}   {status}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,323 @@
+import argparse
+import asyncio
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+from collections import Counter
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from typing import Optional
+
+# Load-test harness for every API route. Run from backend/:
+#
+#   python -m benchmarks.run --database-url sqlite:///bench.db --reset --save-baseline
+#   python -m benchmarks.run --database-url sqlite:///bench.db --reset
+#   python -m benchmarks.run --database-url postgresql://u:p@localhost/bench --async-db
+#
+# The app is driven in-process through ASGI unless --url points at a running
+# server. Point --database-url at a dedicated database: --reset drops and
+# recreates every table in it.
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_BASELINE = os.path.join(BENCHMARK_DIR, "baseline.json")
+
+# Per-request SQL statement counter, visible to the threadpool and greenlets
+# the app runs its database work in
+statement_count: ContextVar[Optional[list]] = ContextVar("statement_count", default=None)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Benchmark every API route.")
+    parser.add_argument("--database-url", default=os.getenv("DATABASE_URL"))
+    parser.add_argument("--url", help="Base URL of a running server instead of in-process ASGI")
+    parser.add_argument("--async-db", action="store_true", help="Serve through the DB_ASYNC routers")
+    parser.add_argument("--reset", action="store_true", help="Drop, recreate and reseed the database")
+    parser.add_argument("--categories", type=int, default=20)
+    parser.add_argument("--books", type=int, default=5000)
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--borrows", type=int, default=50000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--requests", type=int, default=200, help="Requests per scenario")
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--warmup", type=int, default=5, help="Unrecorded requests per scenario")
+    parser.add_argument("--only", help="Comma-separated scenario name prefixes")
+    parser.add_argument("--exact", action="store_true", help="Match --only names exactly")
+    parser.add_argument("--output", help="Write results JSON here")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--tolerance", type=float, default=0.10)
+    parser.add_argument("--fail-on-regression", action="store_true")
+    return parser.parse_args()
+
+
+def configure_environment(args):
+    # Must run before the app modules are imported: they read it at import
+    if args.database_url:
+        os.environ["DATABASE_URL"] = args.database_url
+    os.environ["DB_ASYNC"] = "true" if args.async_db else "false"
+    # Background jobs would compete with the measured requests
+    os.environ["OVERDUE_SCAN_INTERVAL_SECONDS"] = "0"
+    os.environ["STATS_RECONCILE_INTERVAL_SECONDS"] = "0"
+    os.environ["BORROW_ARCHIVE_INTERVAL_SECONDS"] = "0"
+    os.environ["TYPEAHEAD_REFRESH_SECONDS"] = "0"
+    os.environ["SEARCH_INDEX_REFRESH_SECONDS"] = "0"
+    os.environ["DB_AUTO_MIGRATE"] = "false"
+    os.environ.setdefault("SECRET_KEY", "benchmark-secret")
+
+
+def count_statement(conn, cursor, statement, parameters, context, executemany):
+    counter = statement_count.get()
+    if counter is not None:
+        counter[0] += 1
+
+
+def percentile(sorted_values: list[float], fraction: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(int(round(fraction * (len(sorted_values) - 1))), len(sorted_values) - 1)
+    return sorted_values[index]
+
+
+async def run_scenario(client, ctx, scenario, total: int, concurrency: int, record: bool):
+    latencies: list[float] = []
+    statements: list[int] = []
+    statuses: Counter = Counter()
+    remaining = total
+
+    async def worker():
+        nonlocal remaining
+        while remaining > 0:
+            remaining -= 1
+            request = scenario.build(ctx)
+            counter = [0]
+            token = statement_count.set(counter)
+            started = time.perf_counter()
+            try:
+                response = await client.request(scenario.method, **request)
+            finally:
+                statement_count.reset(token)
+            latencies.append(time.perf_counter() - started)
+            statements.append(counter[0])
+            statuses[response.status_code] += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(min(concurrency, total))))
+    elapsed = time.perf_counter() - started
+    if not record:
+        return None
+
+    return {
+        **summarize(latencies, statuses, elapsed),
+        "sql_per_request": round(statistics.fmean(statements), 2) if statements else None,
+    }
+
+
+def summarize(latencies: list[float], statuses: Counter, elapsed: float) -> dict:
+    latencies = sorted(latencies)
+    total = len(latencies)
+    return {
+        "requests": total,
+        "errors": sum(count for code, count in statuses.items() if code >= 400),
+        "status": {str(code): count for code, count in sorted(statuses.items())},
+        "rps": round(total / elapsed, 1) if elapsed else 0.0,
+        "mean_ms": round(statistics.fmean(latencies) * 1000, 2) if latencies else 0.0,
+        "p50_ms": round(percentile(latencies, 0.50) * 1000, 2),
+        "p95_ms": round(percentile(latencies, 0.95) * 1000, 2),
+        "p99_ms": round(percentile(latencies, 0.99) * 1000, 2),
+    }
+
+
+def uncovered_routes(app, scenarios) -> list[str]:
+    covered = {(scenario.method, scenario.route) for scenario in scenarios}
+    routes = [
+        (method.upper(), path)
+        for path, operations in app.openapi()["paths"].items()
+        for method in operations
+    ]
+    return [f"{method} {path}" for method, path in routes if (method, path) not in covered]
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list[str]:
+    regressions = []
+    for name, current in results["scenarios"].items():
+        base = baseline["scenarios"].get(name)
+        if not base:
+            continue
+        reasons = []
+        if base["p95_ms"] and current["p95_ms"] > base["p95_ms"] * (1 + tolerance):
+            reasons.append(f"p95 {base['p95_ms']} -> {current['p95_ms']} ms")
+        if base["rps"] and current["rps"] < base["rps"] * (1 - tolerance):
+            reasons.append(f"rps {base['rps']} -> {current['rps']}")
+        if (
+            base.get("sql_per_request") is not None
+            and current.get("sql_per_request") is not None
+            and current["sql_per_request"] > base["sql_per_request"] + 0.5
+        ):
+            reasons.append(
+                f"sql/req {base['sql_per_request']} -> {current['sql_per_request']}"
+            )
+        if reasons:
+            regressions.append(f"{name}: {', '.join(reasons)}")
+    return regressions
+
+
+def change(current: float, base: Optional[float]) -> str:
+    if not base:
+        return ""
+    return f"{(current / base - 1) * 100:+.0f}%"
+
+
+def print_report(results: dict, baseline: Optional[dict]):
+    header = (
+        f"{'scenario':<30}{'reqs':>6}{'err':>6}{'rps':>9}{'p50':>9}{'p95':>9}"
+        f"{'p99':>9}{'sql':>7}"
+    )
+    if baseline:
+        header += f"{'Δp95':>8}{'Δrps':>8}"
+    print(header)
+    print("-" * len(header))
+    for name, row in results["scenarios"].items():
+        sql = "-" if row["sql_per_request"] is None else f"{row['sql_per_request']:g}"
+        line = (
+            f"{name:<30}{row['requests']:>6}{row['errors']:>6}{row['rps']:>9.1f}"
+            f"{row['p50_ms']:>9.2f}{row['p95_ms']:>9.2f}{row['p99_ms']:>9.2f}{sql:>7}"
+        )
+        base = baseline["scenarios"].get(name) if baseline else None
+        if base:
+            line += f"{change(row['p95_ms'], base['p95_ms']):>8}{change(row['rps'], base['rps']):>8}"
+        print(line)
+
+
+async def benchmark(args) -> dict:
+    import httpx
+    from sqlalchemy import event
+
+    import config.database as database
+    import main
+    from benchmarks.scenarios import SCENARIOS, BenchmarkContext
+    from benchmarks.seed import is_seeded, reset_schema, seed_dataset
+
+    dataset = {
+        "categories": args.categories,
+        "books": args.books,
+        "users": args.users,
+        "borrows": args.borrows,
+        "seed": args.seed,
+    }
+    if args.reset:
+        reset_schema(database.engine)
+    else:
+        database.Base.metadata.create_all(database.engine)
+    db = database.SessionLocal()
+    try:
+        if not is_seeded(db):
+            started = time.perf_counter()
+            seed_dataset(db, args.categories, args.books, args.users, args.borrows, args.seed)
+            print(f"Seeded {dataset} in {time.perf_counter() - started:.1f}s")
+        else:
+            print("Reusing the existing dataset (pass --reset to reseed)")
+        ctx = BenchmarkContext(db, args.requests + args.warmup, args.seed)
+    finally:
+        db.close()
+
+    scenarios = SCENARIOS
+    if args.only:
+        prefixes = tuple(args.only.split(","))
+        scenarios = [
+            scenario
+            for scenario in scenarios
+            if (scenario.name in prefixes if args.exact else scenario.name.startswith(prefixes))
+        ]
+    # Reads first so they see the seeded dataset rather than the writes' churn
+    scenarios = sorted(scenarios, key=lambda scenario: scenario.method != "GET")
+
+    missing = uncovered_routes(main.app, SCENARIOS)
+    if missing:
+        print("Routes without a scenario: " + ", ".join(missing))
+
+    results = {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "dialect": database.engine.dialect.name,
+            "async_db": args.async_db,
+            "target": args.url or "in-process",
+            "dataset": dataset,
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+            "python": platform.python_version(),
+        },
+        "scenarios": {},
+    }
+
+    if args.url:
+        client = httpx.AsyncClient(base_url=args.url, timeout=60)
+        lifespan = None
+    else:
+        event.listen(database.engine, "before_cursor_execute", count_statement)
+        if database.async_engine is not None:
+            event.listen(database.async_engine.sync_engine, "before_cursor_execute", count_statement)
+        client = httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=main.app), base_url="http://benchmark", timeout=60
+        )
+        lifespan = main.app.router.lifespan_context(main.app)
+        await lifespan.__aenter__()
+
+    try:
+        async with client:
+            for scenario in scenarios:
+                total = max(int(args.requests * scenario.share), 1)
+                warmup = max(int(args.warmup * scenario.share), 1) if args.warmup else 0
+                if warmup:
+                    await run_scenario(client, ctx, scenario, warmup, args.concurrency, False)
+                row = await run_scenario(client, ctx, scenario, total, args.concurrency, True)
+                if args.url:
+                    row["sql_per_request"] = None
+                results["scenarios"][scenario.name] = row
+                print(f"  {scenario.name}: p95 {row['p95_ms']} ms, {row['rps']} rps")
+    finally:
+        if lifespan is not None:
+            await lifespan.__aexit__(None, None, None)
+
+    return results
+
+
+def main():
+    args = parse_args()
+    configure_environment(args)
+    results = asyncio.run(benchmark(args))
+
+    baseline = None
+    if not args.save_baseline and os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        if baseline["meta"]["dataset"] != results["meta"]["dataset"]:
+            print("Warning: baseline was recorded with a different dataset")
+
+    print()
+    print_report(results, baseline)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+    if args.save_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"\nBaseline saved to {args.baseline}")
+        return 0
+
+    if baseline:
+        regressions = compare(results, baseline, args.tolerance)
+        if regressions:
+            print(f"\nRegressions beyond {args.tolerance:.0%}:")
+            for regression in regressions:
+                print("  " + regression)
+            if args.fail_on_regression:
+                return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,377 @@
+import itertools
+import random
+from dataclasses import dataclass
+from datetime import date, timedelta
+from typing import Callable, Optional
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from core.jwt import create_access_token
+from models.book import Book
+from models.borrow import Borrows, BorrowStatus
+from models.categories import Category
+from models.user import User
+from services.auth import issue_tokens
+
+from benchmarks.seed import BENCHMARK_PASSWORD, WORDS, user_email
+
+# Number of regular users whose access tokens the clients rotate through
+TOKEN_USERS = 200
+
+
+class BenchmarkContext:
+    # Ids and credentials the request builders draw from. Write scenarios
+    # consume pools (refresh tokens, borrows to return) so each request
+    # exercises the real write path instead of a no-op.
+
+    def __init__(self, db: Session, requests: int, rng_seed: int = 42):
+        self.rng = random.Random(rng_seed)
+        self.counter = itertools.count(1)
+        self.max_book_id = db.scalar(select(func.max(Book.id)))
+        self.max_category_id = db.scalar(select(func.max(Category.id)))
+        self.due_date = (date.today() + timedelta(days=14)).isoformat()
+
+        users = db.execute(
+            select(User.id, User.name, User.role).order_by(User.id).limit(TOKEN_USERS + 1)
+        ).all()
+        self.admin = self.headers_for(*users[0])
+        self.user_ids = [user.id for user in users[1:]]
+        self.users = {user.id: self.headers_for(*user) for user in users[1:]}
+
+        self.borrowed = self.pool(db, BorrowStatus.borrowed)
+        self.waiting = self.pool(db, BorrowStatus.waiting_approve)
+
+        # Refresh tokens for the refresh and logout scenarios, one per request
+        refresh_users = db.scalars(
+            select(User).where(User.id.in_(self.user_ids))
+        ).all()
+        self.refresh_tokens = []
+        for user in itertools.islice(itertools.cycle(refresh_users), 2 * requests):
+            self.refresh_tokens.append(issue_tokens(user, db)["refresh_token"])
+        db.commit()
+
+    @staticmethod
+    def headers_for(user_id: int, name: str, role: str) -> dict:
+        token = create_access_token(
+            {"sub": user_email(user_id), "id": user_id, "name": name, "role": role}
+        )
+        return {"Authorization": f"Bearer {token}"}
+
+    def pool(self, db: Session, borrow_status: BorrowStatus) -> list:
+        return db.execute(
+            select(Borrows.id, Borrows.user_id)
+            .where(Borrows.status == borrow_status, Borrows.user_id.in_(self.user_ids))
+            .order_by(Borrows.id)
+        ).all()
+
+    def user(self) -> tuple[int, dict]:
+        user_id = self.rng.choice(self.user_ids)
+        return user_id, self.users[user_id]
+
+    def book_id(self) -> int:
+        return self.rng.randint(1, self.max_book_id)
+
+    def term(self) -> str:
+        return self.rng.choice(WORDS)
+
+    def unique(self, prefix: str) -> str:
+        return f"{prefix} {next(self.counter)} {self.rng.random():.6f}"
+
+    def next_borrow(self, pool: list) -> Optional[tuple[int, int]]:
+        return pool.pop() if pool else None
+
+
+@dataclass
+class Scenario:
+    name: str
+    method: str
+    route: str
+    build: Callable[[BenchmarkContext], dict]
+    # Fraction of --requests to send, for scenarios dominated by bcrypt
+    share: float = 1.0
+
+
+def get(path, headers, **params):
+    return {"url": path, "headers": headers, "params": params}
+
+
+def return_borrow(ctx: BenchmarkContext) -> dict:
+    borrow = ctx.next_borrow(ctx.borrowed)
+    if borrow is None:
+        return {"url": "/api/borrow/return/0", "headers": ctx.user()[1]}
+    return {
+        "url": f"/api/borrow/return/{borrow.id}",
+        "headers": ctx.users[borrow.user_id],
+    }
+
+
+def approve_return(ctx: BenchmarkContext) -> dict:
+    borrow = ctx.next_borrow(ctx.waiting)
+    return {
+        "url": f"/api/borrow/approve_return/{borrow.id if borrow else 0}",
+        "headers": ctx.admin,
+    }
+
+
+def import_books(ctx: BenchmarkContext) -> dict:
+    # A fresh category per file, so concurrent imports do not race to create it
+    category = ctx.unique("Imported")
+    rows = ["title,author,year,quantity,category"]
+    for _ in range(100):
+        rows.append(f"{ctx.unique('Imported')},Import Author,2001,3,{category}")
+    return {
+        "url": "/api/book/import",
+        "headers": ctx.admin,
+        "files": {"file": ("books.csv", "\n".join(rows).encode(), "text/csv")},
+    }
+
+
+SCENARIOS = [
+    # root
+    Scenario("root", "GET", "/", lambda ctx: get("/", ctx.user()[1])),
+    # auth
+    Scenario(
+        "auth.login",
+        "POST",
+        "/api/auth/login",
+        lambda ctx: {
+            "url": "/api/auth/login",
+            "json": {"email": user_email(ctx.user()[0]), "password": BENCHMARK_PASSWORD},
+        },
+        share=0.1,
+    ),
+    Scenario(
+        "auth.register",
+        "POST",
+        "/api/auth/register",
+        lambda ctx: {
+            "url": "/api/auth/register",
+            "json": {
+                "name": "Bench",
+                "email": f"new{next(ctx.counter)}.{ctx.rng.randint(0, 10**8)}@library-bench.com",
+                "password": BENCHMARK_PASSWORD,
+            },
+        },
+        share=0.1,
+    ),
+    Scenario(
+        "auth.refresh",
+        "POST",
+        "/api/auth/refresh",
+        lambda ctx: {
+            "url": "/api/auth/refresh",
+            "json": {"refresh_token": ctx.refresh_tokens.pop()},
+        },
+    ),
+    Scenario(
+        "auth.logout",
+        "POST",
+        "/api/auth/logout",
+        lambda ctx: {
+            "url": "/api/auth/logout",
+            "json": {"refresh_token": ctx.refresh_tokens.pop()},
+        },
+    ),
+    Scenario(
+        "auth.principal_cache",
+        "GET",
+        "/api/auth/principal_cache",
+        lambda ctx: get("/api/auth/principal_cache", ctx.admin),
+    ),
+    # category
+    Scenario(
+        "category.list",
+        "GET",
+        "/api/category/",
+        lambda ctx: get("/api/category/", ctx.user()[1]),
+    ),
+    Scenario(
+        "category.create",
+        "POST",
+        "/api/category/",
+        lambda ctx: {
+            "url": "/api/category/",
+            "headers": ctx.admin,
+            "json": {"name": ctx.unique("Category")},
+        },
+    ),
+    Scenario(
+        "category.update",
+        "PUT",
+        "/api/category/{category_id}",
+        lambda ctx: {
+            "url": f"/api/category/{ctx.rng.randint(1, ctx.max_category_id)}",
+            "headers": ctx.admin,
+            "json": {"name": ctx.unique("Category")},
+        },
+    ),
+    # book
+    Scenario(
+        "book.list",
+        "GET",
+        "/api/book/",
+        lambda ctx: get("/api/book/", ctx.user()[1]),
+    ),
+    Scenario(
+        "book.list.normalized",
+        "GET",
+        "/api/book/",
+        lambda ctx: get("/api/book/", ctx.user()[1], shape="normalized"),
+    ),
+    Scenario(
+        "book.list.ndjson",
+        "GET",
+        "/api/book/",
+        lambda ctx: get("/api/book/", ctx.user()[1], format="ndjson"),
+    ),
+    Scenario(
+        "book.search",
+        "GET",
+        "/api/book/search",
+        lambda ctx: get("/api/book/search", ctx.user()[1], q=ctx.term()),
+    ),
+    Scenario(
+        "book.autocomplete",
+        "GET",
+        "/api/book/autocomplete",
+        lambda ctx: get("/api/book/autocomplete", ctx.user()[1], q=ctx.term()[:3]),
+    ),
+    Scenario(
+        "book.search.filters",
+        "GET",
+        "/api/book/search",
+        lambda ctx: get(
+            "/api/book/search", ctx.user()[1], category_name="Category", book_name=ctx.term()
+        ),
+    ),
+    Scenario(
+        "book.create",
+        "POST",
+        "/api/book/",
+        lambda ctx: {
+            "url": "/api/book/",
+            "headers": ctx.admin,
+            "json": {
+                "title": ctx.unique("Book"),
+                "author": "Bench Author",
+                "year": 2020,
+                "quantity": 5,
+                "category_id": ctx.rng.randint(1, ctx.max_category_id),
+            },
+        },
+    ),
+    Scenario(
+        "book.update",
+        "PUT",
+        "/api/book/{book_id}",
+        lambda ctx: {
+            "url": f"/api/book/{ctx.book_id()}",
+            "headers": ctx.admin,
+            "json": {
+                "title": ctx.unique("Book"),
+                "category_id": ctx.rng.randint(1, ctx.max_category_id),
+            },
+        },
+    ),
+    Scenario("book.import", "POST", "/api/book/import", import_books, share=0.1),
+    # borrow
+    Scenario(
+        "borrow.create",
+        "POST",
+        "/api/borrow/",
+        lambda ctx: {
+            "url": "/api/borrow/",
+            "headers": ctx.user()[1],
+            "json": {"book_id": ctx.book_id(), "due_date": ctx.due_date},
+        },
+    ),
+    Scenario(
+        "borrow.batch",
+        "POST",
+        "/api/borrow/batch",
+        lambda ctx: {
+            "url": "/api/borrow/batch",
+            "headers": ctx.user()[1],
+            "json": {
+                "book_ids": [ctx.book_id() for _ in range(5)],
+                "due_date": ctx.due_date,
+            },
+        },
+    ),
+    Scenario("borrow.return", "PUT", "/api/borrow/return/{borrow_id}", return_borrow),
+    Scenario(
+        "borrow.approve_return",
+        "PUT",
+        "/api/borrow/approve_return/{borrow_id}",
+        approve_return,
+    ),
+    Scenario(
+        "borrow.bulk_approve_return",
+        "PUT",
+        "/api/borrow/approve_return",
+        lambda ctx: {
+            "url": "/api/borrow/approve_return",
+            "headers": ctx.admin,
+            "json": {"book_ids": [ctx.book_id() for _ in range(10)]},
+        },
+    ),
+    Scenario(
+        "borrow.history",
+        "GET",
+        "/api/borrow/history",
+        lambda ctx: get("/api/borrow/history", ctx.user()[1]),
+    ),
+    Scenario(
+        "borrow.current",
+        "GET",
+        "/api/borrow/current_borrow",
+        lambda ctx: get("/api/borrow/current_borrow", ctx.user()[1]),
+    ),
+    Scenario(
+        "borrow.all_borrowed",
+        "GET",
+        "/api/borrow/all_borrowed",
+        lambda ctx: get("/api/borrow/all_borrowed", ctx.admin),
+    ),
+    Scenario(
+        "borrow.all_borrowed.filtered",
+        "GET",
+        "/api/borrow/all_borrowed",
+        lambda ctx: get("/api/borrow/all_borrowed", ctx.admin, status="borrowed", limit=50),
+    ),
+    Scenario(
+        "borrow.overdue",
+        "GET",
+        "/api/borrow/overdue",
+        lambda ctx: get("/api/borrow/overdue", ctx.admin),
+    ),
+    Scenario(
+        "borrow.overdue_counts",
+        "GET",
+        "/api/borrow/overdue/counts",
+        lambda ctx: get("/api/borrow/overdue/counts", ctx.admin, by="book"),
+    ),
+    Scenario(
+        "borrow.overdue_scan",
+        "POST",
+        "/api/borrow/overdue/scan",
+        lambda ctx: {"url": "/api/borrow/overdue/scan", "headers": ctx.admin},
+    ),
+    Scenario(
+        "borrow.archive",
+        "POST",
+        "/api/borrow/archive",
+        lambda ctx: {"url": "/api/borrow/archive", "headers": ctx.admin},
+        share=0.1,
+    ),
+    # stats
+    Scenario("stats", "GET", "/api/stats/", lambda ctx: get("/api/stats/", ctx.admin)),
+    Scenario(
+        "stats.reconcile",
+        "POST",
+        "/api/stats/reconcile",
+        lambda ctx: {"url": "/api/stats/reconcile", "headers": ctx.admin},
+        share=0.1,
+    ),
+]
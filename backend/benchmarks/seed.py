@@ -0,0 +1,153 @@
+import random
+from datetime import date, timedelta
+
+from sqlalchemy import func, insert, select, text
+from sqlalchemy.orm import Session
+
+from config.database import Base
+from core.jwt import pwd_context
+from models.book import Book
+from models.borrow import Borrows, BorrowStatus
+from models.categories import Category
+from models.user import User
+from services.overdue import mark_overdue
+from services.stats import reconcile_stats
+
+BENCHMARK_PASSWORD = "benchmark"
+INSERT_BATCH_SIZE = 5000
+
+WORDS = (
+    "history science python garden ocean night river empire code data "
+    "music stone winter light shadow city forest dream war love"
+).split()
+STATUS_WEIGHTS = {
+    BorrowStatus.returned: 70,
+    BorrowStatus.borrowed: 20,
+    BorrowStatus.waiting_approve: 10,
+}
+
+
+def user_email(user_id: int) -> str:
+    return f"user{user_id}@library-bench.com"
+
+
+def insert_batches(db: Session, model, rows: list[dict]):
+    for start in range(0, len(rows), INSERT_BATCH_SIZE):
+        db.execute(insert(model), rows[start : start + INSERT_BATCH_SIZE])
+
+
+def reset_schema(engine):
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+
+
+def is_seeded(db: Session) -> bool:
+    return db.scalar(select(func.count(Book.id))) > 0
+
+
+def sync_sequences(db: Session):
+    # Rows were inserted with explicit ids; move the PostgreSQL sequences past
+    # them so API inserts do not collide
+    if db.get_bind().dialect.name != "postgresql":
+        return
+    for table in ("categories", "users", "books", "borrows"):
+        db.execute(
+            text(
+                f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), "
+                f"(SELECT max(id) FROM {table}))"
+            )
+        )
+
+
+def seed_dataset(
+    db: Session,
+    categories: int,
+    books: int,
+    users: int,
+    borrows: int,
+    rng_seed: int = 42,
+):
+    # Deterministic synthetic library: the same arguments always produce
+    # the same rows, so runs against a fresh database are comparable.
+    rng = random.Random(rng_seed)
+    today = date.today()
+
+    insert_batches(
+        db,
+        Category,
+        [{"id": i, "name": f"Category {i}"} for i in range(1, categories + 1)],
+    )
+
+    # Users share one hash; user 1 is the admin
+    password = pwd_context.hash(BENCHMARK_PASSWORD)
+    insert_batches(
+        db,
+        User,
+        [
+            {
+                "id": i,
+                "name": f"User {i}",
+                "email": user_email(i),
+                "password": password,
+                "role": "admin" if i == 1 else "borrower",
+            }
+            for i in range(1, users + 1)
+        ],
+    )
+
+    borrow_rows = []
+    on_loan = [0] * (books + 1)
+    active = set()
+    statuses = list(STATUS_WEIGHTS)
+    weights = list(STATUS_WEIGHTS.values())
+    for i in range(1, borrows + 1):
+        user_id = rng.randint(1, users)
+        book_id = rng.randint(1, books)
+        borrow_status = rng.choices(statuses, weights)[0]
+        if borrow_status != BorrowStatus.returned:
+            # At most one unreturned borrow per user and book, as the API enforces
+            if (user_id, book_id) in active:
+                borrow_status = BorrowStatus.returned
+            else:
+                active.add((user_id, book_id))
+                on_loan[book_id] += 1
+        borrow_date = today - timedelta(days=rng.randint(0, 365))
+        due_date = borrow_date + timedelta(days=14)
+        borrow_rows.append(
+            {
+                "id": i,
+                "user_id": user_id,
+                "book_id": book_id,
+                "borrow_date": borrow_date,
+                "due_date": due_date,
+                "return_date": (
+                    None
+                    if borrow_status == BorrowStatus.borrowed
+                    else min(due_date + timedelta(days=rng.randint(-10, 5)), today)
+                ),
+                "status": borrow_status,
+            }
+        )
+
+    book_rows = []
+    for i in range(1, books + 1):
+        quantity = rng.randint(1, 10) + on_loan[i]
+        book_rows.append(
+            {
+                "id": i,
+                "category_id": rng.randint(1, categories),
+                "title": f"{' '.join(rng.sample(WORDS, 3)).title()} {i}",
+                "author": f"Author {rng.randint(1, max(books // 10, 1))}",
+                "year": rng.randint(1950, 2025),
+                "quantity": quantity,
+                "available_quantity": quantity - on_loan[i],
+            }
+        )
+    insert_batches(db, Book, book_rows)
+    insert_batches(db, Borrows, borrow_rows)
+    sync_sequences(db)
+    db.commit()
+
+    # Fill the derived counters the services normally maintain
+    reconcile_stats(db)
+    mark_overdue(db)
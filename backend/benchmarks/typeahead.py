@@ -0,0 +1,81 @@
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+
+# Memory footprint and lookup latency of the typeahead index. Run from
+# backend/:
+#
+#   python -m benchmarks.typeahead --books 100000
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Benchmark the typeahead index.")
+    parser.add_argument("--books", type=int, default=100000)
+    parser.add_argument("--borrows", type=int, default=200000)
+    parser.add_argument("--lookups", type=int, default=10000)
+    parser.add_argument("--seed", type=int, default=42)
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    fd, path = tempfile.mkstemp(suffix=".db")
+    os.close(fd)
+    os.environ["DATABASE_URL"] = f"sqlite:///{path}"
+    os.environ.setdefault("SECRET_KEY", "benchmark-secret")
+    os.environ["SQL_METRICS"] = "false"
+
+    import config.database as database
+    from benchmarks.seed import WORDS, reset_schema, seed_dataset
+    from services.typeahead import TypeaheadIndex
+
+    try:
+        reset_schema(database.engine)
+        db = database.SessionLocal()
+        seed_dataset(db, 20, args.books, max(args.books // 100, 10), args.borrows, args.seed)
+
+        index = TypeaheadIndex()
+        tracemalloc.start()
+        started = time.perf_counter()
+        index.build(db)
+        build_time = time.perf_counter() - started
+        size, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        db.close()
+
+        rng = random.Random(args.seed)
+        queries = []
+        for _ in range(args.lookups):
+            word = rng.choice(WORDS)
+            if rng.random() < 0.7:
+                queries.append(word[: rng.randint(1, len(word))])
+            else:
+                queries.append(f"{word} {rng.choice(WORDS)[:2]}")
+
+        latencies = []
+        for query in queries:
+            started = time.perf_counter()
+            index.suggest(query)
+            latencies.append(time.perf_counter() - started)
+        latencies.sort()
+
+        per_100k = size / args.books * 100000
+        print(f"books            {args.books}")
+        print(f"tokens           {len(index._tokens)}")
+        print(f"build            {build_time:.2f} s")
+        print(f"memory           {size / 2**20:.1f} MiB ({per_100k / 2**20:.1f} MiB per 100k titles)")
+        for label, fraction in (("p50", 0.50), ("p95", 0.95), ("p99", 0.99)):
+            value = latencies[min(int(fraction * len(latencies)), len(latencies) - 1)]
+            print(f"lookup {label}       {value * 1e6:.0f} µs")
+    finally:
+        database.engine.dispose()
+        os.remove(path)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,26 +1,93 @@
 import os
-from sqlalchemy import create_engine, engine
+from fastapi import Request
+from sqlalchemy import create_engine, engine, make_url
+from sqlalchemy.exc import DBAPIError
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.ext.declarative import declarative_base
 from dotenv import load_dotenv
 
+from config.replica import RecentWriters, ReplicaPool
+from core.sql_metrics import instrument_engine
+
 # Load environment variables
 load_dotenv()
 
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
 # Database configuration from environment variables
 DB_USERNAME = os.getenv("DB_USERNAME")
 DB_PASSWORD = os.getenv("DB_PASSWORD")
 DB_HOST = os.getenv("DB_HOST")
 DB_PORT = os.getenv("DB_PORT")
 DB_NAME = os.getenv("DB_NAME")
+DB_ASYNC = os.getenv("DB_ASYNC", "false").lower() == "true"
+DB_CONNECT_TIMEOUT = int(os.getenv("DB_CONNECT_TIMEOUT", "5"))
+# Comma-separated SQLAlchemy URLs of read replicas, empty to read from primary
+DB_REPLICA_URLS = [u.strip() for u in os.getenv("DB_REPLICA_URLS", "").split(",") if u.strip()]
+DB_REPLICA_RETRY_SECONDS = float(os.getenv("DB_REPLICA_RETRY_SECONDS", "30"))
+READ_YOUR_WRITES_SECONDS = float(os.getenv("READ_YOUR_WRITES_SECONDS", "5"))
+ASYNC_DRIVERS = {"postgresql": "postgresql+asyncpg", "sqlite": "sqlite+aiosqlite"}
+
+# Full SQLAlchemy URL, e.g. for a benchmark database; overrides DB_* when set
+DATABASE_URL = os.getenv("DATABASE_URL")
 
-SQLALCHEMY_DATABASE_URL = (
+SQLALCHEMY_DATABASE_URL = DATABASE_URL or (
     f"postgresql://{DB_USERNAME}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
 )
 
-engine = create_engine(SQLALCHEMY_DATABASE_URL)
+
+def async_url(url: str) -> str:
+    # The same database through its async driver
+    url = make_url(url)
+    return url.set(drivername=ASYNC_DRIVERS[url.get_backend_name()]).render_as_string(
+        hide_password=False
+    )
+
+
+ASYNC_SQLALCHEMY_DATABASE_URL = (
+    f"postgresql+asyncpg://{DB_USERNAME}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
+)
+if DATABASE_URL:
+    ASYNC_SQLALCHEMY_DATABASE_URL = async_url(DATABASE_URL)
+
+engine = create_engine(
+    SQLALCHEMY_DATABASE_URL,
+    connect_args=(
+        {"connect_timeout": DB_CONNECT_TIMEOUT}
+        if make_url(SQLALCHEMY_DATABASE_URL).get_backend_name() == "postgresql"
+        else {}
+    ),
+)
+instrument_engine(engine)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+replicas = ReplicaPool(
+    [create_engine(url, pool_pre_ping=True) for url in DB_REPLICA_URLS],
+    retry_seconds=DB_REPLICA_RETRY_SECONDS,
+)
+for replica in replicas.engines:
+    instrument_engine(replica)
+recent_writers = RecentWriters(window=READ_YOUR_WRITES_SECONDS)
+
+# Async engine for the asyncpg request path, only built when DB_ASYNC=true
+async_engine = None
+AsyncSessionLocal = None
+# Async engines for the replicas, by the index of their sync engine
+async_replicas = []
+if DB_ASYNC:
+    from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+    async_engine = create_async_engine(ASYNC_SQLALCHEMY_DATABASE_URL)
+    instrument_engine(async_engine.sync_engine)
+    AsyncSessionLocal = async_sessionmaker(
+        async_engine, autoflush=False, expire_on_commit=False
+    )
+    for url, replica in zip(DB_REPLICA_URLS, replicas.engines):
+        async_replica = create_async_engine(async_url(url), pool_pre_ping=True)
+        instrument_engine(async_replica.sync_engine)
+        replicas.alias(async_replica.sync_engine, replica)
+        async_replicas.append(async_replica)
+
 Base = declarative_base()
 
 
@@ -32,8 +99,91 @@ def get_db():
         db.close()
 
 
-try:
-    with engine.connect() as conn:
-        print("Connected successfully")
-except Exception as e:
-    print(f"Error connecting to the database: {e}")
+def reads_from_primary(request: Request) -> bool:
+    if request.headers.get("x-read-primary"):
+        return True
+    client = request.headers.get("authorization")
+    return client is not None and client in recent_writers
+
+
+def get_read_db(request: Request):
+    # Session for read-only routes: a healthy replica when one is configured,
+    # the primary for read-your-writes clients or when every replica is down.
+    db = None
+    if not reads_from_primary(request):
+        while (replica := replicas.choose()) is not None:
+            db = SessionLocal(bind=replica)
+            try:
+                # Check out a connection now so a dead replica falls through
+                # to the next one instead of failing the request
+                db.connection()
+                break
+            except DBAPIError:
+                db.close()
+                db = None
+
+    if db is None:
+        yield from get_db()
+        return
+
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+async def get_async_read_db(request: Request):
+    # get_read_db for the async routes; the pool picks the replica and its
+    # async engine serves the session
+    db = None
+    if not reads_from_primary(request):
+        while (replica := replicas.choose()) is not None:
+            db = AsyncSessionLocal(bind=async_replicas[replicas.engines.index(replica)])
+            try:
+                await db.connection()
+                break
+            except DBAPIError:
+                await db.close()
+                db = None
+
+    if db is None:
+        db = AsyncSessionLocal()
+
+    async with db:
+        yield db
+
+
+def run_migrations():
+    # Upgrade the schema to the latest Alembic revision
+    from alembic import command
+    from alembic.config import Config
+
+    config = Config(os.path.join(BASE_DIR, "alembic.ini"))
+    config.attributes["configure_logger"] = False
+    with engine.begin() as connection:
+        config.attributes["connection"] = connection
+        command.upgrade(config, "head")
+
+
+def warm_pool(size: int):
+    # Open `size` pooled connections up front so the first requests do not
+    # pay for connection setup
+    connections = []
+    try:
+        for _ in range(size):
+            connections.append(engine.connect())
+    finally:
+        for connection in connections:
+            connection.close()
+
+
+def dispose_engines():
+    engine.dispose()
+    for replica in replicas.engines:
+        replica.dispose()
+
@@ -0,0 +1,95 @@
+import itertools
+import threading
+import time
+
+from sqlalchemy import Engine, event, text
+from sqlalchemy.exc import DBAPIError, OperationalError
+
+
+class ReplicaPool:
+    # Round-robin over read replicas. A replica that fails is skipped until
+    # `retry_seconds` have passed, then probed with SELECT 1 before reuse.
+
+    def __init__(self, engines: list[Engine], retry_seconds: float = 30):
+        self.engines = engines
+        self.retry_seconds = retry_seconds
+        self._cycle = itertools.cycle(range(len(engines))) if engines else None
+        self._down_until: dict[int, float] = {}
+        self._aliases: dict[Engine, Engine] = {}
+        self._lock = threading.Lock()
+        for engine in engines:
+            event.listen(engine, "handle_error", self._on_error)
+
+    def alias(self, alias: Engine, engine: Engine):
+        # Another engine on the same replica (e.g. an async engine's
+        # sync_engine) whose failures take `engine` out of rotation
+        self._aliases[alias] = engine
+        event.listen(alias, "handle_error", self._on_error)
+
+    def _on_error(self, context):
+        # Connection-level failures take the replica out of rotation
+        if context.is_disconnect or isinstance(
+            context.sqlalchemy_exception, OperationalError
+        ):
+            self.mark_down(context.engine)
+
+    def choose(self) -> Engine | None:
+        for _ in range(len(self.engines)):
+            with self._lock:
+                index = next(self._cycle)
+                down_until = self._down_until.get(index)
+            if down_until is None:
+                return self.engines[index]
+            if down_until <= time.monotonic() and self.probe(index):
+                return self.engines[index]
+        return None
+
+    def probe(self, index: int) -> bool:
+        try:
+            with self.engines[index].connect() as conn:
+                conn.execute(text("SELECT 1"))
+        except DBAPIError:
+            self.mark_down(self.engines[index])
+            return False
+        with self._lock:
+            self._down_until.pop(index, None)
+        return True
+
+    def mark_down(self, engine: Engine):
+        index = self.engines.index(self._aliases.get(engine, engine))
+        with self._lock:
+            self._down_until[index] = time.monotonic() + self.retry_seconds
+
+    def status(self) -> list[dict]:
+        now = time.monotonic()
+        with self._lock:
+            return [
+                {
+                    "url": engine.url.render_as_string(hide_password=True),
+                    "healthy": self._down_until.get(index, 0) <= now,
+                }
+                for index, engine in enumerate(self.engines)
+            ]
+
+
+class RecentWriters:
+    # Clients that wrote within the last `window` seconds read from the
+    # primary so they see their own writes despite replication lag.
+
+    def __init__(self, window: float = 5, max_size: int = 10000):
+        self.window = window
+        self.max_size = max_size
+        self._seen: dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def mark(self, key: str):
+        with self._lock:
+            if len(self._seen) >= self.max_size:
+                now = time.monotonic()
+                self._seen = {k: t for k, t in self._seen.items() if t > now}
+            self._seen[key] = time.monotonic() + self.window
+
+    def __contains__(self, key: str) -> bool:
+        with self._lock:
+            expires = self._seen.get(key)
+        return expires is not None and expires > time.monotonic()
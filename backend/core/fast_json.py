@@ -0,0 +1,39 @@
+from typing import Any, Iterable, Optional
+
+import orjson
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+
+class FastJSONResponse(JSONResponse):
+    # Encodes plain dicts/lists with orjson. Routes return it as-is, so
+    # FastAPI skips response_model validation: use it only for payloads
+    # built by the services from trusted rows.
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content)
+
+
+def model_rows(rows: Iterable, model: type[BaseModel]) -> list[dict]:
+    # Row tuples to dicts holding exactly the model's fields, in its order.
+    # The columns must already carry the model's field names as labels.
+    rows = list(rows)
+    if not rows:
+        return []
+    fields = tuple(model.model_fields)
+    positions = [rows[0]._fields.index(field) for field in fields]
+    return [dict(zip(fields, [row[i] for i in positions])) for row in rows]
+
+
+def fast_response(
+    message: str,
+    data: Any,
+    status: str = "success",
+    next_cursor: Optional[str] = None,
+    paginated: bool = False,
+) -> FastJSONResponse:
+    # Same envelope as ResponseSchema / PaginatedResponseSchema
+    content = {"status": status, "message": message, "data": data}
+    if paginated:
+        content["next_cursor"] = next_cursor
+    return FastJSONResponse(content)
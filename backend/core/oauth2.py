@@ -1,21 +1,27 @@
+import os
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
+from sqlalchemy import select
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from core.jwt import SECRET_KEY, ALGORITHM
-from config.database import get_db
+from core.principal_cache import principal_cache
+from config.database import get_async_db, get_db
 from models.user import User
 from schemas.response_custom import ResponseSchema
+from schemas.user import Principal
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/auth/login")
 
+# When enabled, a token carrying id/name/role claims is trusted as-is and
+# authentication never touches the database. Role changes then take effect
+# only when the token expires.
+TRUST_TOKEN_CLAIMS = os.getenv("TRUST_TOKEN_CLAIMS", "false").lower() == "true"
 
-def get_current_user(
-    token: str = Depends(oauth2_scheme),
-    db: Session = Depends(get_db),
-) -> User:
 
+def decode_token(token: str = Depends(oauth2_scheme)) -> dict:
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
         email: str | None = payload.get("sub")
@@ -26,6 +32,12 @@ def get_current_user(
                 detail="Invalid token: email (sub) not found in payload",
                 headers={"WWW-Authenticate": "Bearer"},
             )
+        if payload.get("type") == "refresh":
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Invalid token: refresh token cannot be used for access",
+                headers={"WWW-Authenticate": "Bearer"},
+            )
 
     except JWTError as e:
         raise HTTPException(
@@ -34,19 +46,75 @@ def get_current_user(
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    user = db.query(User).filter(User.email == email).first()
-    if user is None:
+    return payload
+
+
+def cached_principal(payload: dict) -> Principal | None:
+    email = payload["sub"]
+
+    principal = principal_cache.get(email)
+    if principal is not None:
+        return principal
+
+    if TRUST_TOKEN_CLAIMS and all(k in payload for k in ("id", "name", "role")):
+        principal = Principal(
+            id=payload["id"], name=payload["name"], email=email, role=payload["role"]
+        )
+        principal_cache.put(email, principal)
+        return principal
+
+    return None
+
+
+def principal_from_row(email: str, row) -> Principal:
+    if row is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="User not found",
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    return user
+    principal = Principal.model_validate(row)
+    principal_cache.put(email, principal)
+    return principal
+
+
+def principal_statement(email: str):
+    return select(User.id, User.name, User.email, User.role).where(User.email == email)
+
+
+def get_current_user(
+    payload: dict = Depends(decode_token),
+    db: Session = Depends(get_db),
+) -> Principal:
+    principal = cached_principal(payload)
+    if principal is not None:
+        return principal
+
+    email = payload["sub"]
+    row = db.execute(principal_statement(email)).first()
+    # Return the connection now; read routes open a second session, and
+    # holding this one while they wait for theirs can drain the pool
+    db.rollback()
+    return principal_from_row(email, row)
+
+
+async def get_current_user_async(
+    payload: dict = Depends(decode_token),
+    db: AsyncSession = Depends(get_async_db),
+) -> Principal:
+    principal = cached_principal(payload)
+    if principal is not None:
+        return principal
+
+    email = payload["sub"]
+    row = (await db.execute(principal_statement(email))).first()
+    await db.rollback()
+    return principal_from_row(email, row)
 
 
-def allow_roles(*roles: list[str]):
-    def role_checker(current_user: User = Depends(get_current_user)):
+def allow_roles(*roles: list[str], user_dependency=get_current_user):
+    def role_checker(current_user: Principal = Depends(user_dependency)):
         if current_user.role not in roles:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
@@ -0,0 +1,108 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
+from dotenv import load_dotenv
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import ORMExecuteState, Session
+
+from models.user import User
+from schemas.user import Principal
+
+# Load environment variables
+load_dotenv()
+
+# Entries are dropped when this process changes a user through the ORM.
+# Changes made by other workers or outside the ORM are only seen once the
+# entry expires, so a role change or account removal can take up to this
+# long to apply everywhere.
+PRINCIPAL_CACHE_TTL_SECONDS = int(os.getenv("PRINCIPAL_CACHE_TTL_SECONDS", "15"))
+PRINCIPAL_CACHE_MAX_SIZE = int(os.getenv("PRINCIPAL_CACHE_MAX_SIZE", "10000"))
+
+
+class PrincipalCache:
+    # TTL + LRU cache of user snapshots keyed by token subject (email).
+
+    def __init__(self, ttl: int, max_size: int):
+        self.ttl = ttl
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[str, tuple[float, Principal]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, subject: str) -> Optional[Principal]:
+        with self._lock:
+            entry = self._entries.get(subject)
+            if entry is None or entry[0] < time.monotonic():
+                if entry is not None:
+                    del self._entries[subject]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(subject)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, subject: str, principal: Principal):
+        if self.max_size <= 0:
+            return
+        with self._lock:
+            self._entries[subject] = (time.monotonic() + self.ttl, principal)
+            self._entries.move_to_end(subject)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, subject: str):
+        with self._lock:
+            self._entries.pop(subject, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "ttl_seconds": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+principal_cache = PrincipalCache(PRINCIPAL_CACHE_TTL_SECONDS, PRINCIPAL_CACHE_MAX_SIZE)
+
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def invalidate_user(mapper, connection, target: User):
+    principal_cache.invalidate(target.email)
+    # If the email itself changed, the old subject must go as well
+    for old_email in inspect(target).attrs.email.history.deleted or ():
+        principal_cache.invalidate(old_email)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def mark_bulk_user_write(state: ORMExecuteState):
+    # update(User) / delete(User) statements can touch any number of users
+    # and fire no per-object events: drop every entry, now and once the
+    # write commits, so a lookup made in between is not kept either
+    if (state.is_update or state.is_delete) and any(
+        mapper.class_ is User for mapper in state.all_mappers
+    ):
+        principal_cache.clear()
+        state.session.info["principals_changed"] = True
+
+
+@event.listens_for(Session, "after_commit")
+def clear_after_bulk_user_write(session: Session):
+    if session.info.pop("principals_changed", False):
+        principal_cache.clear()
+
+
+@event.listens_for(Session, "after_rollback")
+def forget_bulk_user_write(session: Session):
+    session.info.pop("principals_changed", None)
@@ -0,0 +1,210 @@
+import asyncio
+import json
+import logging
+import os
+import select
+import threading
+from collections import defaultdict
+from typing import Optional
+
+from dotenv import load_dotenv
+from sqlalchemy import event, func, make_url
+from sqlalchemy import select as sql_select
+from sqlalchemy.orm import Session
+
+# Load environment variables
+load_dotenv()
+
+# "local" delivers within this process only; "postgres" fans out to every
+# worker through LISTEN/NOTIFY on the primary database
+EVENT_BROKER = os.getenv("EVENT_BROKER", "local").lower()
+# Messages buffered per subscriber before it is dropped as too slow
+EVENT_QUEUE_SIZE = int(os.getenv("EVENT_QUEUE_SIZE", "1000"))
+# Items per NOTIFY payload, which PostgreSQL caps at 8000 bytes
+NOTIFY_BATCH_SIZE = 100
+LISTEN_RETRY_SECONDS = 5
+
+logger = logging.getLogger("uvicorn.error")
+
+
+class Subscription:
+    __slots__ = ("queue", "ended")
+
+    def __init__(self, size: int):
+        # None in the queue means the hub ended the subscription
+        self.queue: asyncio.Queue[Optional[str]] = asyncio.Queue(size)
+        self.ended = False
+
+
+class Hub:
+    # In-process fan-out of broker messages to asyncio subscribers. dispatch()
+    # is thread-safe: messages arrive from request threads and broker threads.
+
+    def __init__(self, queue_size: int):
+        self.queue_size = queue_size
+        self._subscriptions: dict[str, set[Subscription]] = defaultdict(set)
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def bind(self, loop: Optional[asyncio.AbstractEventLoop]):
+        self._loop = loop
+
+    def subscribe(self, channel: str) -> Subscription:
+        # Call on the event loop
+        subscription = Subscription(self.queue_size)
+        self._subscriptions[channel].add(subscription)
+        return subscription
+
+    def unsubscribe(self, channel: str, subscription: Subscription):
+        self._subscriptions[channel].discard(subscription)
+
+    def subscriber_count(self, channel: str) -> int:
+        return len(self._subscriptions[channel])
+
+    def dispatch(self, channel: str, message: str):
+        loop = self._loop
+        if loop is None or loop.is_closed():
+            return
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is loop:
+            self._deliver(channel, message)
+        else:
+            loop.call_soon_threadsafe(self._deliver, channel, message)
+
+    def _deliver(self, channel: str, message: str):
+        for subscription in list(self._subscriptions[channel]):
+            try:
+                subscription.queue.put_nowait(message)
+            except asyncio.QueueFull:
+                # The stream ends once drained and the client resyncs on reconnect
+                subscription.ended = True
+                self.unsubscribe(channel, subscription)
+
+    def close(self):
+        # Ends every open stream, e.g. so shutdown does not wait on them
+        for channel, subscriptions in self._subscriptions.items():
+            for subscription in subscriptions:
+                subscription.ended = True
+                try:
+                    subscription.queue.put_nowait(None)
+                except asyncio.QueueFull:
+                    pass
+            subscriptions.clear()
+        self._loop = None
+
+
+class LocalBroker:
+    # Single-process stand-in: committed messages go straight to the hub
+
+    def __init__(self, hub: Hub):
+        self.hub = hub
+
+    def start(self):
+        pass
+
+    def stop(self):
+        pass
+
+    def before_commit(self, session: Session, pending: dict[str, list]):
+        pass
+
+    def after_commit(self, pending: dict[str, list]):
+        for channel, items in pending.items():
+            self.hub.dispatch(channel, json.dumps(items))
+
+
+class PostgresBroker:
+    # NOTIFY is sent inside the writing transaction, so PostgreSQL delivers it
+    # only on commit. Every worker, this one included, LISTENs on a dedicated
+    # connection and hands notifications to its hub.
+
+    def __init__(self, hub: Hub, url: str, channels: list[str]):
+        self.hub = hub
+        self.dsn = make_url(url).set(drivername="postgresql").render_as_string(
+            hide_password=False
+        )
+        self.channels = channels
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self._listen, name="pg-listen", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stopped.set()
+
+    def before_commit(self, session: Session, pending: dict[str, list]):
+        for channel, items in pending.items():
+            for start in range(0, len(items), NOTIFY_BATCH_SIZE):
+                payload = json.dumps(items[start : start + NOTIFY_BATCH_SIZE])
+                session.execute(sql_select(func.pg_notify(channel, payload)))
+
+    def after_commit(self, pending: dict[str, list]):
+        pass
+
+    def _listen(self):
+        import psycopg2
+
+        while not self._stopped.is_set():
+            conn = None
+            try:
+                conn = psycopg2.connect(self.dsn)
+                conn.autocommit = True
+                with conn.cursor() as cursor:
+                    for channel in self.channels:
+                        cursor.execute(f'LISTEN "{channel}"')
+                while not self._stopped.is_set():
+                    if not select.select([conn], [], [], 1)[0]:
+                        continue
+                    conn.poll()
+                    while conn.notifies:
+                        notify = conn.notifies.pop(0)
+                        self.hub.dispatch(notify.channel, notify.payload)
+            except Exception as e:
+                logger.warning("Event listener failed: %s", e)
+                self._stopped.wait(LISTEN_RETRY_SECONDS)
+            finally:
+                if conn is not None:
+                    conn.close()
+
+
+hub = Hub(EVENT_QUEUE_SIZE)
+broker = LocalBroker(hub)
+
+
+def configure_broker(url: str, channels: list[str]):
+    global broker
+    if EVENT_BROKER == "postgres" and make_url(url).get_backend_name() == "postgresql":
+        broker = PostgresBroker(hub, url, channels)
+    else:
+        broker = LocalBroker(hub)
+
+
+def stage(session, channel: str, items: list):
+    # Queue items for subscribers of `channel`; they are published only if
+    # the session's transaction commits. Works with Session and AsyncSession.
+    if items:
+        session.info.setdefault("pending_events", defaultdict(list))[channel].extend(items)
+
+
+@event.listens_for(Session, "before_commit")
+def publish_before_commit(session: Session):
+    pending = session.info.get("pending_events")
+    if pending:
+        broker.before_commit(session, pending)
+
+
+@event.listens_for(Session, "after_commit")
+def publish_after_commit(session: Session):
+    pending = session.info.pop("pending_events", None)
+    if pending:
+        broker.after_commit(pending)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def discard_pending(session: Session, previous_transaction):
+    session.info.pop("pending_events", None)
@@ -0,0 +1,144 @@
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from typing import Callable
+
+from dotenv import load_dotenv
+from fastapi import Request, Response
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from models.cache_version import CacheVersion
+
+# Load environment variables
+load_dotenv()
+
+RESPONSE_CACHE_MAX_ENTRIES = int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", "256"))
+
+
+class ResponseCache:
+    # LRU of serialized responses keyed by route, query and table versions.
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: OrderedDict[tuple, tuple[str, bytes]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: tuple) -> tuple[str, bytes] | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def put(self, key: tuple, entry: tuple[str, bytes]):
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+response_cache = ResponseCache(RESPONSE_CACHE_MAX_ENTRIES)
+
+
+def version_bump_statement(*tables: str):
+    return (
+        update(CacheVersion)
+        .where(CacheVersion.name.in_(tables))
+        .values(version=CacheVersion.version + 1)
+    )
+
+
+def bump_versions(db: Session, *tables: str):
+    # Call before the write's commit so the bump lands in the same transaction
+    db.execute(version_bump_statement(*tables))
+
+
+def versions_statement(tables: tuple[str, ...]):
+    return select(CacheVersion.name, CacheVersion.version).where(
+        CacheVersion.name.in_(tables)
+    )
+
+
+def versions_of(rows, tables: tuple[str, ...]) -> tuple:
+    found = dict(rows)
+    return tuple(found.get(table, 0) for table in tables)
+
+
+def get_versions(db: Session, tables: tuple[str, ...]) -> tuple:
+    return versions_of(db.execute(versions_statement(tables)).all(), tables)
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    candidates = [tag.strip().removeprefix("W/") for tag in header.split(",")]
+    return "*" in candidates or etag in candidates
+
+
+def cache_key(request: Request, versions: tuple) -> tuple:
+    return (
+        request.url.path,
+        tuple(sorted(request.query_params.multi_items())),
+        versions,
+    )
+
+
+def render_entry(result, response_model) -> tuple[str, bytes]:
+    if isinstance(result, Response):
+        # Already rendered from trusted rows by the service
+        body = result.body
+    else:
+        body = response_model.model_validate(result, from_attributes=True).model_dump_json().encode()
+    etag = f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+    return etag, body
+
+
+def entry_response(request: Request, entry: tuple[str, bytes]) -> Response:
+    etag, body = entry
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if etag_matches(request, etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+def cached_json_response(
+    request: Request,
+    db: Session,
+    tables: tuple[str, ...],
+    response_model,
+    build: Callable,
+) -> Response:
+    key = cache_key(request, get_versions(db, tables))
+    entry = response_cache.get(key)
+    if entry is None:
+        entry = render_entry(build(), response_model)
+        response_cache.put(key, entry)
+    return entry_response(request, entry)
+
+
+async def cached_json_response_async(
+    request: Request,
+    db: AsyncSession,
+    tables: tuple[str, ...],
+    response_model,
+    build: Callable,
+) -> Response:
+    # Same cache as cached_json_response; `build` returns an awaitable
+    rows = (await db.execute(versions_statement(tables))).all()
+    key = cache_key(request, versions_of(rows, tables))
+    entry = response_cache.get(key)
+    if entry is None:
+        entry = render_entry(await build(), response_model)
+        response_cache.put(key, entry)
+    return entry_response(request, entry)
@@ -0,0 +1,41 @@
+import asyncio
+import logging
+import zlib
+from contextlib import contextmanager
+from typing import Callable, Iterator
+
+from sqlalchemy import Engine, func, select
+from starlette.concurrency import run_in_threadpool
+
+logger = logging.getLogger("uvicorn.error")
+
+
+async def run_periodic(name: str, job: Callable[[], None], interval: int):
+    # Runs a blocking job in the threadpool now and then every `interval`
+    # seconds. Failures are logged and retried on the next tick.
+    while True:
+        try:
+            await run_in_threadpool(job)
+        except Exception as e:
+            logger.warning("%s failed: %s", name, e)
+        await asyncio.sleep(interval)
+
+
+@contextmanager
+def single_worker(engine: Engine, name: str) -> Iterator[bool]:
+    # Yields whether this process may run the job `name`. Every uvicorn
+    # worker schedules the same jobs, so on PostgreSQL a session-level
+    # advisory lock, held on its own connection for the whole run, lets
+    # only one of them through at a time. Other backends always run it.
+    if engine.dialect.name != "postgresql":
+        yield True
+        return
+
+    key = zlib.crc32(name.encode())
+    with engine.connect() as connection:
+        acquired = connection.scalar(select(func.pg_try_advisory_lock(key)))
+        try:
+            yield acquired
+        finally:
+            if acquired:
+                connection.scalar(select(func.pg_advisory_unlock(key)))
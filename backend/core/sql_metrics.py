@@ -0,0 +1,183 @@
+import functools
+import inspect
+import json
+import logging
+import os
+import sys
+import time
+from contextvars import ContextVar
+from typing import Optional
+
+from dotenv import load_dotenv
+from fastapi.routing import APIRoute
+from sqlalchemy import event
+
+# Load environment variables
+load_dotenv()
+
+SQL_METRICS = os.getenv("SQL_METRICS", "true").lower() == "true"
+SLOW_QUERY_MS = float(os.getenv("SLOW_QUERY_MS", "200"))
+# Requests issuing at least this many statements are logged (likely N+1)
+REQUEST_STATEMENT_WARN_COUNT = int(os.getenv("REQUEST_STATEMENT_WARN_COUNT", "50"))
+SLOW_QUERY_STATEMENT_CHARS = 2000
+
+logger = logging.getLogger("sql")
+
+
+class RequestMetrics:
+    # Per-request database counters, shared by reference with the threadpool
+    # and greenlets the request's queries run in.
+    __slots__ = ("route", "statements", "db_time", "endpoint_done", "serialize_time")
+
+    def __init__(self):
+        self.route: Optional[str] = None
+        self.statements = 0
+        self.db_time = 0.0
+        self.endpoint_done: Optional[float] = None
+        self.serialize_time: Optional[float] = None
+
+    def server_timing(self, total: float) -> str:
+        metrics = [
+            f'db;dur={self.db_time * 1000:.1f};desc="{self.statements} statements"',
+            f"db-count;desc={self.statements}",
+        ]
+        if self.serialize_time is not None:
+            metrics.append(f"serialize;dur={self.serialize_time * 1000:.1f}")
+        metrics.append(f"app;dur={total * 1000:.1f}")
+        return ", ".join(metrics)
+
+
+current_metrics: ContextVar[Optional[RequestMetrics]] = ContextVar(
+    "current_metrics", default=None
+)
+
+
+def parameters_shape(parameters, executemany: bool):
+    # Types only: values may hold passwords or personal data
+    if executemany:
+        rows = list(parameters)
+        return {"rows": len(rows), "row": parameters_shape(rows[0], False) if rows else None}
+    if isinstance(parameters, dict):
+        return {key: type(value).__name__ for key, value in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        return [type(value).__name__ for value in parameters]
+    return type(parameters).__name__
+
+
+def calling_service() -> Optional[str]:
+    # Nearest services.* or core.* frame on the stack. Async services run
+    # their queries in a separate greenlet, so for them this is usually None.
+    frame = sys._getframe(2)
+    while frame is not None:
+        module = frame.f_globals.get("__name__", "")
+        if module.startswith(("services.", "core.")) and module != __name__:
+            return f"{module}.{frame.f_code.co_name}:{frame.f_lineno}"
+        frame = frame.f_back
+    return None
+
+
+def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    # Kept on the statement's execution context, which is discarded whether
+    # or not the statement succeeds, so a failed one leaves nothing behind
+    context._query_start = time.perf_counter()
+
+
+def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - context._query_start
+    metrics = current_metrics.get()
+    if metrics is not None:
+        metrics.statements += 1
+        metrics.db_time += elapsed
+
+    if elapsed * 1000 >= SLOW_QUERY_MS:
+        logger.warning(
+            json.dumps(
+                {
+                    "event": "slow_query",
+                    "duration_ms": round(elapsed * 1000, 1),
+                    "route": metrics.route if metrics else None,
+                    "caller": calling_service(),
+                    "statement": statement[:SLOW_QUERY_STATEMENT_CHARS],
+                    "parameters": parameters_shape(parameters, executemany),
+                    "host": conn.engine.url.host,
+                    "database": conn.engine.url.database,
+                },
+                default=str,
+            )
+        )
+
+
+def instrument_engine(engine):
+    if not SQL_METRICS:
+        return
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", after_cursor_execute)
+
+
+def log_request(metrics: RequestMetrics, total: float):
+    if metrics.statements >= REQUEST_STATEMENT_WARN_COUNT:
+        logger.warning(
+            json.dumps(
+                {
+                    "event": "many_statements",
+                    "route": metrics.route,
+                    "statements": metrics.statements,
+                    "db_ms": round(metrics.db_time * 1000, 1),
+                    "total_ms": round(total * 1000, 1),
+                }
+            )
+        )
+
+
+def timed_endpoint(endpoint):
+    # Marks when the endpoint returns so the route handler can attribute the
+    # remaining time to response validation and serialization
+    def done():
+        metrics = current_metrics.get()
+        if metrics is not None:
+            metrics.endpoint_done = time.perf_counter()
+
+    if inspect.iscoroutinefunction(endpoint):
+
+        @functools.wraps(endpoint)
+        async def wrapper(*args, **kwargs):
+            try:
+                return await endpoint(*args, **kwargs)
+            finally:
+                done()
+
+    else:
+
+        @functools.wraps(endpoint)
+        def wrapper(*args, **kwargs):
+            try:
+                return endpoint(*args, **kwargs)
+            finally:
+                done()
+
+    return wrapper
+
+
+class InstrumentedRoute(APIRoute):
+    # Route class for the API routers: tags the request metrics with the
+    # route template and measures serialization time.
+
+    def __init__(self, path: str, endpoint, **kwargs):
+        super().__init__(path, timed_endpoint(endpoint) if SQL_METRICS else endpoint, **kwargs)
+
+    def get_route_handler(self):
+        handler = super().get_route_handler()
+        if not SQL_METRICS:
+            return handler
+        route = f"{','.join(sorted(self.methods))} {self.path}"
+
+        async def instrumented_handler(request):
+            metrics = current_metrics.get()
+            if metrics is not None:
+                metrics.route = route
+            response = await handler(request)
+            if metrics is not None and metrics.endpoint_done is not None:
+                metrics.serialize_time = time.perf_counter() - metrics.endpoint_done
+            return response
+
+        return instrumented_handler
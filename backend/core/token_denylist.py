@@ -0,0 +1,29 @@
+import threading
+import time
+
+
+class TokenDenyList:
+    # Revoked refresh token ids kept in memory until they would have expired
+    # anyway, so replayed tokens are rejected without a database lookup.
+
+    def __init__(self):
+        self._entries: dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def add(self, jti: str, expires_at: float):
+        with self._lock:
+            self._entries[jti] = expires_at
+            if len(self._entries) % 1024 == 0:
+                self._purge()
+
+    def __contains__(self, jti: str) -> bool:
+        with self._lock:
+            expires_at = self._entries.get(jti)
+        return expires_at is not None and expires_at > time.time()
+
+    def _purge(self):
+        now = time.time()
+        self._entries = {k: v for k, v in self._entries.items() if v > now}
+
+
+refresh_denylist = TokenDenyList()
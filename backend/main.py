@@ -1,14 +1,95 @@
-from fastapi import Depends, FastAPI, HTTPException
+import asyncio
+import logging
+import os
+import time
+from contextlib import asynccontextmanager
+
+from fastapi import Depends, FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
+from sqlalchemy.orm import configure_mappers
+from starlette.concurrency import run_in_threadpool
 
-from models.user import User
-from config.database import Base, engine
+from schemas.user import Principal
+import config.database as database
+from config.database import DB_ASYNC, recent_writers
 from core.exception_handlers import http_exception_handler
 from core.oauth2 import get_current_user
+from core.password_pool import password_pool
+from core import pubsub
+from core.sql_metrics import RequestMetrics, current_metrics, log_request
+from core.scheduler import run_periodic
+from services import availability
+from services.archive import BORROW_ARCHIVE_INTERVAL_SECONDS, run_borrow_archive
+from services.search import SEARCH_INDEX_REFRESH_SECONDS, refresh_search_index
+from services.overdue import OVERDUE_SCAN_INTERVAL_SECONDS, run_overdue_scan
+from services.stats import STATS_RECONCILE_INTERVAL_SECONDS, run_stats_reconcile
+from services.typeahead import TYPEAHEAD_REFRESH_SECONDS, build_typeahead
+
+from routes import auth, category, book, borrow, stats
+
+logger = logging.getLogger("uvicorn.error")
+
+DB_AUTO_MIGRATE = os.getenv("DB_AUTO_MIGRATE", "false").lower() == "true"
+DB_POOL_WARM = int(os.getenv("DB_POOL_WARM", "2"))
+
+
+def startup():
+    if DB_AUTO_MIGRATE:
+        database.run_migrations()
+
+    # Resolve mapper relationships and build every route's pydantic schemas
+    # now instead of on the first request
+    configure_mappers()
+    app.openapi()
+
+    try:
+        database.warm_pool(DB_POOL_WARM)
+    except Exception as e:
+        logger.warning("Database pool warm-up failed: %s", e)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    started = time.perf_counter()
+    await run_in_threadpool(startup)
+    logger.info("Startup completed in %.0f ms", (time.perf_counter() - started) * 1000)
+
+    pubsub.hub.bind(asyncio.get_running_loop())
+    pubsub.configure_broker(database.SQLALCHEMY_DATABASE_URL, [availability.CHANNEL])
+    pubsub.broker.start()
 
-from routes import auth, category, book, borrow
+    # A zero interval disables an in-process job, e.g. when an external
+    # scheduler calls its admin endpoint instead
+    jobs = [
+        ("Overdue scan", run_overdue_scan, OVERDUE_SCAN_INTERVAL_SECONDS),
+        ("Stats reconciliation", run_stats_reconcile, STATS_RECONCILE_INTERVAL_SECONDS),
+        ("Borrow archival", run_borrow_archive, BORROW_ARCHIVE_INTERVAL_SECONDS),
+        ("Search index refresh", refresh_search_index, SEARCH_INDEX_REFRESH_SECONDS),
+        # Builds the index at startup, then refreshes popularity (borrow
+        # counts); when disabled the first autocomplete request builds it
+        ("Typeahead refresh", build_typeahead, TYPEAHEAD_REFRESH_SECONDS),
+    ]
+    tasks = [
+        asyncio.create_task(run_periodic(name, job, interval))
+        for name, job, interval in jobs
+        if interval > 0
+    ]
 
-app = FastAPI()
+    yield
+
+    for task in tasks:
+        task.cancel()
+    pubsub.broker.stop()
+    pubsub.hub.close()
+    password_pool.shutdown()
+    database.dispose_engines()
+    if database.async_engine is not None:
+        await database.async_engine.dispose()
+    for replica in database.async_replicas:
+        await replica.dispose()
+
+
+app = FastAPI(lifespan=lifespan)
 
 # CORS middleware configuration
 app.add_middleware(
@@ -19,15 +100,54 @@ app.add_middleware(
     allow_headers=["*"],  # Allows all headers
 )
 
-Base.metadata.create_all(bind=engine)
+
+@app.middleware("http")
+async def sql_metrics(request: Request, call_next):
+    # Per-request statement count and timings, returned as Server-Timing
+    metrics = RequestMetrics()
+    token = current_metrics.set(metrics)
+    started = time.perf_counter()
+    try:
+        response = await call_next(request)
+    finally:
+        current_metrics.reset(token)
+    total = time.perf_counter() - started
+    response.headers["Server-Timing"] = metrics.server_timing(total)
+    response.headers["Timing-Allow-Origin"] = "*"
+    log_request(metrics, total)
+    return response
+
+
+@app.middleware("http")
+async def track_recent_writes(request: Request, call_next):
+    # Successful writes pin the client's reads to the primary for a short while
+    response = await call_next(request)
+    if request.method not in ("GET", "HEAD", "OPTIONS") and response.status_code < 400:
+        client = request.headers.get("authorization")
+        if client:
+            recent_writers.mark(client)
+    return response
+
+
 app.add_exception_handler(HTTPException, http_exception_handler)
 
+if DB_ASYNC:
+    from routes import book_async, borrow_async
+
+    # Registered first so they take precedence over the sync routes they
+    # replace. Only the high-traffic routes have async versions: the book
+    # list, borrow create, history, current_borrow and all_borrowed. Return,
+    # approve, bulk approve, search and import stay on the sync routes.
+    app.include_router(book_async.router, prefix="/api")
+    app.include_router(borrow_async.router, prefix="/api")
+
 app.include_router(auth.router, prefix="/api")
 app.include_router(category.router, prefix="/api")
 app.include_router(book.router, prefix="/api")
 app.include_router(borrow.router, prefix="/api")
+app.include_router(stats.router, prefix="/api")
 
 
 @app.get("/")
-def root(current_user: User = Depends(get_current_user)):
+def root(current_user: Principal = Depends(get_current_user)):
     return {"message": "Library Management!"}
@@ -0,0 +1,52 @@
+from logging.config import fileConfig
+
+from alembic import context
+
+from config.database import Base, engine
+
+# Import every model so its table is registered on Base.metadata
+from models import book, borrow, cache_version, categories, refresh_token, stats, user  # noqa: F401
+
+config = context.config
+
+if config.config_file_name is not None and config.attributes.get("configure_logger", True):
+    fileConfig(config.config_file_name)
+
+target_metadata = Base.metadata
+
+
+def run_migrations_offline():
+    context.configure(
+        url=engine.url.render_as_string(hide_password=False),
+        target_metadata=target_metadata,
+        literal_binds=True,
+        dialect_opts={"paramstyle": "named"},
+    )
+
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def run_migrations_online():
+    # A connection may be handed in (e.g. from the app lifespan); otherwise
+    # use the application engine.
+    connection = config.attributes.get("connection")
+    if connection is not None:
+        run_with_connection(connection)
+        return
+
+    with engine.connect() as connection:
+        run_with_connection(connection)
+
+
+def run_with_connection(connection):
+    context.configure(connection=connection, target_metadata=target_metadata)
+
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
@@ -1,4 +1,4 @@
-from sqlalchemy import  ForeignKey
+from sqlalchemy import DDL, ForeignKey, Index, event, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from config.database import Base
 from typing import TYPE_CHECKING, List
@@ -10,15 +10,52 @@ if TYPE_CHECKING:
 
 class Book(Base):
     __tablename__ = "books"
+    __table_args__ = (
+        # Trigram indexes back ILIKE '%term%' and similarity search on PostgreSQL
+        Index(
+            "ix_books_title_trgm",
+            "title",
+            postgresql_using="gin",
+            postgresql_ops={"title": "gin_trgm_ops"},
+        ),
+        Index(
+            "ix_books_author_trgm",
+            "author",
+            postgresql_using="gin",
+            postgresql_ops={"author": "gin_trgm_ops"},
+        ),
+        # Top-N most borrowed books on the stats dashboard
+        Index("ix_books_borrow_count", "borrow_count"),
+        # Overdue counts listing only ever reads the non-zero rows
+        Index(
+            "ix_books_overdue_count",
+            "overdue_count",
+            postgresql_where=text("overdue_count > 0"),
+            sqlite_where=text("overdue_count > 0"),
+        ),
+    )
+
     id: Mapped[int] = mapped_column(primary_key=True, index=True)
     category_id: Mapped[int] = mapped_column(
-        ForeignKey("categories.id", onupdate="CASCADE", ondelete="CASCADE")
+        ForeignKey("categories.id", onupdate="CASCADE", ondelete="CASCADE"),
+        index=True,
     )
     title: Mapped[str] = mapped_column(nullable=False)
     author: Mapped[str] = mapped_column(nullable=False)
     year: Mapped[int] = mapped_column(nullable=False)
     quantity: Mapped[int] = mapped_column(nullable=False)
     available_quantity: Mapped[int] = mapped_column(nullable=False)
+    # Loans currently flagged overdue, maintained by services.overdue
+    overdue_count: Mapped[int] = mapped_column(default=0, server_default="0")
+    # Lifetime number of borrows, maintained by services.stats
+    borrow_count: Mapped[int] = mapped_column(default=0, server_default="0")
 
     category: Mapped["Category"] = relationship("Category", back_populates="books")
     borrows: Mapped[List["Borrows"]] = relationship("Borrows", back_populates="book")
+
+
+event.listen(
+    Base.metadata,
+    "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm").execute_if(dialect="postgresql"),
+)
@@ -1,4 +1,4 @@
-from sqlalchemy import Integer, Date, ForeignKey, Enum as SQLEnum
+from sqlalchemy import Integer, Date, ForeignKey, Index, Enum as SQLEnum, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from datetime import date
 from config.database import Base
@@ -18,6 +18,28 @@ class BorrowStatus(str, enum.Enum):
 
 class Borrows(Base):
     __tablename__ = "borrows"
+    __table_args__ = (
+        # Duplicate-borrow check in create_borrow: only unreturned loans.
+        # Unique, so two concurrent requests that both pass the check cannot
+        # both insert.
+        Index(
+            "ix_borrows_user_book_active",
+            "user_id",
+            "book_id",
+            unique=True,
+            postgresql_where=text("status <> 'returned'"),
+            sqlite_where=text("status <> 'returned'"),
+        ),
+        # current_borrow and history_borrow
+        Index("ix_borrows_user_status", "user_id", "status"),
+        # Bulk approve-return by book
+        Index("ix_borrows_book_status", "book_id", "status"),
+        # Status / due-date filters on the admin listing
+        Index("ix_borrows_status_due_date", "status", "due_date"),
+        # Keyset pagination order of all_borrowed
+        Index("ix_borrows_borrow_date_id", "borrow_date", "id"),
+    )
+
     id: Mapped[int] = mapped_column(primary_key=True, index=True)
     book_id: Mapped[int] = mapped_column(
         ForeignKey("books.id", onupdate="CASCADE", ondelete="CASCADE"),
@@ -33,6 +55,37 @@ class Borrows(Base):
     status: Mapped[BorrowStatus] = mapped_column(
         SQLEnum(BorrowStatus), nullable=False, default=BorrowStatus.borrowed
     )
+    # Set by the overdue job on the day it first sees the loan past due;
+    # kept after the return as a record that the loan ran late
+    overdue_at: Mapped[Optional[date]] = mapped_column(Date, nullable=True)
 
     book: Mapped["Book"] = relationship("Book", back_populates="borrows")
     user: Mapped["User"] = relationship("User", back_populates="borrows")
+
+
+class BorrowArchive(Base):
+    # Returned loans moved out of borrows by services.archive once they are
+    # older than BORROW_ARCHIVE_AFTER_DAYS. Rows keep their borrows id.
+    __tablename__ = "borrows_archive"
+    __table_args__ = (
+        # history_borrow keyset pagination per user
+        Index("ix_borrows_archive_user_borrow_date", "user_id", "borrow_date", "id"),
+        # Lifetime borrow counts in the stats reconciliation
+        Index("ix_borrows_archive_book_id", "book_id"),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=False)
+    book_id: Mapped[int] = mapped_column(
+        ForeignKey("books.id", onupdate="CASCADE", ondelete="CASCADE"),
+        nullable=False,
+    )
+    user_id: Mapped[int] = mapped_column(
+        ForeignKey("users.id", onupdate="CASCADE", ondelete="CASCADE"),
+        nullable=False,
+    )
+    borrow_date: Mapped[date] = mapped_column(Date, nullable=False)
+    due_date: Mapped[date] = mapped_column(Date, nullable=False)
+    return_date: Mapped[Optional[date]] = mapped_column(Date, nullable=True)
+    status: Mapped[BorrowStatus] = mapped_column(SQLEnum(BorrowStatus), nullable=False)
+    overdue_at: Mapped[Optional[date]] = mapped_column(Date, nullable=True)
+    archived_at: Mapped[date] = mapped_column(Date, nullable=False, default=date.today)
@@ -0,0 +1,18 @@
+from sqlalchemy import DDL, event
+from sqlalchemy.orm import Mapped, mapped_column
+from config.database import Base
+
+
+class CacheVersion(Base):
+    # One row per cached table; bumped in the same transaction as every write
+    # so all workers see the change on their next read.
+    __tablename__ = "cache_versions"
+    name: Mapped[str] = mapped_column(primary_key=True)
+    version: Mapped[int] = mapped_column(nullable=False, default=0)
+
+
+event.listen(
+    CacheVersion.__table__,
+    "after_create",
+    DDL("INSERT INTO cache_versions (name, version) VALUES ('books', 0), ('categories', 0)"),
+)
@@ -0,0 +1,18 @@
+from sqlalchemy import DateTime, ForeignKey
+from sqlalchemy.orm import Mapped, mapped_column
+from datetime import datetime
+from config.database import Base
+
+
+class RefreshToken(Base):
+    __tablename__ = "refresh_tokens"
+    jti: Mapped[str] = mapped_column(primary_key=True)
+    user_id: Mapped[int] = mapped_column(
+        ForeignKey("users.id", onupdate="CASCADE", ondelete="CASCADE"),
+        nullable=False,
+        index=True,
+    )
+    # Tokens rotated from the same login share the jti of the first one
+    family_id: Mapped[str] = mapped_column(nullable=False, index=True)
+    expires_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    revoked: Mapped[bool] = mapped_column(nullable=False, default=False)
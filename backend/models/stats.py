@@ -0,0 +1,34 @@
+from sqlalchemy import DDL, Enum as SQLEnum, ForeignKey, event
+from sqlalchemy.orm import Mapped, mapped_column
+from config.database import Base
+from models.borrow import BorrowStatus
+
+
+class CategoryStats(Base):
+    # Running catalog totals per category, updated in the same transaction
+    # as the book and borrow writes and periodically reconciled.
+    __tablename__ = "category_stats"
+    category_id: Mapped[int] = mapped_column(
+        ForeignKey("categories.id", onupdate="CASCADE", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    books: Mapped[int] = mapped_column(nullable=False, default=0)
+    copies: Mapped[int] = mapped_column(nullable=False, default=0)
+    on_loan: Mapped[int] = mapped_column(nullable=False, default=0)
+
+
+class BorrowStatusCount(Base):
+    # One row per borrow status
+    __tablename__ = "borrow_status_counts"
+    status: Mapped[BorrowStatus] = mapped_column(SQLEnum(BorrowStatus), primary_key=True)
+    count: Mapped[int] = mapped_column(nullable=False, default=0)
+
+
+event.listen(
+    BorrowStatusCount.__table__,
+    "after_create",
+    DDL(
+        "INSERT INTO borrow_status_counts (status, count) VALUES "
+        "('returned', 0), ('borrowed', 0), ('waiting_approve', 0)"
+    ),
+)
@@ -1,4 +1,4 @@
-from sqlalchemy import Integer, String
+from sqlalchemy import Index, Integer, String, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from config.database import Base
 from typing import List, TYPE_CHECKING
@@ -9,10 +9,22 @@ if TYPE_CHECKING:
 
 class User(Base):
     __tablename__ = "users"
+    __table_args__ = (
+        # Overdue counts listing only ever reads the non-zero rows
+        Index(
+            "ix_users_overdue_count",
+            "overdue_count",
+            postgresql_where=text("overdue_count > 0"),
+            sqlite_where=text("overdue_count > 0"),
+        ),
+    )
+
     id: Mapped[int] = mapped_column(primary_key=True, index=True)
     name: Mapped[str] = mapped_column(nullable=False)
     email: Mapped[str] = mapped_column(unique=True, nullable=False)
     password: Mapped[str] = mapped_column(nullable=False)
     role: Mapped[str] = mapped_column(default="borrower")
+    # Loans currently flagged overdue, maintained by services.overdue
+    overdue_count: Mapped[int] = mapped_column(default=0, server_default="0")
 
     borrows: Mapped[List["Borrows"]] = relationship("Borrows", back_populates="user")
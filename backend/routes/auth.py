@@ -4,11 +4,22 @@ from sqlalchemy.orm import Session
 from config.database import get_db
 
 from schemas.response_custom import ResponseSchema
-from schemas.user import UserLogin, UserLoginResponse, UserRegister, UserResponse
+from schemas.user import (
+    Principal,
+    PrincipalCacheStats,
+    TokenRefresh,
+    UserLogin,
+    UserLoginResponse,
+    UserRegister,
+    UserResponse,
+)
+from core.oauth2 import allow_roles
+from core.principal_cache import principal_cache
 from services import auth as services
+from core.sql_metrics import InstrumentedRoute
 
 
-router = APIRouter(prefix="/auth")
+router = APIRouter(prefix="/auth", route_class=InstrumentedRoute)
 
 
 @router.post("/register", response_model=ResponseSchema[UserResponse], tags=["auth"])
@@ -19,3 +30,26 @@ def register(user: UserRegister, db: Session = Depends(get_db)):
 @router.post("/login", response_model=ResponseSchema[UserLoginResponse], tags=["auth"])
 def login(user: UserLogin, db: Session = Depends(get_db)):
     return services.login(user, db)
+
+
+@router.post("/refresh", response_model=ResponseSchema[UserLoginResponse], tags=["auth"])
+def refresh(token: TokenRefresh, db: Session = Depends(get_db)):
+    return services.refresh(token, db)
+
+
+@router.post("/logout", response_model=ResponseSchema, tags=["auth"])
+def logout(token: TokenRefresh, db: Session = Depends(get_db)):
+    return services.logout(token, db)
+
+
+@router.get(
+    "/principal_cache",
+    response_model=ResponseSchema[PrincipalCacheStats],
+    tags=["auth"],
+)
+def principal_cache_stats(user: Principal = Depends(allow_roles("admin"))):
+    return ResponseSchema(
+        status="success",
+        message="Principal cache stats",
+        data=principal_cache.stats(),
+    )
@@ -1,15 +1,35 @@
-from fastapi import APIRouter, Depends
+from fastapi import (
+    APIRouter,
+    Depends,
+    File,
+    HTTPException,
+    Query,
+    Request,
+    UploadFile,
+    status,
+)
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional, Union
 
-from config.database import get_db
+from config.database import get_db, get_read_db
 from schemas.response_custom import ResponseSchema
-from schemas.book import BookCreate, BookUpdate, BookResponse
-from models.user import User
+from schemas.book import (
+    BookCreate,
+    BookImportResponse,
+    BookListNormalized,
+    BookResponse,
+    BookSuggestion,
+    BookUpdate,
+)
+from schemas.user import Principal
 from services import book as services
+from services.availability import stream_availability
+from services.typeahead import DEFAULT_SUGGESTIONS, suggest_books
 from core.oauth2 import allow_roles
+from core.response_cache import cached_json_response
+from core.sql_metrics import InstrumentedRoute
 
-router = APIRouter(prefix="/book")
+router = APIRouter(prefix="/book", route_class=InstrumentedRoute)
 
 
 @router.post(
@@ -20,11 +40,33 @@ router = APIRouter(prefix="/book")
 def create_book(
     category: BookCreate,
     db: Session = Depends(get_db),
-    user: User = Depends(allow_roles("admin")),
+    user: Principal = Depends(allow_roles("admin")),
 ):
     return services.create_book(category, db)
 
 
+@router.post(
+    "/import",
+    response_model=ResponseSchema[BookImportResponse],
+    tags=["book"],
+)
+def import_books(
+    file: UploadFile = File(...),
+    format: Optional[str] = None,
+    db: Session = Depends(get_db),
+    user: Principal = Depends(allow_roles("admin")),
+):
+    if format is None:
+        filename = (file.filename or "").lower()
+        format = "ndjson" if filename.endswith((".ndjson", ".jsonl")) else "csv"
+    if format not in ("ndjson", "csv"):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Unsupported format, expected 'ndjson' or 'csv'",
+        )
+    return services.import_books(file.file, format, db)
+
+
 @router.put(
     "/{book_id}",
     response_model=ResponseSchema[BookResponse],
@@ -34,28 +76,93 @@ def update_book(
     book_id: int,
     book: BookUpdate,
     db: Session = Depends(get_db),
-    user: User = Depends(allow_roles("admin")),
+    user: Principal = Depends(allow_roles("admin")),
 ):
     return services.update_book(book_id, book, db)
 
 
 @router.get(
     "/",
-    response_model=ResponseSchema[List[BookResponse]],
+    response_model=ResponseSchema[Union[List[BookResponse], BookListNormalized]],
+    tags=["book"],
+)
+def get_all_books(
+    request: Request,
+    format: Optional[str] = None,
+    shape: Optional[str] = None,
+    db: Session = Depends(get_read_db),
+):
+    if format is None and "application/x-ndjson" in request.headers.get("accept", ""):
+        format = "ndjson"
+    if format in ("ndjson", "csv"):
+        return services.stream_books(db, format)
+    if format is not None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Unsupported format, expected 'ndjson' or 'csv'",
+        )
+    if shape not in (None, "normalized"):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Unsupported shape, expected 'normalized'",
+        )
+    return cached_json_response(
+        request,
+        db,
+        ("books", "categories"),
+        ResponseSchema[Union[List[BookResponse], BookListNormalized]],
+        lambda: services.get_all_books(db, shape),
+    )
+
+
+@router.get(
+    "/availability/stream",
     tags=["book"],
 )
-def get_all_books(db: Session = Depends(get_db)):
-    return services.get_all_books(db)
+async def availability_stream(request: Request):
+    # Server-Sent Events: {book_id, available_quantity} deltas as they commit
+    return stream_availability(request)
+
+
+@router.get(
+    "/autocomplete",
+    response_model=ResponseSchema[List[BookSuggestion]],
+    tags=["book"],
+)
+def autocomplete_books(
+    q: str,
+    limit: int = Query(DEFAULT_SUGGESTIONS, ge=1, le=50),
+    db: Session = Depends(get_read_db),
+):
+    # Served from the in-memory typeahead index, most borrowed first
+    return suggest_books(db, q, limit)
 
 
 @router.get(
     "/search",
-    response_model=ResponseSchema[List[BookResponse]],
+    response_model=ResponseSchema[Union[List[BookResponse], BookListNormalized]],
     tags=["book"],
 )
 def get_books_by_query(
+    request: Request,
     category_name: str = None,
     book_name: str = None,
-    db: Session = Depends(get_db),
+    q: str = None,
+    limit: Optional[int] = Query(None, ge=1, le=100),
+    shape: Optional[str] = None,
+    db: Session = Depends(get_read_db),
 ):
-    return services.get_books_by_query(db, category_name, book_name)
+    if shape not in (None, "normalized"):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Unsupported shape, expected 'normalized'",
+        )
+    return cached_json_response(
+        request,
+        db,
+        ("books", "categories"),
+        ResponseSchema[Union[List[BookResponse], BookListNormalized]],
+        lambda: services.get_books_by_query(
+            db, category_name, book_name, q, limit, shape
+        ),
+    )
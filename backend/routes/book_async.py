@@ -0,0 +1,49 @@
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional, Union
+
+from config.database import get_async_read_db
+from schemas.response_custom import ResponseSchema
+from schemas.book import BookListNormalized, BookResponse
+from services import book_async as services
+from core.response_cache import cached_json_response_async
+from core.sql_metrics import InstrumentedRoute
+
+# Async (AsyncSession) versions of the hot book routes, mounted ahead of
+# routes.book when DB_ASYNC=true. Only the list is async; search, import and
+# the writes are served by routes.book.
+router = APIRouter(prefix="/book", route_class=InstrumentedRoute)
+
+
+@router.get(
+    "/",
+    response_model=ResponseSchema[Union[List[BookResponse], BookListNormalized]],
+    tags=["book"],
+)
+async def get_all_books(
+    request: Request,
+    format: Optional[str] = None,
+    shape: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_read_db),
+):
+    if format is None and "application/x-ndjson" in request.headers.get("accept", ""):
+        format = "ndjson"
+    if format in ("ndjson", "csv"):
+        return services.stream_books(db, format)
+    if format is not None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Unsupported format, expected 'ndjson' or 'csv'",
+        )
+    if shape not in (None, "normalized"):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Unsupported shape, expected 'normalized'",
+        )
+    return await cached_json_response_async(
+        request,
+        db,
+        ("books", "categories"),
+        ResponseSchema[Union[List[BookResponse], BookListNormalized]],
+        lambda: services.get_all_books(db, shape),
+    )
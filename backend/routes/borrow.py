@@ -1,23 +1,36 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Literal, Optional
+from datetime import date
 
-from config.database import get_db
-from schemas.response_custom import ResponseSchema
+from config.database import get_db, get_read_db
+from schemas.response_custom import PaginatedResponseSchema, ResponseSchema
 from schemas.borrow import (
     ApproveReturnBookResponse,
+    BorrowBatchCreate,
+    BorrowBatchItemResponse,
     BorrowCreate,
     BorrowBookResponse,
+    BulkApproveReturnRequest,
+    BulkApproveReturnResponse,
     CurrentBorrowResponse,
     ReturnBookResponse,
     HistoryResponse,
     ActiveBorrowResponse,
+    OverdueBorrowResponse,
+    OverdueCountResponse,
+    OverdueScanResponse,
+    BorrowArchiveResponse,
 )
 from services import borrow as services
-from models.user import User
+from services import overdue as overdue_services
+from services import archive as archive_services
+from schemas.user import Principal
+from models.borrow import BorrowStatus
 from core.oauth2 import allow_roles, get_current_user
+from core.sql_metrics import InstrumentedRoute
 
-router = APIRouter(prefix="/borrow")
+router = APIRouter(prefix="/borrow", route_class=InstrumentedRoute)
 
 
 @router.post(
@@ -28,11 +41,24 @@ router = APIRouter(prefix="/borrow")
 def create_borrow(
     borrow: BorrowCreate,
     db: Session = Depends(get_db),
-    user: User = Depends(get_current_user),
+    user: Principal = Depends(get_current_user),
 ):
     return services.create_borrow(borrow, user, db)
 
 
+@router.post(
+    "/batch",
+    response_model=ResponseSchema[List[BorrowBatchItemResponse]],
+    tags=["borrow"],
+)
+def create_borrow_batch(
+    batch: BorrowBatchCreate,
+    db: Session = Depends(get_db),
+    user: Principal = Depends(get_current_user),
+):
+    return services.create_borrow_batch(batch, user, db)
+
+
 @router.put(
     "/return/{borrow_id}",
     response_model=ResponseSchema[ReturnBookResponse],
@@ -41,7 +67,7 @@ def create_borrow(
 def return_borrow(
     borrow_id: int,
     db: Session = Depends(get_db),
-    user: User = Depends(get_current_user),
+    user: Principal = Depends(get_current_user),
 ):
     return services.return_borrow(borrow_id, user, db)
 
@@ -54,21 +80,36 @@ def return_borrow(
 def approve_return_borrow(
     borrow_id: int,
     db: Session = Depends(get_db),
-    user: User = Depends(allow_roles("admin")),
+    user: Principal = Depends(allow_roles("admin")),
 ):
     return services.approve_return_borrow(borrow_id, db)
 
 
+@router.put(
+    "/approve_return",
+    response_model=ResponseSchema[BulkApproveReturnResponse],
+    tags=["borrow"],
+)
+def bulk_approve_return_borrow(
+    request: BulkApproveReturnRequest,
+    db: Session = Depends(get_db),
+    user: Principal = Depends(allow_roles("admin")),
+):
+    return services.bulk_approve_return_borrow(request, db)
+
+
 @router.get(
     "/history",
-    response_model=ResponseSchema[List[HistoryResponse]],
+    response_model=PaginatedResponseSchema[List[HistoryResponse]],
     tags=["borrow"],
 )
 def history_borrow(
-    db: Session = Depends(get_db),
-    user: User = Depends(get_current_user),
+    cursor: Optional[str] = None,
+    limit: int = Query(100, ge=1, le=500),
+    db: Session = Depends(get_read_db),
+    user: Principal = Depends(get_current_user),
 ):
-    return services.history_borrow(user, db)
+    return services.history_borrow(user, db, cursor=cursor, limit=limit)
 
 
 @router.get(
@@ -77,19 +118,88 @@ def history_borrow(
     tags=["borrow"],
 )
 def current_borrow(
-    db: Session = Depends(get_db),
-    user: User = Depends(get_current_user),
+    db: Session = Depends(get_read_db),
+    user: Principal = Depends(get_current_user),
 ):
     return services.current_borrow(user, db)
 
 
 @router.get(
     "/all_borrowed",
-    response_model=ResponseSchema[List[ActiveBorrowResponse]],
+    response_model=PaginatedResponseSchema[List[ActiveBorrowResponse]],
     tags=["borrow"],
 )
 def get_all_borrowed_books(
+    cursor: Optional[str] = None,
+    limit: int = Query(100, ge=1, le=500),
+    status: Optional[BorrowStatus] = None,
+    user_id: Optional[int] = None,
+    book_id: Optional[int] = None,
+    due_from: Optional[date] = None,
+    due_to: Optional[date] = None,
+    db: Session = Depends(get_read_db),
+    user: Principal = Depends(allow_roles("admin")),
+):
+    return services.get_borrow(
+        user,
+        db,
+        cursor=cursor,
+        limit=limit,
+        borrow_status=status,
+        user_id=user_id,
+        book_id=book_id,
+        due_from=due_from,
+        due_to=due_to,
+    )
+
+
+@router.get(
+    "/overdue",
+    response_model=PaginatedResponseSchema[List[OverdueBorrowResponse]],
+    tags=["borrow"],
+)
+def get_overdue(
+    cursor: Optional[str] = None,
+    limit: int = Query(100, ge=1, le=500),
+    db: Session = Depends(get_read_db),
+    user: Principal = Depends(allow_roles("admin")),
+):
+    return overdue_services.get_overdue(db, cursor=cursor, limit=limit)
+
+
+@router.get(
+    "/overdue/counts",
+    response_model=ResponseSchema[List[OverdueCountResponse]],
+    tags=["borrow"],
+)
+def get_overdue_counts(
+    by: Literal["user", "book"] = "user",
+    limit: int = Query(100, ge=1, le=500),
+    db: Session = Depends(get_read_db),
+    user: Principal = Depends(allow_roles("admin")),
+):
+    return overdue_services.get_overdue_counts(db, by=by, limit=limit)
+
+
+@router.post(
+    "/overdue/scan",
+    response_model=ResponseSchema[OverdueScanResponse],
+    tags=["borrow"],
+)
+def scan_overdue(
+    db: Session = Depends(get_db),
+    user: Principal = Depends(allow_roles("admin")),
+):
+    return overdue_services.scan_overdue(db)
+
+
+@router.post(
+    "/archive",
+    response_model=ResponseSchema[BorrowArchiveResponse],
+    tags=["borrow"],
+)
+def archive_borrows(
     db: Session = Depends(get_db),
-    user: User = Depends(allow_roles("admin",'borrower')),
+    user: Principal = Depends(allow_roles("admin")),
 ):
-    return services.get_borrow(user, db)
+    return archive_services.archive(db)
@@ -0,0 +1,91 @@
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
+from datetime import date
+
+from config.database import get_async_db, get_async_read_db
+from schemas.response_custom import PaginatedResponseSchema, ResponseSchema
+from schemas.borrow import (
+    BorrowCreate,
+    BorrowBookResponse,
+    HistoryResponse,
+    ActiveBorrowResponse,
+)
+from services import borrow_async as services
+from schemas.user import Principal
+from models.borrow import BorrowStatus
+from core.oauth2 import allow_roles, get_current_user_async
+from core.sql_metrics import InstrumentedRoute
+
+# Async (AsyncSession) versions of the hot borrow routes, mounted ahead of
+# routes.borrow when DB_ASYNC=true. Every other borrow route, the return and
+# approval writes included, is served by routes.borrow.
+router = APIRouter(prefix="/borrow", route_class=InstrumentedRoute)
+
+
+@router.post(
+    "/",
+    response_model=ResponseSchema[BorrowBookResponse],
+    tags=["borrow"],
+)
+async def create_borrow(
+    borrow: BorrowCreate,
+    db: AsyncSession = Depends(get_async_db),
+    user: Principal = Depends(get_current_user_async),
+):
+    return await services.create_borrow(borrow, user, db)
+
+
+@router.get(
+    "/history",
+    response_model=PaginatedResponseSchema[List[HistoryResponse]],
+    tags=["borrow"],
+)
+async def history_borrow(
+    cursor: Optional[str] = None,
+    limit: int = Query(100, ge=1, le=500),
+    db: AsyncSession = Depends(get_async_read_db),
+    user: Principal = Depends(get_current_user_async),
+):
+    return await services.history_borrow(user, db, cursor=cursor, limit=limit)
+
+
+@router.get(
+    "/current_borrow",
+    response_model=ResponseSchema[List[ActiveBorrowResponse]],
+    tags=["borrow"],
+)
+async def current_borrow(
+    db: AsyncSession = Depends(get_async_read_db),
+    user: Principal = Depends(get_current_user_async),
+):
+    return await services.current_borrow(user, db)
+
+
+@router.get(
+    "/all_borrowed",
+    response_model=PaginatedResponseSchema[List[ActiveBorrowResponse]],
+    tags=["borrow"],
+)
+async def get_all_borrowed_books(
+    cursor: Optional[str] = None,
+    limit: int = Query(100, ge=1, le=500),
+    status: Optional[BorrowStatus] = None,
+    user_id: Optional[int] = None,
+    book_id: Optional[int] = None,
+    due_from: Optional[date] = None,
+    due_to: Optional[date] = None,
+    db: AsyncSession = Depends(get_async_read_db),
+    user: Principal = Depends(allow_roles("admin", user_dependency=get_current_user_async)),
+):
+    return await services.get_borrow(
+        user,
+        db,
+        cursor=cursor,
+        limit=limit,
+        borrow_status=status,
+        user_id=user_id,
+        book_id=book_id,
+        due_from=due_from,
+        due_to=due_to,
+    )
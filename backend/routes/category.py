@@ -1,15 +1,17 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request
 from sqlalchemy.orm import Session
 from typing import List
 
-from config.database import get_db
+from config.database import get_db, get_read_db
 from schemas.response_custom import ResponseSchema
 from schemas.category import CategoryCreate, CategoryResponse
-from models.user import User
+from schemas.user import Principal
 from services import category as services
 from core.oauth2 import allow_roles
+from core.response_cache import cached_json_response
+from core.sql_metrics import InstrumentedRoute
 
-router = APIRouter(prefix="/category")
+router = APIRouter(prefix="/category", route_class=InstrumentedRoute)
 
 
 @router.post(
@@ -20,7 +22,7 @@ router = APIRouter(prefix="/category")
 def create_category(
     category: CategoryCreate,
     db: Session = Depends(get_db),
-    user: User = Depends(allow_roles("admin")),
+    user: Principal = Depends(allow_roles("admin")),
 ):
     return services.create_category(category, db)
 
@@ -30,8 +32,14 @@ def create_category(
     response_model=ResponseSchema[List[CategoryResponse]],
     tags=["category"],
 )
-def get_all_categories(db: Session = Depends(get_db)):
-    return services.get_all_categories(db)
+def get_all_categories(request: Request, db: Session = Depends(get_read_db)):
+    return cached_json_response(
+        request,
+        db,
+        ("categories",),
+        ResponseSchema[List[CategoryResponse]],
+        lambda: services.get_all_categories(db),
+    )
 
 
 @router.put(
@@ -43,6 +51,6 @@ def update_category(
     category_id: int,
     category: CategoryCreate,
     db: Session = Depends(get_db),
-    user: User = Depends(allow_roles("admin")),
+    user: Principal = Depends(allow_roles("admin")),
 ):
     return services.update_category(category_id, category, db)
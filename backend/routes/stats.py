@@ -0,0 +1,37 @@
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+
+from config.database import get_db, get_read_db
+from schemas.response_custom import ResponseSchema
+from schemas.stats import LibraryStatsResponse
+from schemas.user import Principal
+from services import stats as services
+from core.oauth2 import allow_roles
+from core.sql_metrics import InstrumentedRoute
+
+router = APIRouter(prefix="/stats", route_class=InstrumentedRoute)
+
+
+@router.get(
+    "/",
+    response_model=ResponseSchema[LibraryStatsResponse],
+    tags=["stats"],
+)
+def get_stats(
+    top: int = Query(services.DEFAULT_TOP_BOOKS, ge=1, le=100),
+    db: Session = Depends(get_read_db),
+    user: Principal = Depends(allow_roles("admin")),
+):
+    return services.get_stats(db, top)
+
+
+@router.post(
+    "/reconcile",
+    response_model=ResponseSchema[LibraryStatsResponse],
+    tags=["stats"],
+)
+def reconcile_stats(
+    db: Session = Depends(get_db),
+    user: Principal = Depends(allow_roles("admin")),
+):
+    return services.reconcile(db)
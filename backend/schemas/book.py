@@ -30,3 +30,42 @@ class BookResponse(BookBase):
   
     class Config:
         from_attributes = True
+
+
+class BookListItem(BookBase):
+    id: int
+    category_id: int
+
+    class Config:
+        from_attributes = True
+
+
+class BookListNormalized(BaseModel):
+    # Each category is sent once; books reference it by category_id
+    categories: List[CategoryResponse]
+    books: List[BookListItem]
+
+
+class BookSuggestion(BaseModel):
+    id: int
+    title: str
+    author: str
+
+
+class BookImportRow(BaseModel):
+    title: constr(min_length=1)
+    author: constr(min_length=1)
+    year: conint(ge=1000, le=9999)
+    quantity: conint(ge=0)
+    category: constr(strip_whitespace=True, min_length=1)
+
+
+class BookImportError(BaseModel):
+    row: int
+    error: str
+
+
+class BookImportResponse(BaseModel):
+    imported: int
+    failed: int
+    errors: List[BookImportError]
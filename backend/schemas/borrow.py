@@ -1,5 +1,5 @@
-from pydantic import BaseModel, Field
-from typing import Optional
+from pydantic import BaseModel, Field, conlist, model_validator
+from typing import Dict, List, Optional
 from datetime import date
 from models import book
 from models.borrow import BorrowStatus
@@ -17,6 +17,11 @@ class BorrowBase(BaseModel):
 class BorrowCreate(BorrowBase):
     pass
 
+
+class BorrowBatchCreate(BaseModel):
+    book_ids: conlist(int, min_length=1, max_length=100)
+    due_date: date
+
 # Custom
 class BorrowBookResponse(BaseModel):
     borrower: str
@@ -33,7 +38,24 @@ class ReturnBookResponse(BaseModel):
 class ApproveReturnBookResponse(ReturnBookResponse):
     pass
 
+class BulkApproveReturnRequest(BaseModel):
+    borrow_ids: List[int] = []
+    book_ids: List[int] = []
+
+    @model_validator(mode="after")
+    def check_not_empty(self):
+        if not self.borrow_ids and not self.book_ids:
+            raise ValueError("borrow_ids or book_ids is required")
+        return self
+
+class BulkApproveReturnResponse(BaseModel):
+    approved: int
+    borrow_ids: List[int]
+    skipped_borrow_ids: List[int]
+    books: Dict[int, int]
+
 class HistoryResponse(BaseModel):
+    borrow_id: int
     book: str
     user: str
     borrow_date: date
@@ -51,4 +73,29 @@ class ActiveBorrowResponse(BaseModel):
     borrow_date: date
     due_date: date
     return_date: Optional[date] = None
-    status: BorrowStatus
\ No newline at end of file
+    status: BorrowStatus
+
+class BorrowBatchItemResponse(BaseModel):
+    book_id: int
+    success: bool
+    message: str
+    borrow: Optional[BorrowBookResponse] = None
+
+class OverdueBorrowResponse(BaseModel):
+    borrow_id: int
+    book: str
+    user: str
+    borrow_date: date
+    due_date: date
+    days_overdue: int
+
+class OverdueCountResponse(BaseModel):
+    id: int
+    name: str
+    overdue_count: int
+
+class OverdueScanResponse(BaseModel):
+    flagged: int
+
+class BorrowArchiveResponse(BaseModel):
+    archived: int
@@ -8,3 +8,7 @@ class ResponseSchema(BaseModel, Generic[T]):
     status: str
     message: str
     data: Optional[T] = None
+
+
+class PaginatedResponseSchema(ResponseSchema[T], Generic[T]):
+    next_cursor: Optional[str] = None
@@ -0,0 +1,27 @@
+from pydantic import BaseModel
+from typing import Dict, List
+from models.borrow import BorrowStatus
+
+
+class CategoryStatsResponse(BaseModel):
+    category_id: int
+    name: str
+    books: int
+    copies: int
+    on_loan: int
+    available: int
+
+class TopBookResponse(BaseModel):
+    id: int
+    title: str
+    borrow_count: int
+
+class LibraryStatsResponse(BaseModel):
+    books: int
+    copies: int
+    on_loan: int
+    available: int
+    category_count: int
+    categories: List[CategoryStatsResponse]
+    borrow_status: Dict[BorrowStatus, int]
+    top_books: List[TopBookResponse]
@@ -1,4 +1,5 @@
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel, ConfigDict, EmailStr
+from typing import Optional
 
 
 class UserRegister(BaseModel):
@@ -15,6 +16,11 @@ class UserLogin(BaseModel):
 class UserLoginResponse(BaseModel):
     access_token: str
     token_type: str
+    refresh_token: Optional[str] = None
+
+
+class TokenRefresh(BaseModel):
+    refresh_token: str
 
 
 class UserResponse(BaseModel):
@@ -22,3 +28,20 @@ class UserResponse(BaseModel):
     name: str
     email: EmailStr
     role: str
+
+
+class Principal(BaseModel):
+    model_config = ConfigDict(frozen=True, from_attributes=True)
+
+    id: int
+    name: str
+    email: str
+    role: str
+
+
+class PrincipalCacheStats(BaseModel):
+    size: int
+    max_size: int
+    ttl_seconds: int
+    hits: int
+    misses: int
@@ -0,0 +1,110 @@
+import logging
+import os
+from datetime import date, timedelta
+from typing import Optional
+
+from dotenv import load_dotenv
+from fastapi import HTTPException, status
+from sqlalchemy import delete, insert, select
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from config.database import SessionLocal, engine
+from core.scheduler import single_worker
+from models.borrow import BorrowArchive, Borrows, BorrowStatus
+from schemas.borrow import BorrowArchiveResponse
+from schemas.response_custom import ResponseSchema
+
+# Load environment variables
+load_dotenv()
+
+# Returned loans older than this many days (by return date) leave borrows
+BORROW_ARCHIVE_AFTER_DAYS = int(os.getenv("BORROW_ARCHIVE_AFTER_DAYS", "90"))
+BORROW_ARCHIVE_BATCH_SIZE = int(os.getenv("BORROW_ARCHIVE_BATCH_SIZE", "5000"))
+BORROW_ARCHIVE_INTERVAL_SECONDS = int(
+    os.getenv("BORROW_ARCHIVE_INTERVAL_SECONDS", "86400")
+)
+
+ARCHIVED_COLUMNS = [
+    "id",
+    "book_id",
+    "user_id",
+    "borrow_date",
+    "due_date",
+    "return_date",
+    "status",
+    "overdue_at",
+]
+
+logger = logging.getLogger("uvicorn.error")
+
+
+def archive_batch(db: Session, cutoff: date, batch_size: int) -> int:
+    # Copies one batch into borrows_archive and deletes it from borrows in the
+    # same transaction. Returned is a final status, so the rows cannot change
+    # between the two statements.
+    ids = db.scalars(
+        select(Borrows.id)
+        .where(Borrows.status == BorrowStatus.returned, Borrows.return_date < cutoff)
+        .order_by(Borrows.id)
+        .limit(batch_size)
+    ).all()
+    if not ids:
+        return 0
+
+    db.execute(
+        insert(BorrowArchive).from_select(
+            ARCHIVED_COLUMNS,
+            select(*(getattr(Borrows, column) for column in ARCHIVED_COLUMNS)).where(
+                Borrows.id.in_(ids)
+            ),
+        )
+    )
+    db.execute(delete(Borrows).where(Borrows.id.in_(ids)))
+    db.commit()
+    return len(ids)
+
+
+def archive_borrows(
+    db: Session,
+    today: Optional[date] = None,
+    batch_size: int = BORROW_ARCHIVE_BATCH_SIZE,
+) -> int:
+    # Short transaction per batch so the hot table is never locked for long
+    cutoff = (today or date.today()) - timedelta(days=BORROW_ARCHIVE_AFTER_DAYS)
+    archived = 0
+    while True:
+        moved = archive_batch(db, cutoff, batch_size)
+        archived += moved
+        if moved < batch_size:
+            return archived
+
+
+def run_borrow_archive():
+    with single_worker(engine, "borrow archive") as acquired:
+        if not acquired:
+            return
+        db = SessionLocal()
+        try:
+            archived = archive_borrows(db)
+            if archived:
+                logger.info("Borrow archival moved %d returned loans", archived)
+        finally:
+            db.close()
+
+
+def archive(db: Session) -> ResponseSchema:
+    try:
+        archived = archive_borrows(db)
+        return ResponseSchema(
+            status="success",
+            message=f"Archived {archived} returned borrows",
+            data=BorrowArchiveResponse(archived=archived),
+        )
+
+    except SQLAlchemyError as e:
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Database error: {str(e._message())}",
+        )
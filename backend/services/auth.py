@@ -1,11 +1,22 @@
 from os import name
 from fastapi import HTTPException, status
+from jose import JWTError, jwt
+from sqlalchemy import select, update
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import SQLAlchemyError
 
-from core.jwt import hash_password, verify_password, create_access_token
+from core.jwt import (
+    ALGORITHM,
+    SECRET_KEY,
+    create_access_token,
+    create_refresh_token,
+    hash_password,
+    verify_and_update_password,
+)
+from core.token_denylist import refresh_denylist
+from models.refresh_token import RefreshToken
 from models.user import User
-from schemas.user import UserRegister, UserLogin
+from schemas.user import UserRegister, UserLogin, TokenRefresh
 from schemas.response_custom import ResponseSchema
 
 
@@ -43,6 +54,74 @@ def register(user: UserRegister, db: Session) -> ResponseSchema:
     )
 
 
+def issue_tokens(db_user, db: Session, family_id: str = None) -> dict:
+    # Caller commits so the stored refresh token lands with its transaction.
+    # A login starts a new family; a rotation passes the family it continues.
+    access_token = create_access_token(data={
+        "sub": db_user.email,
+        "id": db_user.id,
+        "name": db_user.name,
+        "role": db_user.role,
+        })
+    refresh_token, jti, expires_at = create_refresh_token(
+        data={"sub": db_user.email, "id": db_user.id}
+    )
+    db.add(
+        RefreshToken(
+            jti=jti,
+            user_id=db_user.id,
+            family_id=family_id or jti,
+            expires_at=expires_at,
+        )
+    )
+
+    return {
+        "access_token": access_token,
+        "token_type": "Bearer",
+        "refresh_token": refresh_token,
+    }
+
+
+def decode_refresh_token(token: str) -> dict:
+    try:
+        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+    except JWTError as e:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail=f"Invalid token: {str(e)}",
+        )
+
+    if payload.get("type") != "refresh" or "jti" not in payload:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid token: not a refresh token",
+        )
+
+    return payload
+
+
+def revoke_family(payload: dict, db: Session):
+    # Replay of a rotated or revoked token: revoke every live token rotated
+    # from the same login so a stolen chain cannot continue. Sessions the
+    # user started elsewhere belong to other families and stay valid.
+    family = (
+        select(RefreshToken.family_id)
+        .where(RefreshToken.jti == payload["jti"])
+        .scalar_subquery()
+    )
+    db.execute(
+        update(RefreshToken)
+        .where(RefreshToken.family_id == family, RefreshToken.revoked.is_(False))
+        .values(revoked=True)
+    )
+    db.commit()
+    refresh_denylist.add(payload["jti"], payload["exp"])
+    raise HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Refresh token has been revoked",
+    )
+
+
 def login(user: UserLogin, db: Session) -> ResponseSchema:
     try:
         db_user = db.query(User).filter(User.email == user.email).first()
@@ -53,17 +132,20 @@ def login(user: UserLogin, db: Session) -> ResponseSchema:
                 message="Email is incorrect",
             )
      
-        if not verify_password(user.password, db_user.password):
+        valid, new_hash = verify_and_update_password(user.password, db_user.password)
+        if not valid:
             return ResponseSchema(
                 status="error",
                 message="Password is incorrect",
             )
 
-        access_token = create_access_token(data={
-            "sub": db_user.email,
-            "name": db_user.name,
-            "role": db_user.role,
-            })
+        tokens = issue_tokens(db_user, db)
+
+        # Outdated cost factor: store the fresh hash computed during verify
+        if new_hash:
+            db_user.password = new_hash
+
+        db.commit()
 
     except SQLAlchemyError as e:
         db.rollback()
@@ -75,8 +157,85 @@ def login(user: UserLogin, db: Session) -> ResponseSchema:
     return ResponseSchema(
         status="success",
         message="Login successful",
-        data={
-            "access_token": access_token,
-            "token_type": "Bearer",
-        },
+        data=tokens,
+    )
+
+
+def refresh(token: TokenRefresh, db: Session) -> ResponseSchema:
+    # Signature check plus one indexed row update; no password hashing
+    payload = decode_refresh_token(token.refresh_token)
+
+    try:
+        # A deny-listed token is already known to be used; skip straight to
+        # revoking its family rather than rejecting it on its own
+        if payload["jti"] in refresh_denylist:
+            revoke_family(payload, db)
+
+        # Rotation: the presented token is single-use
+        used = db.execute(
+            update(RefreshToken)
+            .where(RefreshToken.jti == payload["jti"], RefreshToken.revoked.is_(False))
+            .values(revoked=True)
+            .returning(RefreshToken.user_id, RefreshToken.family_id)
+        ).first()
+
+        if used is None:
+            revoke_family(payload, db)
+
+        db_user = (
+            db.query(User.id, User.name, User.email, User.role)
+            .filter(User.id == used.user_id)
+            .first()
+        )
+        if db_user is None:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="User not found",
+            )
+
+        tokens = issue_tokens(db_user, db, used.family_id)
+        db.commit()
+        refresh_denylist.add(payload["jti"], payload["exp"])
+
+    except SQLAlchemyError as e:
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Database error: {str(e._message())}",
+        )
+
+    return ResponseSchema(
+        status="success",
+        message="Token refreshed successfully",
+        data=tokens,
+    )
+
+
+def logout(token: TokenRefresh, db: Session) -> ResponseSchema:
+    payload = decode_refresh_token(token.refresh_token)
+    if payload["jti"] in refresh_denylist:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Refresh token has been revoked",
+        )
+
+    try:
+        db.execute(
+            update(RefreshToken)
+            .where(RefreshToken.jti == payload["jti"])
+            .values(revoked=True)
+        )
+        db.commit()
+        refresh_denylist.add(payload["jti"], payload["exp"])
+
+    except SQLAlchemyError as e:
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Database error: {str(e._message())}",
+        )
+
+    return ResponseSchema(
+        status="success",
+        message="Logged out successfully",
     )
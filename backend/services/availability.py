@@ -0,0 +1,63 @@
+import asyncio
+import os
+from typing import Iterable
+
+from dotenv import load_dotenv
+from fastapi import Request
+from fastapi.responses import StreamingResponse
+
+from core import pubsub
+
+# Load environment variables
+load_dotenv()
+
+CHANNEL = "book_availability"
+# Comment lines keep idle streams open through proxies
+SSE_HEARTBEAT_SECONDS = int(os.getenv("SSE_HEARTBEAT_SECONDS", "15"))
+SSE_RETRY_MS = 5000
+
+
+def publish(db, rows: Iterable):
+    # rows are (book_id, available_quantity) pairs read back by the write.
+    # The caller owns the transaction: nothing is sent unless it commits.
+    pubsub.stage(
+        db,
+        CHANNEL,
+        [
+            {"book_id": book_id, "available_quantity": available_quantity}
+            for book_id, available_quantity in rows
+        ],
+    )
+
+
+async def iter_availability(request: Request):
+    subscription = pubsub.hub.subscribe(CHANNEL)
+    try:
+        # Clients refetch the book list on "ready", so nothing is missed
+        # between their snapshot and the first delta, including on reconnect
+        yield f"retry: {SSE_RETRY_MS}\nevent: ready\ndata: {{}}\n\n"
+        while True:
+            try:
+                message = await asyncio.wait_for(
+                    subscription.queue.get(), SSE_HEARTBEAT_SECONDS
+                )
+            except asyncio.TimeoutError:
+                if subscription.ended or await request.is_disconnected():
+                    break
+                yield ": ping\n\n"
+                continue
+            if message is None:
+                break
+            yield f"event: availability\ndata: {message}\n\n"
+            if subscription.ended and subscription.queue.empty():
+                break
+    finally:
+        pubsub.hub.unsubscribe(CHANNEL, subscription)
+
+
+def stream_availability(request: Request) -> StreamingResponse:
+    return StreamingResponse(
+        iter_availability(request),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -1,13 +1,46 @@
+import csv
+import io
+import json
+from typing import BinaryIO, Optional
 from fastapi import HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi.responses import StreamingResponse
+from pydantic import ValidationError
+from sqlalchemy.orm import Session, contains_eager
 from sqlalchemy.exc import SQLAlchemyError
-from sqlalchemy import or_
+from sqlalchemy import insert, or_, select
 
 
 from models.categories import Category
 from models.book import Book
-from schemas.book import BookCreate, BookUpdate
+from schemas.book import (
+    BookCreate,
+    BookImportError,
+    BookImportResponse,
+    BookImportRow,
+    BookListItem,
+    BookListNormalized,
+    BookUpdate,
+)
+from schemas.category import CategoryResponse
 from schemas.response_custom import ResponseSchema
+from services import availability, search, stats
+from services.typeahead import typeahead_index
+from core.fast_json import FastJSONResponse, fast_response, model_rows
+from core.response_cache import bump_versions
+
+STREAM_BATCH_SIZE = 1000
+IMPORT_BATCH_SIZE = 1000
+IMPORT_MAX_ERRORS = 1000
+CSV_COLUMNS = [
+    "id",
+    "title",
+    "author",
+    "year",
+    "quantity",
+    "available_quantity",
+    "category_id",
+    "category_name",
+]
 
 
 def create_book(book: BookCreate, db: Session) -> ResponseSchema:
@@ -15,8 +48,16 @@ def create_book(book: BookCreate, db: Session) -> ResponseSchema:
         new_book = Book(**book.model_dump())
         new_book.available_quantity = new_book.quantity
         db.add(new_book)
+        db.execute(stats.catalog_statement(new_book.category_id, 1, new_book.quantity))
+        bump_versions(db, "books")
         db.commit()
         db.refresh(new_book)
+        search.book_index.upsert(
+            new_book.id, new_book.title, new_book.author, new_book.category.name
+        )
+        typeahead_index.upsert(
+            new_book.id, new_book.title, new_book.author, new_book.borrow_count
+        )
 
     except SQLAlchemyError as e:
         db.rollback()
@@ -36,12 +77,17 @@ def update_book(book_id: int, book: BookUpdate, db: Session) -> ResponseSchema:
     try:
         book_db = db.query(Book).filter(Book.id == book_id).first()
         if not book_db:
-            raise ResponseSchema(
-                status="success",
-                message="Book not found",
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Book not found",
             )
 
         update_data = book.model_dump(exclude_unset=True)
+        previous = (
+            book_db.category_id,
+            book_db.quantity,
+            book_db.quantity - book_db.available_quantity,
+        )
 
         if "quantity" in update_data:
             new_quantity = update_data["quantity"]
@@ -49,18 +95,38 @@ def update_book(book_id: int, book: BookUpdate, db: Session) -> ResponseSchema:
 
             # ตรวจสอบว่า new_quantity ไม่ต่ำกว่าจำนวนที่ถูกยืมอยู่
             if new_quantity < borrowed_count:
-                raise ResponseSchema(
-                    status="success",
-                    message=f"Cannot set quantity lower than borrowed count ({borrowed_count})",
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=f"Cannot set quantity lower than borrowed count ({borrowed_count})",
                 )
 
             update_data["available_quantity"] = new_quantity - borrowed_count
 
         for key, value in update_data.items():
             setattr(book_db, key, value)
+        if "available_quantity" in update_data:
+            availability.publish(db, [(book_db.id, book_db.available_quantity)])
 
+        # Move the book's totals out of its old category and into the new one
+        category_id, quantity, on_loan = previous
+        db.execute(stats.catalog_statement(category_id, -1, -quantity, -on_loan))
+        db.execute(
+            stats.catalog_statement(
+                book_db.category_id,
+                1,
+                book_db.quantity,
+                book_db.quantity - book_db.available_quantity,
+            )
+        )
+        bump_versions(db, "books")
         db.commit()
         db.refresh(book_db)
+        search.book_index.upsert(
+            book_db.id, book_db.title, book_db.author, book_db.category.name
+        )
+        typeahead_index.upsert(
+            book_db.id, book_db.title, book_db.author, book_db.borrow_count
+        )
 
     except SQLAlchemyError as e:
         db.rollback()
@@ -76,32 +142,166 @@ def update_book(book_id: int, book: BookUpdate, db: Session) -> ResponseSchema:
     )
 
 
-def get_all_books(db: Session) -> ResponseSchema:
+def normalized_books_statement():
+    return select(
+        Book.id,
+        Book.title,
+        Book.author,
+        Book.year,
+        Book.quantity,
+        Book.available_quantity,
+        Book.category_id,
+    ).order_by(Book.id)
+
+
+def normalized_categories_statement():
+    return (
+        select(Category.id, Category.name)
+        .where(Category.id.in_(select(Book.category_id)))
+        .order_by(Category.id)
+    )
+
+
+def normalized_books(categories, books) -> dict:
+    return {
+        "categories": model_rows(categories, CategoryResponse),
+        "books": model_rows(books, BookListItem),
+    }
+
+
+def normalize_books(books: list[Book]) -> BookListNormalized:
+    # For ORM results whose categories are already loaded
+    categories = {book.category.id: book.category for book in books}
+    return BookListNormalized(
+        categories=[
+            CategoryResponse(id=category.id, name=category.name)
+            for category in categories.values()
+        ],
+        books=[BookListItem.model_validate(book) for book in books],
+    )
+
+
+def get_all_books(db: Session, shape: str = None) -> FastJSONResponse:
+    # Payloads are built from row tuples and encoded without re-validation
     try:
-        books_db = db.query(Book).all()
+        if shape == "normalized":
+            books_db = normalized_books(
+                db.execute(normalized_categories_statement()),
+                db.execute(normalized_books_statement()),
+            )
+        else:
+            books_db = [book_row(row) for row in db.execute(book_columns_statement())]
     except SQLAlchemyError as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Database error: {str(e._message())}",
         )
 
-    return ResponseSchema(
-        status="success",
-        message="Books fetched successfully",
-        data=books_db,
+    return fast_response("Books fetched successfully", books_db)
+
+
+def book_columns_statement():
+    return (
+        select(
+            Book.id,
+            Book.title,
+            Book.author,
+            Book.year,
+            Book.quantity,
+            Book.available_quantity,
+            Category.id.label("category_id"),
+            Category.name.label("category_name"),
+        )
+        .join(Category, Book.category_id == Category.id)
+        .order_by(Book.id)
+    )
+
+
+def book_rows_statement():
+    # Server-side cursor: rows are fetched from the database in batches of
+    # STREAM_BATCH_SIZE instead of materializing the whole catalog.
+    return book_columns_statement().execution_options(yield_per=STREAM_BATCH_SIZE)
+
+
+def book_row(row) -> dict:
+    # BookResponse shape for a book_columns_statement row
+    return {
+        "id": row.id,
+        "title": row.title,
+        "author": row.author,
+        "year": row.year,
+        "quantity": row.quantity,
+        "available_quantity": row.available_quantity,
+        "category": {"id": row.category_id, "name": row.category_name},
+    }
+
+
+def ndjson_chunk(batch) -> str:
+    return "".join(
+        json.dumps(book_row(row), ensure_ascii=False) + "\n" for row in batch
     )
 
 
+def csv_chunk(batch) -> str:
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(batch)
+    return buffer.getvalue()
+
+
+def csv_header() -> str:
+    return csv_chunk([CSV_COLUMNS])
+
+
+def iter_books(db: Session, fmt: str):
+    format_chunk = csv_chunk if fmt == "csv" else ndjson_chunk
+    if fmt == "csv":
+        yield csv_header()
+    result = db.execute(book_rows_statement())
+    try:
+        for batch in result.partitions():
+            yield format_chunk(batch)
+    finally:
+        result.close()
+
+
+def streaming_books_response(chunks, fmt: str) -> StreamingResponse:
+    if fmt == "csv":
+        return StreamingResponse(
+            chunks,
+            media_type="text/csv",
+            headers={"Content-Disposition": 'attachment; filename="books.csv"'},
+        )
+    return StreamingResponse(chunks, media_type="application/x-ndjson")
+
+
+def stream_books(db: Session, fmt: str) -> StreamingResponse:
+    return streaming_books_response(iter_books(db, fmt), fmt)
+
+
 def get_books_by_query(
-    db: Session, category_name: str = None, book_name: str = None
+    db: Session,
+    category_name: str = None,
+    book_name: str = None,
+    q: str = None,
+    limit: Optional[int] = None,
+    shape: str = None,
 ) -> ResponseSchema:
     try:
-        query = db.query(Book).join(Category)
+        # The join already selects the category; populate book.category from it
+        query = db.query(Book).join(Category).options(contains_eager(Book.category))
         if book_name:
             query = query.filter(Book.title.ilike(f"%{book_name}%"))
         if category_name:
             query = query.filter(Category.name.ilike(f"%{category_name}%"))
-        books_db = query.all()
+
+        # Only ranked search is capped by default; the name filters return
+        # every match unless a limit is asked for
+        if q:
+            books_db = search.search_books(db, query, q, limit or search.DEFAULT_LIMIT)
+        else:
+            books_db = query.order_by(Book.id).limit(limit).all()
+        if shape == "normalized":
+            books_db = normalize_books(books_db)
 
     except SQLAlchemyError as e:
         raise HTTPException(
@@ -114,3 +314,127 @@ def get_books_by_query(
         message="Books fetched successfully",
         data=books_db,
     )
+
+
+def iter_import_records(file: BinaryIO, fmt: str):
+    # Reads the upload line by line so only one row is held at a time.
+    text = io.TextIOWrapper(file, encoding="utf-8-sig", newline="")
+    if fmt == "csv":
+        reader = csv.DictReader(text)
+        for row_number, record in enumerate(reader, start=2):
+            yield row_number, record
+    else:
+        for row_number, line in enumerate(text, start=1):
+            if not line.strip():
+                continue
+            try:
+                yield row_number, json.loads(line)
+            except ValueError as e:
+                yield row_number, e
+
+
+def resolve_categories(names: set[str], cache: dict[str, int], db: Session):
+    missing = names - cache.keys()
+    if not missing:
+        return
+    for category_id, name in db.execute(
+        select(Category.id, Category.name).where(Category.name.in_(missing))
+    ):
+        cache[name] = category_id
+    missing -= cache.keys()
+    if missing:
+        created = db.execute(
+            insert(Category).returning(Category.id, Category.name),
+            [{"name": name} for name in missing],
+        ).all()
+        for category_id, name in created:
+            cache[name] = category_id
+        stats.add_categories(db, [category_id for category_id, _ in created])
+
+
+def flush_import_batch(rows: list[BookImportRow], cache: dict[str, int], db: Session):
+    resolve_categories({row.category for row in rows}, cache, db)
+    # executemany-style insert; SQLAlchemy batches these into multi-row VALUES
+    db.execute(
+        insert(Book),
+        [
+            {
+                "category_id": cache[row.category],
+                "title": row.title,
+                "author": row.author,
+                "year": row.year,
+                "quantity": row.quantity,
+                "available_quantity": row.quantity,
+            }
+            for row in rows
+        ],
+    )
+    totals: dict[int, list[int]] = {}
+    for row in rows:
+        category_totals = totals.setdefault(cache[row.category], [0, 0])
+        category_totals[0] += 1
+        category_totals[1] += row.quantity
+    for category_id, (books, copies) in totals.items():
+        db.execute(stats.catalog_statement(category_id, books, copies))
+    bump_versions(db, "books", "categories")
+    db.commit()
+
+
+def import_books(file: BinaryIO, fmt: str, db: Session) -> ResponseSchema:
+    imported = 0
+    failed = 0
+    errors: list[BookImportError] = []
+    category_cache: dict[str, int] = {}
+    batch: list[BookImportRow] = []
+
+    try:
+        for row_number, record in iter_import_records(file, fmt):
+            try:
+                if isinstance(record, Exception):
+                    raise record
+                batch.append(BookImportRow.model_validate(record))
+            except ValidationError as e:
+                failed += 1
+                if len(errors) < IMPORT_MAX_ERRORS:
+                    message = "; ".join(
+                        f"{'.'.join(str(loc) for loc in err['loc'])}: {err['msg']}"
+                        for err in e.errors()
+                    )
+                    errors.append(BookImportError(row=row_number, error=message))
+                continue
+            except ValueError as e:
+                failed += 1
+                if len(errors) < IMPORT_MAX_ERRORS:
+                    errors.append(BookImportError(row=row_number, error=str(e)))
+                continue
+
+            if len(batch) >= IMPORT_BATCH_SIZE:
+                flush_import_batch(batch, category_cache, db)
+                imported += len(batch)
+                batch = []
+
+        if batch:
+            flush_import_batch(batch, category_cache, db)
+            imported += len(batch)
+
+    except SQLAlchemyError as e:
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Database error after {imported} rows: {str(e._message())}",
+        )
+    except UnicodeDecodeError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"File is not valid UTF-8 (after {imported} rows)",
+        )
+    finally:
+        if imported:
+            search.book_index.invalidate()
+            typeahead_index.invalidate()
+
+    return ResponseSchema(
+        status="success",
+        message=f"Imported {imported} books, {failed} rows failed",
+        data=BookImportResponse(imported=imported, failed=failed, errors=errors),
+    )
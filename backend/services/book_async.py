@@ -0,0 +1,52 @@
+from fastapi import HTTPException, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.fast_json import FastJSONResponse, fast_response
+from services.book import (
+    book_columns_statement,
+    book_row,
+    book_rows_statement,
+    csv_chunk,
+    csv_header,
+    ndjson_chunk,
+    normalized_books,
+    normalized_books_statement,
+    normalized_categories_statement,
+    streaming_books_response,
+)
+
+
+async def get_all_books(db: AsyncSession, shape: str = None) -> FastJSONResponse:
+    try:
+        if shape == "normalized":
+            categories = await db.execute(normalized_categories_statement())
+            books = await db.execute(normalized_books_statement())
+            books_db = normalized_books(categories, books)
+        else:
+            result = await db.execute(book_columns_statement())
+            books_db = [book_row(row) for row in result]
+    except SQLAlchemyError as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Database error: {str(e._message())}",
+        )
+
+    return fast_response("Books fetched successfully", books_db)
+
+
+async def iter_books(db: AsyncSession, fmt: str):
+    format_chunk = csv_chunk if fmt == "csv" else ndjson_chunk
+    if fmt == "csv":
+        yield csv_header()
+    result = await db.stream(book_rows_statement())
+    try:
+        async for batch in result.partitions():
+            yield format_chunk(batch)
+    finally:
+        await result.close()
+
+
+def stream_books(db: AsyncSession, fmt: str) -> StreamingResponse:
+    return streaming_books_response(iter_books(db, fmt), fmt)
@@ -1,89 +1,226 @@
+import base64
+from collections import Counter
 from fastapi import HTTPException, status
 from sqlalchemy.orm import Session
-from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+from sqlalchemy import and_, case, insert, or_, select, union_all, update
 from datetime import date
+from typing import Optional
 
-from models.borrow import Borrows
+from models.borrow import BorrowArchive, Borrows
 from models.borrow import BorrowStatus
 from models.user import User
 from models.book import Book
 from schemas.borrow import (
     ApproveReturnBookResponse,
+    BorrowBatchCreate,
+    BorrowBatchItemResponse,
     BorrowCreate,
     BorrowBookResponse,
+    BulkApproveReturnRequest,
+    BulkApproveReturnResponse,
     HistoryResponse,
     ReturnBookResponse,
     ActiveBorrowResponse,
 )
 from schemas.response_custom import ResponseSchema
-
-
-def increment_available_quantity(book_id: int, db: Session):
-    try:
-        book = db.query(Book).filter(Book.id == book_id).first()
-        book.available_quantity += 1
-        db.commit()
-        db.refresh(book)
-
-        return ResponseSchema(
-            status="success",
-            message="Available quantity incremented successfully",
-            data=book,
+from schemas.user import Principal
+from core.fast_json import FastJSONResponse, fast_response, model_rows
+from core.response_cache import bump_versions
+from services import availability, stats
+
+
+def borrow_projection(model=Borrows):
+    # Join books and users once and select only the columns the borrow
+    # listing responses need, so no row triggers a lazy load. `model` is
+    # Borrows or BorrowArchive.
+    return (
+        select(
+            model.id.label("borrow_id"),
+            Book.title.label("book"),
+            User.name.label("user"),
+            model.borrow_date,
+            model.due_date,
+            model.return_date,
+            model.status,
         )
-
-    except SQLAlchemyError as e:
-        db.rollback()
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Database error: {str(e._message())}",
+        .join(Book, model.book_id == Book.id)
+        .join(User, model.user_id == User.id)
+    )
+
+
+def after_cursor(model, cursor: str):
+    # Keyset condition for the newest-first (borrow_date, id) order
+    cursor_date, cursor_id = decode_cursor(cursor)
+    return or_(
+        model.borrow_date < cursor_date,
+        and_(model.borrow_date == cursor_date, model.id < cursor_id),
+    )
+
+
+def borrow_page_query(
+    cursor: Optional[str] = None,
+    limit: int = 100,
+    borrow_status: Optional[BorrowStatus] = None,
+    user_id: Optional[int] = None,
+    book_id: Optional[int] = None,
+    due_from: Optional[date] = None,
+    due_to: Optional[date] = None,
+):
+    stmt = borrow_projection()
+
+    if borrow_status:
+        stmt = stmt.where(Borrows.status == borrow_status)
+    if user_id:
+        stmt = stmt.where(Borrows.user_id == user_id)
+    if book_id:
+        stmt = stmt.where(Borrows.book_id == book_id)
+    if due_from:
+        stmt = stmt.where(Borrows.due_date >= due_from)
+    if due_to:
+        stmt = stmt.where(Borrows.due_date <= due_to)
+
+    # Keyset pagination, newest first: continue strictly after the cursor
+    if cursor:
+        stmt = stmt.where(after_cursor(Borrows, cursor))
+
+    # One extra row tells whether another page exists
+    return stmt.order_by(Borrows.borrow_date.desc(), Borrows.id.desc()).limit(limit + 1)
+
+
+def history_page_query(user_id: int, cursor: Optional[str] = None, limit: int = 100):
+    # Recent returns still in borrows merged with the archive, newest first.
+    # Each side is limited on its own so both stay on their user indexes.
+    branches = []
+    for model in (Borrows, BorrowArchive):
+        stmt = borrow_projection(model).where(
+            model.user_id == user_id, model.status == BorrowStatus.returned
         )
+        if cursor:
+            stmt = stmt.where(after_cursor(model, cursor))
+        branches.append(
+            stmt.order_by(model.borrow_date.desc(), model.id.desc())
+            .limit(limit + 1)
+            .subquery()
+        )
+    merged = union_all(*(select(branch) for branch in branches)).subquery()
+    return (
+        select(merged)
+        .order_by(merged.c.borrow_date.desc(), merged.c.borrow_id.desc())
+        .limit(limit + 1)
+    )
+
+
+def borrow_page(
+    rows,
+    limit: int,
+    model=ActiveBorrowResponse,
+    message: str = "All borrowed books retrieved successfully",
+) -> FastJSONResponse:
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_cursor(last.borrow_date, last.borrow_id)
+
+    # Rows come straight from borrow_projection, so they skip model validation
+    return fast_response(
+        message,
+        model_rows(rows, model),
+        next_cursor=next_cursor,
+        paginated=True,
+    )
+
+
+def decrement_statement(book_ids: list[int]):
+    # Conditional decrement: only succeeds while copies are left, so
+    # concurrent borrows cannot oversell.
+    return (
+        update(Book)
+        .where(Book.id.in_(book_ids), Book.available_quantity > 0)
+        .values(
+            available_quantity=Book.available_quantity - 1,
+            borrow_count=Book.borrow_count + 1,
+        )
+        .returning(Book.id, Book.title, Book.available_quantity)
+    )
+
+
+def adjust_overdue_counts(db: Session, rows, delta: int):
+    # rows are (user_id, book_id) pairs; one grouped update per table.
+    # The caller owns the transaction and commits.
+    for model, counts in (
+        (User, Counter(user_id for user_id, _ in rows)),
+        (Book, Counter(book_id for _, book_id in rows)),
+    ):
+        if counts:
+            deltas = {key: count * delta for key, count in counts.items()}
+            db.execute(
+                update(model)
+                .where(model.id.in_(deltas))
+                .values(
+                    overdue_count=model.overdue_count
+                    + case(deltas, value=model.id, else_=0)
+                )
+            )
 
 
-def decrement_available_quantity(book_id: int, db: Session):
-    try:
-        book = db.query(Book).filter(Book.id == book_id).first()
-        book.available_quantity -= 1
-        db.commit()
-        db.refresh(book)
+def encode_cursor(borrow_date: date, borrow_id: int) -> str:
+    raw = f"{borrow_date.isoformat()}|{borrow_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode()
 
-        return ResponseSchema(
-            status="success",
-            message="Available quantity decremented successfully",
-            data=book,
-        )
 
-    except SQLAlchemyError as e:
-        db.rollback()
+def decode_cursor(cursor: str) -> tuple[date, int]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode()).decode()
+        borrow_date, borrow_id = raw.split("|")
+        return date.fromisoformat(borrow_date), int(borrow_id)
+    except ValueError:
         raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Database error: {str(e._message())}",
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor",
         )
 
 
-def get_borrow(user: User, db: Session) -> ResponseSchema:
+def increment_available_quantity(book_id: int, db: Session):
+    # Set-based increment; the caller owns the transaction and commits.
+    rows = db.execute(
+        update(Book)
+        .where(Book.id == book_id)
+        .values(available_quantity=Book.available_quantity + 1)
+        .returning(Book.id, Book.available_quantity)
+    ).all()
+    availability.publish(db, rows)
+
+
+def decrement_available_quantity(book_id: int, db: Session) -> Optional[str]:
+    # Returns the book title, or None when the book is missing or out of
+    # stock. The caller commits.
+    row = db.execute(decrement_statement([book_id])).first()
+    if row is None:
+        return None
+    availability.publish(db, [(row.id, row.available_quantity)])
+    return row.title
+
+
+def get_borrow(
+    user: Principal,
+    db: Session,
+    cursor: Optional[str] = None,
+    limit: int = 100,
+    borrow_status: Optional[BorrowStatus] = None,
+    user_id: Optional[int] = None,
+    book_id: Optional[int] = None,
+    due_from: Optional[date] = None,
+    due_to: Optional[date] = None,
+) -> FastJSONResponse:
     try:
-        # Query borrows with status "borrowed" and join with book and user
-        borrows = db.query(Borrows).all()
-
-        # Create response list with book title, user name, borrow date, and due date
-        responses = [
-            ActiveBorrowResponse(
-                borrow_id=borrow.id,
-                book=borrow.book.title,
-                user=borrow.user.name,
-                borrow_date=borrow.borrow_date,
-                due_date=borrow.due_date,
-                return_date=borrow.return_date,
-                status=borrow.status,
+        rows = db.execute(
+            borrow_page_query(
+                cursor, limit, borrow_status, user_id, book_id, due_from, due_to
             )
-            for borrow in borrows
-        ]
-
-        return ResponseSchema(
-            status="success",
-            message="All borrowed books retrieved successfully",
-            data=responses,
-        )
+        ).all()
+        return borrow_page(rows, limit)
 
     except SQLAlchemyError as e:
         db.rollback()
@@ -93,7 +230,7 @@ def get_borrow(user: User, db: Session) -> ResponseSchema:
         )
 
 
-def create_borrow(borrow: BorrowCreate, user: User, db: Session) -> ResponseSchema:
+def create_borrow(borrow: BorrowCreate, user: Principal, db: Session) -> ResponseSchema:
     try:
         existing_borrow = (
             db.query(Borrows)
@@ -111,26 +248,48 @@ def create_borrow(borrow: BorrowCreate, user: User, db: Session) -> ResponseSche
                 detail="You have already borrowed this book and not returned it yet.",
             )
 
-        decrement_available_quantity(borrow.book_id, db)
+        book_title = decrement_available_quantity(borrow.book_id, db)
+        if book_title is None:
+            if not db.query(Book.id).filter(Book.id == borrow.book_id).first():
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail="Book not found",
+                )
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="No copies of this book are available.",
+            )
+
         new_borrow = Borrows(**borrow.model_dump())
         new_borrow.user_id = user.id
         db.add(new_borrow)
-        db.commit()
-        db.refresh(new_borrow)
+        db.flush()
+        stats.record(db, stats.borrowed_statements([borrow.book_id]))
 
         response = BorrowBookResponse(
-            book=new_borrow.book.title,
+            book=book_title,
             borrow_date=new_borrow.borrow_date,
             due_date=new_borrow.due_date,
-            borrower=new_borrow.user.name,
+            borrower=user.name,
         )
 
+        # Inventory decrement and borrow insert commit together
+        bump_versions(db, "books")
+        db.commit()
+
         return ResponseSchema(
             status="success",
             message="Borrow created successfully",
             data=response,
         )
 
+    except IntegrityError:
+        # A concurrent request inserted the same loan after our check
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="You have already borrowed this book and not returned it yet.",
+        )
     except SQLAlchemyError as e:
         db.rollback()
         raise HTTPException(
@@ -139,7 +298,108 @@ def create_borrow(borrow: BorrowCreate, user: User, db: Session) -> ResponseSche
         )
 
 
-def return_borrow(borrow_id: int, user: User, db: Session) -> ResponseSchema:
+def create_borrow_batch(
+    batch: BorrowBatchCreate, user: Principal, db: Session
+) -> ResponseSchema:
+    try:
+        book_ids = list(dict.fromkeys(batch.book_ids))
+        results: dict[int, BorrowBatchItemResponse] = {}
+
+        # 1. Duplicate check for every requested book in one query
+        already_borrowed = {
+            book_id
+            for (book_id,) in db.query(Borrows.book_id).filter(
+                Borrows.user_id == user.id,
+                Borrows.book_id.in_(book_ids),
+                Borrows.status != BorrowStatus.returned,
+            )
+        }
+        for book_id in already_borrowed:
+            results[book_id] = BorrowBatchItemResponse(
+                book_id=book_id,
+                success=False,
+                message="You have already borrowed this book and not returned it yet.",
+            )
+
+        # 2. One set-based conditional decrement for the remaining books
+        candidates = [book_id for book_id in book_ids if book_id not in already_borrowed]
+        decremented = {}
+        if candidates:
+            rows = db.execute(decrement_statement(candidates)).all()
+            decremented = {row.id: row.title for row in rows}
+            availability.publish(db, [(row.id, row.available_quantity) for row in rows])
+
+        missing = [book_id for book_id in candidates if book_id not in decremented]
+        if missing:
+            existing = {
+                book_id for (book_id,) in db.query(Book.id).filter(Book.id.in_(missing))
+            }
+            for book_id in missing:
+                results[book_id] = BorrowBatchItemResponse(
+                    book_id=book_id,
+                    success=False,
+                    message=(
+                        "No copies of this book are available."
+                        if book_id in existing
+                        else "Book not found"
+                    ),
+                )
+
+        # 3. Multi-row insert of the new borrows, committed with the decrement
+        borrow_date = date.today()
+        if decremented:
+            db.execute(
+                insert(Borrows),
+                [
+                    {
+                        "book_id": book_id,
+                        "user_id": user.id,
+                        "borrow_date": borrow_date,
+                        "due_date": batch.due_date,
+                        "status": BorrowStatus.borrowed,
+                    }
+                    for book_id in decremented
+                ],
+            )
+            stats.record(db, stats.borrowed_statements(list(decremented)))
+        for book_id, title in decremented.items():
+            results[book_id] = BorrowBatchItemResponse(
+                book_id=book_id,
+                success=True,
+                message="Borrow created successfully",
+                borrow=BorrowBookResponse(
+                    borrower=user.name,
+                    book=title,
+                    borrow_date=borrow_date,
+                    due_date=batch.due_date,
+                ),
+            )
+
+        bump_versions(db, "books")
+        db.commit()
+
+        return ResponseSchema(
+            status="success",
+            message=f"Borrowed {len(decremented)} of {len(book_ids)} books",
+            data=[results[book_id] for book_id in book_ids],
+        )
+
+    except IntegrityError:
+        # A concurrent request inserted the same loan after our check
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="You have already borrowed one of these books and not returned it yet.",
+        )
+    except SQLAlchemyError as e:
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Database error: {str(e._message())}",
+        )
+
+
+def return_borrow(borrow_id: int, user: Principal, db: Session) -> ResponseSchema:
     try:
         # 1. Get & Validate
         borrow = (
@@ -169,9 +429,24 @@ def return_borrow(borrow_id: int, user: User, db: Session) -> ResponseSchema:
         # 2. Business Logic
         return_date = date.today()
 
-        # 3. Perform Update
-        borrow.return_date = return_date
-        borrow.status = BorrowStatus.waiting_approve
+        # 3. Perform Update; conditional so a concurrent overdue scan or
+        # return is seen and the overdue counts stay exact
+        returned = db.execute(
+            update(Borrows)
+            .where(Borrows.id == borrow.id, Borrows.status == BorrowStatus.borrowed)
+            .values(return_date=return_date, status=BorrowStatus.waiting_approve)
+            .returning(Borrows.overdue_at)
+        ).first()
+        if returned is None:
+            db.rollback()
+            return ResponseSchema(
+                status="success",
+                message="Borrow already returned",
+                data=None,
+            )
+        if returned.overdue_at is not None:
+            adjust_overdue_counts(db, [(borrow.user_id, borrow.book_id)], -1)
+        stats.record(db, stats.returned_statements(1))
 
         # 4. Commit & Refresh
         db.commit()
@@ -202,33 +477,30 @@ def return_borrow(borrow_id: int, user: User, db: Session) -> ResponseSchema:
 
 def approve_return_borrow(borrow_id: int, db: Session) -> ResponseSchema:
     try:
-        borrow = (
-            db.query(Borrows)
-            .filter(Borrows.id == borrow_id)
-            .filter(Borrows.status == BorrowStatus.waiting_approve)
-            .first()
-        )
-        if not borrow:
+        # Conditional like the bulk path: of two concurrent approvals of the
+        # same borrow only one moves it, so the copy is returned once
+        approved = db.execute(
+            update(Borrows)
+            .where(Borrows.id == borrow_id, Borrows.status == BorrowStatus.waiting_approve)
+            .values(status=BorrowStatus.returned)
+            .returning(Borrows.book_id, Borrows.return_date)
+        ).first()
+        if approved is None:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Borrow not found",
             )
-        if borrow.status == BorrowStatus.returned:
-            return ResponseSchema(
-                status="success",
-                message="Borrow already returned",
-                data=None,
-            )
-        increment_available_quantity(borrow.book_id, db)
-        borrow.status = BorrowStatus.returned
+        increment_available_quantity(approved.book_id, db)
+        stats.record(db, stats.approved_statements([approved.book_id]))
+        bump_versions(db, "books")
+        book_title = db.scalar(select(Book.title).where(Book.id == approved.book_id))
         db.commit()
-        db.refresh(borrow)
 
         response = ApproveReturnBookResponse(
-            borrow_id=borrow.id,
-            book=borrow.book.title,
-            return_date=borrow.return_date,
-            status=borrow.status,
+            borrow_id=borrow_id,
+            book=book_title,
+            return_date=approved.return_date,
+            status=BorrowStatus.returned,
         )
         return ResponseSchema(
             status="success",
@@ -244,33 +516,56 @@ def approve_return_borrow(borrow_id: int, db: Session) -> ResponseSchema:
         )
 
 
-def history_borrow(user: User, db: Session) -> ResponseSchema:
+def bulk_approve_return_borrow(
+    request: BulkApproveReturnRequest, db: Session
+) -> ResponseSchema:
     try:
-        borrows = (
-            db.query(Borrows)
-            .filter(Borrows.user_id == user.id)
-            .filter(Borrows.status == BorrowStatus.returned)
-            .all()
-        )
+        # 1. Move every matching waiting_approve borrow to returned at once
+        conditions = []
+        if request.borrow_ids:
+            conditions.append(Borrows.id.in_(request.borrow_ids))
+        if request.book_ids:
+            conditions.append(Borrows.book_id.in_(request.book_ids))
+
+        approved = db.execute(
+            update(Borrows)
+            .where(Borrows.status == BorrowStatus.waiting_approve, or_(*conditions))
+            .values(status=BorrowStatus.returned)
+            .returning(Borrows.id, Borrows.book_id)
+        ).all()
+
+        # 2. One grouped increment for all affected books
+        per_book = Counter(book_id for _, book_id in approved)
+        if per_book:
+            rows = db.execute(
+                update(Book)
+                .where(Book.id.in_(per_book))
+                .values(
+                    available_quantity=Book.available_quantity
+                    + case(per_book, value=Book.id, else_=0)
+                )
+                .returning(Book.id, Book.available_quantity)
+            ).all()
+            availability.publish(db, rows)
+            stats.record(db, stats.approved_statements([book_id for _, book_id in approved]))
+            bump_versions(db, "books")
 
-        # ใช้ list comprehension แทน for loop
-        responses = [
-            HistoryResponse(
-                book=borrow.book.title,
-                user=borrow.user.name,
-                borrow_date=borrow.borrow_date,
-                due_date=borrow.due_date,
-                return_date=borrow.return_date,
-                status=borrow.status,
-            )
-            for borrow in borrows
-        ]
+        db.commit()
 
+        approved_ids = sorted(borrow_id for borrow_id, _ in approved)
+        skipped_ids = sorted(set(request.borrow_ids) - set(approved_ids))
+        response = BulkApproveReturnResponse(
+            approved=len(approved_ids),
+            borrow_ids=approved_ids,
+            skipped_borrow_ids=skipped_ids,
+            books=dict(per_book),
+        )
         return ResponseSchema(
             status="success",
-            message="History borrow",
-            data=responses,
+            message=f"Approved {len(approved_ids)} returns",
+            data=response,
         )
+
     except SQLAlchemyError as e:
         db.rollback()
         raise HTTPException(
@@ -279,33 +574,31 @@ def history_borrow(user: User, db: Session) -> ResponseSchema:
         )
 
 
-def current_borrow(user: User, db: Session) -> ResponseSchema:
+def history_borrow(
+    user: Principal, db: Session, cursor: Optional[str] = None, limit: int = 100
+) -> FastJSONResponse:
     try:
-        borrows = (
-            db.query(Borrows)
-            .filter(Borrows.user_id == user.id)
-            .all()
+        rows = db.execute(history_page_query(user.id, cursor, limit)).all()
+        return borrow_page(rows, limit, HistoryResponse, "History borrow")
+    except SQLAlchemyError as e:
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Database error: {str(e._message())}",
         )
 
-        # ใช้ list comprehension
-        responses = [
-            ActiveBorrowResponse(
-                borrow_id=borrow.id,
-                book=borrow.book.title,
-                user=borrow.user.name,
-                borrow_date=borrow.borrow_date,
-                due_date=borrow.due_date,
-                return_date=borrow.return_date,
-                status=borrow.status,
+
+def current_borrow(user: Principal, db: Session) -> FastJSONResponse:
+    # Loans still out or awaiting approval; returned ones, including those
+    # moved to the archive, are paged through history_borrow
+    try:
+        rows = db.execute(
+            borrow_projection().where(
+                Borrows.user_id == user.id, Borrows.status != BorrowStatus.returned
             )
-            for borrow in borrows
-        ]
+        ).all()
 
-        return ResponseSchema(
-            status="success",
-            message="Current borrow",
-            data=responses,
-        )
+        return fast_response("Current borrow", model_rows(rows, ActiveBorrowResponse))
 
     except SQLAlchemyError as e:
         db.rollback()
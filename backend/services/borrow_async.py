@@ -0,0 +1,163 @@
+from datetime import date
+from typing import Optional
+
+from fastapi import HTTPException, status
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from models.book import Book
+from models.borrow import Borrows, BorrowStatus
+from schemas.borrow import (
+    ActiveBorrowResponse,
+    BorrowBookResponse,
+    BorrowCreate,
+    HistoryResponse,
+)
+from schemas.response_custom import ResponseSchema
+from schemas.user import Principal
+from core.fast_json import FastJSONResponse, fast_response, model_rows
+from core.response_cache import version_bump_statement
+from services.borrow import (
+    borrow_page,
+    borrow_page_query,
+    borrow_projection,
+    decrement_statement,
+    history_page_query,
+)
+from services import availability
+from services.stats import borrowed_statements
+
+
+async def get_borrow(
+    user: Principal,
+    db: AsyncSession,
+    cursor: Optional[str] = None,
+    limit: int = 100,
+    borrow_status: Optional[BorrowStatus] = None,
+    user_id: Optional[int] = None,
+    book_id: Optional[int] = None,
+    due_from: Optional[date] = None,
+    due_to: Optional[date] = None,
+) -> FastJSONResponse:
+    try:
+        result = await db.execute(
+            borrow_page_query(
+                cursor, limit, borrow_status, user_id, book_id, due_from, due_to
+            )
+        )
+        return borrow_page(result.all(), limit)
+
+    except SQLAlchemyError as e:
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Database error: {str(e._message())}",
+        )
+
+
+async def create_borrow(
+    borrow: BorrowCreate, user: Principal, db: AsyncSession
+) -> ResponseSchema:
+    try:
+        existing_borrow = (
+            await db.execute(
+                select(Borrows.id).where(
+                    Borrows.user_id == user.id,
+                    Borrows.book_id == borrow.book_id,
+                    Borrows.status != BorrowStatus.returned,
+                )
+            )
+        ).first()
+
+        if existing_borrow:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="You have already borrowed this book and not returned it yet.",
+            )
+
+        decremented = (await db.execute(decrement_statement([borrow.book_id]))).first()
+        if decremented is None:
+            book = (
+                await db.execute(select(Book.id).where(Book.id == borrow.book_id))
+            ).first()
+            if not book:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail="Book not found",
+                )
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="No copies of this book are available.",
+            )
+
+        availability.publish(db, [(decremented.id, decremented.available_quantity)])
+
+        new_borrow = Borrows(**borrow.model_dump())
+        new_borrow.user_id = user.id
+        db.add(new_borrow)
+        await db.flush()
+        for stmt in borrowed_statements([borrow.book_id]):
+            await db.execute(stmt)
+
+        response = BorrowBookResponse(
+            book=decremented.title,
+            borrow_date=new_borrow.borrow_date,
+            due_date=new_borrow.due_date,
+            borrower=user.name,
+        )
+
+        # Inventory decrement and borrow insert commit together
+        await db.execute(version_bump_statement("books"))
+        await db.commit()
+
+        return ResponseSchema(
+            status="success",
+            message="Borrow created successfully",
+            data=response,
+        )
+
+    except IntegrityError:
+        # A concurrent request inserted the same loan after our check
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="You have already borrowed this book and not returned it yet.",
+        )
+    except SQLAlchemyError as e:
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Database error: {str(e._message())}",
+        )
+
+
+async def history_borrow(
+    user: Principal, db: AsyncSession, cursor: Optional[str] = None, limit: int = 100
+) -> FastJSONResponse:
+    try:
+        result = await db.execute(history_page_query(user.id, cursor, limit))
+        return borrow_page(result.all(), limit, HistoryResponse, "History borrow")
+    except SQLAlchemyError as e:
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Database error: {str(e._message())}",
+        )
+
+
+async def current_borrow(user: Principal, db: AsyncSession) -> FastJSONResponse:
+    try:
+        result = await db.execute(
+            borrow_projection().where(
+                Borrows.user_id == user.id, Borrows.status != BorrowStatus.returned
+            )
+        )
+        return fast_response("Current borrow", model_rows(result, ActiveBorrowResponse))
+
+    except SQLAlchemyError as e:
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Database error: {str(e._message())}",
+        )
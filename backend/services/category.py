@@ -6,6 +6,8 @@ from sqlalchemy.exc import SQLAlchemyError
 from models.categories import Category
 from schemas.category import CategoryCreate
 from schemas.response_custom import ResponseSchema
+from services import search, stats
+from core.response_cache import bump_versions
 
 
 def create_category(category: CategoryCreate, db: Session) -> ResponseSchema:
@@ -13,6 +15,9 @@ def create_category(category: CategoryCreate, db: Session) -> ResponseSchema:
     try:
         new_category = Category(name=category.name)
         db.add(new_category)
+        db.flush()
+        stats.add_categories(db, [new_category.id])
+        bump_versions(db, "categories")
         db.commit()
         db.refresh(new_category)
 
@@ -63,8 +68,11 @@ def update_category(
                 detail="Category not found",
             )
         category_db.name = category.name
+        # Book payloads embed the category name
+        bump_versions(db, "categories", "books")
         db.commit()
         db.refresh(category_db)
+        search.book_index.invalidate()
 
     except SQLAlchemyError as e:
         db.rollback()
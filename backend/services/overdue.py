@@ -0,0 +1,163 @@
+import logging
+import os
+from datetime import date
+from typing import Literal, Optional
+
+from dotenv import load_dotenv
+from fastapi import HTTPException, status
+from sqlalchemy import and_, or_, select, update
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from config.database import SessionLocal, engine
+from core.scheduler import single_worker
+from models.book import Book
+from models.borrow import Borrows, BorrowStatus
+from models.user import User
+from schemas.borrow import (
+    OverdueBorrowResponse,
+    OverdueCountResponse,
+    OverdueScanResponse,
+)
+from schemas.response_custom import PaginatedResponseSchema, ResponseSchema
+from services.borrow import adjust_overdue_counts, decode_cursor, encode_cursor
+
+# Load environment variables
+load_dotenv()
+
+OVERDUE_SCAN_INTERVAL_SECONDS = int(os.getenv("OVERDUE_SCAN_INTERVAL_SECONDS", "3600"))
+
+logger = logging.getLogger("uvicorn.error")
+
+
+def mark_overdue(db: Session, today: Optional[date] = None) -> int:
+    # One set-based statement over the (status, due_date) index. The
+    # overdue_at IS NULL condition makes concurrent or repeated runs count
+    # each loan once.
+    today = today or date.today()
+    flagged = db.execute(
+        update(Borrows)
+        .where(
+            Borrows.status == BorrowStatus.borrowed,
+            Borrows.due_date < today,
+            Borrows.overdue_at.is_(None),
+        )
+        .values(overdue_at=today)
+        .returning(Borrows.user_id, Borrows.book_id)
+    ).all()
+    adjust_overdue_counts(db, flagged, 1)
+    db.commit()
+    return len(flagged)
+
+
+def run_overdue_scan():
+    with single_worker(engine, "overdue scan") as acquired:
+        if not acquired:
+            return
+        db = SessionLocal()
+        try:
+            flagged = mark_overdue(db)
+            if flagged:
+                logger.info("Overdue scan flagged %d borrows", flagged)
+        finally:
+            db.close()
+
+
+def scan_overdue(db: Session) -> ResponseSchema:
+    try:
+        flagged = mark_overdue(db)
+        return ResponseSchema(
+            status="success",
+            message=f"Flagged {flagged} overdue borrows",
+            data=OverdueScanResponse(flagged=flagged),
+        )
+
+    except SQLAlchemyError as e:
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Database error: {str(e._message())}",
+        )
+
+
+def get_overdue(
+    db: Session, cursor: Optional[str] = None, limit: int = 100
+) -> PaginatedResponseSchema:
+    try:
+        # Computed from due_date rather than overdue_at so the listing is
+        # current even between job runs. Most overdue first.
+        today = date.today()
+        stmt = (
+            select(
+                Borrows.id.label("borrow_id"),
+                Book.title.label("book"),
+                User.name.label("user"),
+                Borrows.borrow_date,
+                Borrows.due_date,
+            )
+            .join(Book, Borrows.book_id == Book.id)
+            .join(User, Borrows.user_id == User.id)
+            .where(Borrows.status == BorrowStatus.borrowed, Borrows.due_date < today)
+        )
+        if cursor:
+            cursor_date, cursor_id = decode_cursor(cursor)
+            stmt = stmt.where(
+                or_(
+                    Borrows.due_date > cursor_date,
+                    and_(Borrows.due_date == cursor_date, Borrows.id > cursor_id),
+                )
+            )
+        rows = db.execute(
+            stmt.order_by(Borrows.due_date, Borrows.id).limit(limit + 1)
+        ).all()
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_cursor(rows[-1].due_date, rows[-1].borrow_id)
+
+        responses = [
+            OverdueBorrowResponse(
+                **row._asdict(), days_overdue=(today - row.due_date).days
+            )
+            for row in rows
+        ]
+        return PaginatedResponseSchema(
+            status="success",
+            message="Overdue borrows retrieved successfully",
+            data=responses,
+            next_cursor=next_cursor,
+        )
+
+    except SQLAlchemyError as e:
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Database error: {str(e._message())}",
+        )
+
+
+def get_overdue_counts(
+    db: Session, by: Literal["user", "book"] = "user", limit: int = 100
+) -> ResponseSchema:
+    try:
+        model, name = (User, User.name) if by == "user" else (Book, Book.title)
+        rows = db.execute(
+            select(model.id, name.label("name"), model.overdue_count)
+            .where(model.overdue_count > 0)
+            .order_by(model.overdue_count.desc(), model.id)
+            .limit(limit)
+        ).all()
+
+        return ResponseSchema(
+            status="success",
+            message=f"Overdue counts by {by}",
+            data=[OverdueCountResponse(**row._asdict()) for row in rows],
+        )
+
+    except SQLAlchemyError as e:
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Database error: {str(e._message())}",
+        )
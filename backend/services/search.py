@@ -0,0 +1,198 @@
+import os
+import re
+import threading
+from collections import defaultdict
+from typing import Optional
+
+from dotenv import load_dotenv
+from sqlalchemy import func, or_, select, union
+from sqlalchemy.orm import Session
+
+from config.database import SessionLocal
+from models.book import Book
+from models.categories import Category
+
+# Load environment variables
+load_dotenv()
+
+TRIGRAM_THRESHOLD = 0.3
+DEFAULT_LIMIT = 20
+# Ranked ids checked against the query's filters per round trip
+SEARCH_BATCH_SIZE = 500
+# Rebuild interval of a built fallback index, which bounds how long other
+# workers' catalog writes stay invisible to this one
+SEARCH_INDEX_REFRESH_SECONDS = int(os.getenv("SEARCH_INDEX_REFRESH_SECONDS", "300"))
+
+_token_re = re.compile(r"\w+", re.UNICODE)
+
+
+def tokenize(text: str) -> list[str]:
+    return _token_re.findall(text.lower()) if text else []
+
+
+def trigrams(token: str) -> set[str]:
+    padded = f"  {token} "
+    return {padded[i : i + 3] for i in range(len(padded) - 2)}
+
+
+def is_postgres(db: Session) -> bool:
+    return db.get_bind().dialect.name == "postgresql"
+
+
+class BookSearchIndex:
+    # In-process inverted index used when the database has no trigram support.
+    # token -> book ids, plus trigram -> tokens for typo tolerance.
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._ready = False
+        self._docs: dict[int, set[str]] = {}
+        self._postings: dict[str, set[int]] = defaultdict(set)
+        self._grams: dict[str, set[str]] = defaultdict(set)
+
+    @property
+    def ready(self) -> bool:
+        return self._ready
+
+    def build(self, db: Session):
+        rows = db.execute(
+            select(Book.id, Book.title, Book.author, Category.name).join(
+                Category, Book.category_id == Category.id
+            )
+        ).all()
+        with self._lock:
+            self._docs.clear()
+            self._postings.clear()
+            self._grams.clear()
+            for row in rows:
+                self._add(row[0], row[1], row[2], row[3])
+            self._ready = True
+
+    def ensure_built(self, db: Session):
+        if not self._ready:
+            self.build(db)
+
+    def invalidate(self):
+        with self._lock:
+            self._ready = False
+
+    def upsert(self, book_id: int, title: str, author: str, category_name: str):
+        if not self._ready:
+            return
+        with self._lock:
+            self._remove(book_id)
+            self._add(book_id, title, author, category_name)
+
+    def _add(self, book_id: int, title: str, author: str, category_name: str):
+        tokens = set(tokenize(title) + tokenize(author) + tokenize(category_name))
+        self._docs[book_id] = tokens
+        for token in tokens:
+            self._postings[token].add(book_id)
+            for gram in trigrams(token):
+                self._grams[gram].add(token)
+
+    def _remove(self, book_id: int):
+        # Trigram entries are left in place; they only point at tokens and
+        # stale tokens resolve to empty posting lists.
+        for token in self._docs.pop(book_id, ()):
+            postings = self._postings.get(token)
+            if postings is not None:
+                postings.discard(book_id)
+                if not postings:
+                    del self._postings[token]
+
+    def _similar_tokens(self, token: str) -> dict[str, float]:
+        grams = trigrams(token)
+        counts: dict[str, int] = defaultdict(int)
+        for gram in grams:
+            for candidate in self._grams.get(gram, ()):
+                counts[candidate] += 1
+        matches = {}
+        for candidate, shared in counts.items():
+            score = shared / len(grams | trigrams(candidate))
+            if candidate.startswith(token):
+                score = max(score, 0.5)
+            if score >= TRIGRAM_THRESHOLD:
+                matches[candidate] = score
+        return matches
+
+    def search(self, term: str, limit: Optional[int] = DEFAULT_LIMIT) -> list[int]:
+        scores: dict[int, float] = defaultdict(float)
+        with self._lock:
+            for token in tokenize(term):
+                best: dict[int, float] = {}
+                for candidate, score in self._similar_tokens(token).items():
+                    if candidate == token:
+                        score = 1.0
+                    for book_id in self._postings.get(candidate, ()):
+                        if score > best.get(book_id, 0):
+                            best[book_id] = score
+                for book_id, score in best.items():
+                    scores[book_id] += score
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))
+        return [book_id for book_id, _ in ranked[:limit]]
+
+
+book_index = BookSearchIndex()
+
+
+def refresh_search_index():
+    # Only an index some search has built is kept fresh; PostgreSQL never
+    # builds one
+    if not book_index.ready:
+        return
+    db = SessionLocal()
+    try:
+        book_index.build(db)
+    finally:
+        db.close()
+
+
+def candidate_ids(term: str):
+    # Ids of books matching `term`, one branch per table so each can use its
+    # own trigram indexes (an OR across the join forces a scan of books)
+    pattern = f"%{term}%"
+    matching_categories = select(Category.id).where(
+        or_(Category.name.op("%")(term), Category.name.ilike(pattern))
+    )
+    return union(
+        select(Book.id).where(
+            or_(
+                Book.title.op("%")(term),
+                Book.author.op("%")(term),
+                Book.title.ilike(pattern),
+                Book.author.ilike(pattern),
+            )
+        ),
+        select(Book.id).where(Book.category_id.in_(matching_categories)),
+    )
+
+
+def search_books(db: Session, query, term: str, limit: int = DEFAULT_LIMIT) -> list[Book]:
+    # `query` is a Book query already joined with Category and carrying any
+    # extra filters; this ranks it by relevance to `term`.
+    if is_postgres(db):
+        score = func.greatest(
+            func.similarity(Book.title, term),
+            func.similarity(Book.author, term),
+            func.similarity(Category.name, term),
+        )
+        return (
+            query.filter(Book.id.in_(candidate_ids(term)))
+            .order_by(score.desc(), Book.id)
+            .limit(limit)
+            .all()
+        )
+
+    # Every match is ranked, then the query's filters are applied batch by
+    # batch until `limit` books pass them
+    book_index.ensure_built(db)
+    ids = book_index.search(term, None)
+    results = []
+    for start in range(0, len(ids), SEARCH_BATCH_SIZE):
+        batch = ids[start : start + SEARCH_BATCH_SIZE]
+        books = {book.id: book for book in query.filter(Book.id.in_(batch)).all()}
+        results.extend(books[book_id] for book_id in batch if book_id in books)
+        if len(results) >= limit:
+            break
+    return results[:limit]
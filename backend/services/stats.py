@@ -0,0 +1,255 @@
+import os
+from collections import Counter
+from dotenv import load_dotenv
+from fastapi import HTTPException, status
+from sqlalchemy import case, func, insert, select, update
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from config.database import SessionLocal, engine
+from core.scheduler import single_worker
+from models.book import Book
+from models.borrow import BorrowArchive, Borrows, BorrowStatus
+from models.categories import Category
+from models.stats import BorrowStatusCount, CategoryStats
+from schemas.response_custom import ResponseSchema
+from schemas.stats import CategoryStatsResponse, LibraryStatsResponse, TopBookResponse
+
+# Load environment variables
+load_dotenv()
+
+DEFAULT_TOP_BOOKS = 10
+STATS_RECONCILE_INTERVAL_SECONDS = int(
+    os.getenv("STATS_RECONCILE_INTERVAL_SECONDS", "86400")
+)
+
+
+# Statement builders. They return plain statements so the sync and async
+# services can execute them inside their own transactions.
+
+
+def status_count_statement(deltas: dict[BorrowStatus, int]):
+    return (
+        update(BorrowStatusCount)
+        .where(BorrowStatusCount.status.in_(deltas))
+        .values(
+            count=BorrowStatusCount.count
+            + case(deltas, value=BorrowStatusCount.status, else_=0)
+        )
+    )
+
+
+def on_loan_statement(book_counts: dict[int, int]):
+    # Adds book_counts[book_id] to the on_loan total of each book's category
+    delta = (
+        select(func.sum(case(book_counts, value=Book.id, else_=0)))
+        .where(
+            Book.id.in_(book_counts),
+            Book.category_id == CategoryStats.category_id,
+        )
+        .scalar_subquery()
+    )
+    return (
+        update(CategoryStats)
+        .where(
+            CategoryStats.category_id.in_(
+                select(Book.category_id).where(Book.id.in_(book_counts))
+            )
+        )
+        .values(on_loan=CategoryStats.on_loan + delta)
+    )
+
+
+def catalog_statement(category_id: int, books: int, copies: int, on_loan: int = 0):
+    return (
+        update(CategoryStats)
+        .where(CategoryStats.category_id == category_id)
+        .values(
+            books=CategoryStats.books + books,
+            copies=CategoryStats.copies + copies,
+            on_loan=CategoryStats.on_loan + on_loan,
+        )
+    )
+
+
+def borrowed_statements(book_ids: list[int]) -> list:
+    # Book.borrow_count is bumped by the decrement statement itself
+    counts = Counter(book_ids)
+    return [
+        status_count_statement({BorrowStatus.borrowed: len(book_ids)}),
+        on_loan_statement(dict(counts)),
+    ]
+
+
+def returned_statements(count: int) -> list:
+    return [
+        status_count_statement(
+            {BorrowStatus.borrowed: -count, BorrowStatus.waiting_approve: count}
+        )
+    ]
+
+
+def approved_statements(book_ids: list[int]) -> list:
+    counts = Counter(book_ids)
+    return [
+        status_count_statement(
+            {
+                BorrowStatus.waiting_approve: -len(book_ids),
+                BorrowStatus.returned: len(book_ids),
+            }
+        ),
+        on_loan_statement({book_id: -count for book_id, count in counts.items()}),
+    ]
+
+
+def record(db: Session, statements: list):
+    # The caller owns the transaction and commits
+    for stmt in statements:
+        db.execute(stmt)
+
+
+def add_categories(db: Session, category_ids: list[int]):
+    if category_ids:
+        db.execute(
+            insert(CategoryStats),
+            [{"category_id": category_id} for category_id in category_ids],
+        )
+
+
+def reconcile_stats(db: Session):
+    # Recompute every counter from the source tables. Rows are updated in
+    # place rather than replaced so concurrent increments are not lost.
+    db.execute(
+        insert(CategoryStats).from_select(
+            ["category_id"],
+            select(Category.id).where(
+                Category.id.not_in(select(CategoryStats.category_id))
+            ),
+        )
+    )
+    in_category = Book.category_id == CategoryStats.category_id
+    db.execute(
+        update(CategoryStats).values(
+            books=select(func.count(Book.id)).where(in_category).scalar_subquery(),
+            copies=select(func.coalesce(func.sum(Book.quantity), 0))
+            .where(in_category)
+            .scalar_subquery(),
+            on_loan=select(
+                func.coalesce(func.sum(Book.quantity - Book.available_quantity), 0)
+            )
+            .where(in_category)
+            .scalar_subquery(),
+        )
+    )
+
+    existing = set(db.scalars(select(BorrowStatusCount.status)))
+    missing = [value for value in BorrowStatus if value not in existing]
+    if missing:
+        db.execute(
+            insert(BorrowStatusCount),
+            [{"status": value, "count": 0} for value in missing],
+        )
+    # Archived loans still count: archival moves rows, it does not end them
+    db.execute(
+        update(BorrowStatusCount).values(
+            count=select(func.count(Borrows.id))
+            .where(Borrows.status == BorrowStatusCount.status)
+            .scalar_subquery()
+            + select(func.count(BorrowArchive.id))
+            .where(BorrowArchive.status == BorrowStatusCount.status)
+            .scalar_subquery()
+        )
+    )
+
+    # Only rows that drifted are written, so the catalog is not locked wholesale
+    borrow_count = (
+        select(func.count(Borrows.id)).where(Borrows.book_id == Book.id).scalar_subquery()
+        + select(func.count(BorrowArchive.id))
+        .where(BorrowArchive.book_id == Book.id)
+        .scalar_subquery()
+    )
+    db.execute(
+        update(Book)
+        .where(Book.borrow_count != borrow_count)
+        .values(borrow_count=borrow_count)
+    )
+    db.commit()
+
+
+def run_stats_reconcile():
+    with single_worker(engine, "stats reconcile") as acquired:
+        if not acquired:
+            return
+        db = SessionLocal()
+        try:
+            reconcile_stats(db)
+        finally:
+            db.close()
+
+
+def get_stats(db: Session, top: int = DEFAULT_TOP_BOOKS) -> ResponseSchema:
+    try:
+        categories = [
+            CategoryStatsResponse(**row._asdict(), available=row.copies - row.on_loan)
+            for row in db.execute(
+                select(
+                    CategoryStats.category_id,
+                    Category.name,
+                    CategoryStats.books,
+                    CategoryStats.copies,
+                    CategoryStats.on_loan,
+                )
+                .join(Category, CategoryStats.category_id == Category.id)
+                .order_by(Category.name)
+            )
+        ]
+        borrow_status = dict.fromkeys(BorrowStatus, 0)
+        borrow_status.update(
+            db.execute(select(BorrowStatusCount.status, BorrowStatusCount.count)).all()
+        )
+        top_books = [
+            TopBookResponse(**row._asdict())
+            for row in db.execute(
+                select(Book.id, Book.title, Book.borrow_count)
+                .where(Book.borrow_count > 0)
+                .order_by(Book.borrow_count.desc(), Book.id)
+                .limit(top)
+            )
+        ]
+
+        copies = sum(category.copies for category in categories)
+        on_loan = sum(category.on_loan for category in categories)
+        response = LibraryStatsResponse(
+            books=sum(category.books for category in categories),
+            copies=copies,
+            on_loan=on_loan,
+            available=copies - on_loan,
+            category_count=len(categories),
+            categories=categories,
+            borrow_status=borrow_status,
+            top_books=top_books,
+        )
+        return ResponseSchema(
+            status="success",
+            message="Library stats",
+            data=response,
+        )
+
+    except SQLAlchemyError as e:
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Database error: {str(e._message())}",
+        )
+
+
+def reconcile(db: Session) -> ResponseSchema:
+    try:
+        reconcile_stats(db)
+    except SQLAlchemyError as e:
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Database error: {str(e._message())}",
+        )
+    return get_stats(db)
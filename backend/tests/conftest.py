@@ -0,0 +1,225 @@
+import os
+import shutil
+import tempfile
+
+# Optional PostgreSQL database for the plan and concurrency tests, which are
+# skipped without it. Its public schema is dropped and rebuilt on every run.
+TEST_POSTGRES_URL = os.getenv("TEST_POSTGRES_URL")
+
+# The app reads its configuration at import time, so point it at a throwaway
+# SQLite database before anything imports config.database
+TEST_DIR = tempfile.mkdtemp(prefix="library-tests-")
+PRIMARY_PATH = os.path.join(TEST_DIR, "primary.db")
+TEMPLATE_PATH = os.path.join(TEST_DIR, "template.db")
+
+os.environ["DATABASE_URL"] = f"sqlite:///{PRIMARY_PATH}"
+os.environ["SECRET_KEY"] = "test-secret"
+os.environ["DB_ASYNC"] = "false"
+os.environ["DB_REPLICA_URLS"] = ""
+os.environ["DB_AUTO_MIGRATE"] = "false"
+os.environ["BCRYPT_ROUNDS"] = "4"
+os.environ["SQL_METRICS"] = "false"
+os.environ["OVERDUE_SCAN_INTERVAL_SECONDS"] = "0"
+os.environ["STATS_RECONCILE_INTERVAL_SECONDS"] = "0"
+os.environ["BORROW_ARCHIVE_INTERVAL_SECONDS"] = "0"
+os.environ["TYPEAHEAD_REFRESH_SECONDS"] = "0"
+os.environ["SEARCH_INDEX_REFRESH_SECONDS"] = "0"
+
+import json
+
+import pytest
+from alembic import command
+from alembic.config import Config
+from fastapi import FastAPI, HTTPException
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+import config.database as database
+import main
+from benchmarks.seed import seed_dataset, user_email
+from core.exception_handlers import http_exception_handler
+from core.jwt import create_access_token
+from core.principal_cache import principal_cache
+from core.response_cache import response_cache
+from core.token_denylist import refresh_denylist
+from services.archive import archive_borrows
+from services.search import book_index
+from services.typeahead import typeahead_index
+
+
+@pytest.fixture(scope="session", autouse=True)
+def migrated_template():
+    # Migrate once; every test then starts from a copy of the result
+    database.run_migrations()
+    database.engine.dispose()
+    shutil.copyfile(PRIMARY_PATH, TEMPLATE_PATH)
+    yield
+    database.dispose_engines()
+    shutil.rmtree(TEST_DIR, ignore_errors=True)
+
+
+@pytest.fixture(autouse=True)
+def fresh_database(migrated_template):
+    database.engine.dispose()
+    shutil.copyfile(TEMPLATE_PATH, PRIMARY_PATH)
+
+    # Process-local state that would otherwise leak between tests
+    response_cache.clear()
+    principal_cache.clear()
+    refresh_denylist._entries.clear()
+    database.recent_writers._seen.clear()
+    book_index.invalidate()
+    typeahead_index.invalidate()
+    yield
+
+
+@pytest.fixture
+def db():
+    session = database.SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+@pytest.fixture
+def client():
+    return TestClient(main.app)
+
+
+@pytest.fixture
+def async_client(monkeypatch):
+    # The DB_ASYNC routers on an aiosqlite engine over the same database.
+    # One client context keeps every request on one event loop, which the
+    # pooled aiosqlite connections are bound to.
+    from routes import book_async, borrow_async
+
+    engine = create_async_engine(database.ASYNC_SQLALCHEMY_DATABASE_URL)
+    monkeypatch.setattr(
+        database,
+        "AsyncSessionLocal",
+        async_sessionmaker(engine, autoflush=False, expire_on_commit=False),
+    )
+    app = FastAPI()
+    app.add_exception_handler(HTTPException, http_exception_handler)
+    app.include_router(book_async.router, prefix="/api")
+    app.include_router(borrow_async.router, prefix="/api")
+    with TestClient(app) as client:
+        yield client
+        client.portal.call(engine.dispose)
+
+
+@pytest.fixture(params=["sync", "async"])
+def book_client(request, client):
+    # The book routes through the sync router and the DB_ASYNC one
+    if request.param == "sync":
+        return client
+    return request.getfixturevalue("async_client")
+
+
+@pytest.fixture
+def auth_headers():
+    # Users seeded by benchmarks.seed: user 1 is the admin
+    def headers(user_id: int) -> dict:
+        token = create_access_token({"sub": user_email(user_id), "id": user_id})
+        return {"Authorization": f"Bearer {token}"}
+
+    return headers
+
+
+@pytest.fixture
+def statements():
+    # SQL text of every statement the primary engine runs during the test
+    executed = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        executed.append(statement)
+
+    event.listen(database.engine, "before_cursor_execute", record)
+    yield executed
+    event.remove(database.engine, "before_cursor_execute", record)
+
+
+@pytest.fixture(scope="session")
+def postgres_engine():
+    if not TEST_POSTGRES_URL:
+        pytest.skip("TEST_POSTGRES_URL is not set")
+    engine = create_engine(TEST_POSTGRES_URL, pool_size=20, max_overflow=20)
+    try:
+        with engine.begin() as connection:
+            connection.execute(text("DROP SCHEMA public CASCADE"))
+            connection.execute(text("CREATE SCHEMA public"))
+    except OperationalError as e:
+        pytest.skip(f"PostgreSQL is unavailable: {e}")
+
+    config = Config(os.path.join(database.BASE_DIR, "alembic.ini"))
+    config.attributes["configure_logger"] = False
+    with engine.begin() as connection:
+        config.attributes["connection"] = connection
+        command.upgrade(config, "head")
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture(scope="session")
+def postgres_library(postgres_engine):
+    # A production-sized dataset, analyzed so the planner sees real row counts
+    session = sessionmaker(bind=postgres_engine)()
+    try:
+        seed_dataset(session, categories=20, books=60000, users=5000, borrows=300000)
+        archive_borrows(session)
+    finally:
+        session.close()
+    with postgres_engine.connect().execution_options(isolation_level="AUTOCOMMIT") as connection:
+        connection.execute(text("ANALYZE"))
+    return postgres_engine
+
+
+@pytest.fixture
+def postgres_db(postgres_library):
+    session = sessionmaker(bind=postgres_library, autoflush=False)()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+@pytest.fixture
+def postgres_plan(postgres_library):
+    # Plan nodes of a statement as the DBAPI received it, flattened
+    def plan(statement: str, parameters) -> list[dict]:
+        connection = postgres_library.raw_connection()
+        try:
+            cursor = connection.cursor()
+            cursor.execute(f"EXPLAIN (FORMAT JSON) {statement}", parameters)
+            (document,) = cursor.fetchone()
+        finally:
+            connection.rollback()
+            connection.close()
+        if isinstance(document, str):
+            document = json.loads(document)
+        nodes, pending = [], [document[0]["Plan"]]
+        while pending:
+            node = pending.pop()
+            nodes.append(node)
+            pending.extend(node.get("Plans", ()))
+        return nodes
+
+    return plan
+
+
+@pytest.fixture
+def postgres_statements(postgres_library):
+    # (statement, parameters) of every statement run on PostgreSQL in the test
+    executed = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if not executemany:
+            executed.append((statement, parameters))
+
+    event.listen(postgres_library, "before_cursor_execute", record)
+    yield executed
+    event.remove(postgres_library, "before_cursor_execute", record)
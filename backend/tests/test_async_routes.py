@@ -0,0 +1,58 @@
+import pytest
+
+from benchmarks.seed import seed_dataset
+from routes import book_async, borrow_async
+
+# The routes DB_ASYNC serves from AsyncSession; everything else stays sync
+ASYNC_ROUTES = {
+    ("GET", "/api/book/"),
+    ("POST", "/api/borrow/"),
+    ("GET", "/api/borrow/history"),
+    ("GET", "/api/borrow/current_borrow"),
+    ("GET", "/api/borrow/all_borrowed"),
+}
+
+
+def test_async_routers_cover_only_the_hot_routes():
+    served = {
+        (method, f"/api{route.path}")
+        for router in (book_async.router, borrow_async.router)
+        for route in router.routes
+        for method in route.methods
+    }
+
+    assert served == ASYNC_ROUTES
+
+
+@pytest.mark.parametrize(
+    "method, path",
+    [
+        ("PUT", "/api/borrow/return/1"),
+        ("PUT", "/api/borrow/approve_return/1"),
+        ("GET", "/api/book/search"),
+    ],
+)
+def test_other_routes_are_not_served_async(async_client, method, path):
+    assert async_client.request(method, path).status_code in (404, 405)
+
+
+def test_sync_routes_complete_an_async_borrow(db, client, async_client, auth_headers):
+    # A loan made through the async router is returned and approved through
+    # the sync ones, as a DB_ASYNC deployment serves it
+    seed_dataset(db, categories=1, books=1, users=2, borrows=0)
+
+    created = async_client.post(
+        "/api/borrow/", json={"book_id": 1, "due_date": "2100-01-01"}, headers=auth_headers(2)
+    )
+    assert created.status_code == 200
+    borrow_id = async_client.get(
+        "/api/borrow/current_borrow", headers=auth_headers(2)
+    ).json()["data"][0]["borrow_id"]
+
+    assert client.put(f"/api/borrow/return/{borrow_id}", headers=auth_headers(2)).status_code == 200
+    assert (
+        client.put(f"/api/borrow/approve_return/{borrow_id}", headers=auth_headers(1)).status_code
+        == 200
+    )
+    history = async_client.get("/api/borrow/history", headers=auth_headers(2)).json()["data"]
+    assert [row["borrow_id"] for row in history] == [borrow_id]
@@ -0,0 +1,59 @@
+import pytest
+from sqlalchemy import select
+
+from benchmarks.seed import seed_dataset
+from models.book import Book
+
+
+@pytest.fixture
+def library(db):
+    seed_dataset(db, categories=4, books=30, users=2, borrows=0)
+
+
+def test_normalized_shape_sends_each_category_once(library, book_client):
+    nested = book_client.get("/api/book/").json()["data"]
+
+    response = book_client.get("/api/book/", params={"shape": "normalized"})
+    data = response.json()["data"]
+
+    assert response.status_code == 200
+    categories = {category["id"]: category["name"] for category in data["categories"]}
+    assert len(categories) == len(data["categories"])
+    assert categories == {book["category"]["id"]: book["category"]["name"] for book in nested}
+    assert all("category" not in book for book in data["books"])
+    assert [
+        (book["id"], book["title"], categories[book["category_id"]]) for book in data["books"]
+    ] == [(book["id"], book["title"], book["category"]["name"]) for book in nested]
+
+
+def test_search_supports_the_normalized_shape(library, db, client):
+    term = db.scalar(select(Book.title).where(Book.id == 1)).split()[0]
+
+    nested = client.get("/api/book/search", params={"q": term}).json()["data"]
+    data = client.get("/api/book/search", params={"q": term, "shape": "normalized"}).json()["data"]
+
+    assert nested
+    assert [book["id"] for book in data["books"]] == [book["id"] for book in nested]
+    assert {category["id"] for category in data["categories"]} == {
+        book["category"]["id"] for book in nested
+    }
+
+
+@pytest.mark.parametrize("books", [5, 50])
+@pytest.mark.parametrize(
+    "shape, expected",
+    # The cache version lookup, then the listing's own queries
+    [(None, 2), ("normalized", 3)],
+)
+def test_listing_statements_do_not_grow_with_books(db, client, statements, books, shape, expected):
+    seed_dataset(db, categories=5, books=books, users=2, borrows=0)
+    statements.clear()
+
+    response = client.get("/api/book/", params={"shape": shape} if shape else {})
+
+    assert len(response.json()["data"]) > 0
+    assert len(statements) == expected, statements
+
+
+def test_unknown_shape_is_rejected(book_client):
+    assert book_client.get("/api/book/", params={"shape": "flat"}).status_code == 400
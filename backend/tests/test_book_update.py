@@ -0,0 +1,38 @@
+import pytest
+
+from benchmarks.seed import seed_dataset
+
+
+def book(**changes) -> dict:
+    return {"title": "Dune", "author": "Herbert", "year": 1965, "category_id": 1, **changes}
+
+
+@pytest.fixture
+def library(db):
+    seed_dataset(db, categories=1, books=2, users=2, borrows=0)
+
+
+def test_updating_a_missing_book_is_not_found(library, client, auth_headers):
+    response = client.put("/api/book/999", json=book(), headers=auth_headers(1))
+
+    assert response.status_code == 404
+    assert response.json()["message"] == "Book not found"
+
+
+def test_quantity_below_the_borrowed_count_is_rejected(library, client, auth_headers):
+    borrowed = client.post(
+        "/api/borrow/", json={"book_id": 1, "due_date": "2100-01-01"}, headers=auth_headers(2)
+    )
+    assert borrowed.status_code == 200
+
+    response = client.put("/api/book/1", json=book(quantity=0), headers=auth_headers(1))
+
+    assert response.status_code == 400
+    assert response.json()["message"] == "Cannot set quantity lower than borrowed count (1)"
+
+
+def test_update_changes_the_book(library, client, auth_headers):
+    response = client.put("/api/book/1", json=book(title="Renamed"), headers=auth_headers(1))
+
+    assert response.status_code == 200
+    assert response.json()["data"]["title"] == "Renamed"
@@ -0,0 +1,92 @@
+from datetime import date, timedelta
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import event, select
+
+import config.database as database
+from models.book import Book
+from models.borrow import Borrows, BorrowStatus
+from models.categories import Category
+from models.user import User
+from schemas.borrow import BulkApproveReturnRequest
+from services.borrow import approve_return_borrow, bulk_approve_return_borrow
+
+
+@pytest.fixture
+def waiting_borrow(db) -> int:
+    # One copy on loan with its return waiting for approval
+    db.add(Category(id=1, name="Fiction"))
+    db.add(
+        Book(id=1, category_id=1, title="Dune", author="Herbert", year=1965, quantity=2, available_quantity=1)
+    )
+    db.add(User(id=1, name="Reader", email="reader@test.com", password="x"))
+    db.add(
+        Borrows(
+            id=1,
+            book_id=1,
+            user_id=1,
+            due_date=date.today() + timedelta(days=7),
+            return_date=date.today(),
+            status=BorrowStatus.waiting_approve,
+        )
+    )
+    db.commit()
+    return 1
+
+
+def available(db) -> int:
+    db.expire_all()
+    return db.scalar(select(Book.available_quantity).where(Book.id == 1))
+
+
+def test_approve_returns_the_copy(db, waiting_borrow):
+    response = approve_return_borrow(waiting_borrow, db)
+
+    assert response.data.book == "Dune"
+    assert response.data.status == BorrowStatus.returned
+    assert available(db) == 2
+
+
+def test_single_approve_after_bulk_does_not_return_twice(db, waiting_borrow):
+    bulk_approve_return_borrow(BulkApproveReturnRequest(borrow_ids=[waiting_borrow]), db)
+
+    with pytest.raises(HTTPException) as error:
+        approve_return_borrow(waiting_borrow, db)
+
+    assert error.value.status_code == 404
+    assert available(db) == 2
+
+
+def test_bulk_approve_racing_a_single_approve_returns_once(db, waiting_borrow):
+    # Commits a bulk approval of the same borrow in another session just
+    # before the single approval's UPDATE reaches the database, the window a
+    # read-then-write approval would leave open
+    state = {"raced": False}
+
+    def race(conn, cursor, statement, parameters, context, executemany):
+        if state["raced"] or not statement.startswith("UPDATE borrows"):
+            return
+        state["raced"] = True
+        session = database.SessionLocal()
+        try:
+            bulk_approve_return_borrow(
+                BulkApproveReturnRequest(borrow_ids=[waiting_borrow]), session
+            )
+        finally:
+            session.close()
+
+    event.listen(database.engine, "before_cursor_execute", race)
+    try:
+        session = database.SessionLocal()
+        try:
+            with pytest.raises(HTTPException) as error:
+                approve_return_borrow(waiting_borrow, session)
+        finally:
+            session.close()
+    finally:
+        event.remove(database.engine, "before_cursor_execute", race)
+
+    assert state["raced"]
+    assert error.value.status_code == 404
+    assert available(db) == 2
@@ -0,0 +1,169 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+
+import httpx
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import event, func, select
+
+import config.database as database
+import main
+from config.database import get_db
+from models.book import Book
+from models.borrow import Borrows, BorrowStatus
+from models.categories import Category
+from models.user import User
+from schemas.borrow import BorrowCreate
+from schemas.user import Principal
+from services.borrow import create_borrow
+
+BORROWERS = 24
+COPIES = 5
+
+# The PostgreSQL run: distinct borrowers, some of whom send the same request
+# twice at once, racing for fewer copies than there are borrowers
+HTTP_BORROWERS = 250
+HTTP_DOUBLE_SENDERS = 50
+HTTP_COPIES = 100
+
+
+def test_parallel_borrows_never_oversell(db):
+    db.add(Category(id=1, name="Fiction"))
+    db.add(
+        Book(
+            id=1,
+            category_id=1,
+            title="Scarce",
+            author="Someone",
+            year=2000,
+            quantity=COPIES,
+            available_quantity=COPIES,
+        )
+    )
+    db.add_all(
+        User(id=i, name=f"User {i}", email=f"user{i}@test.com", password="x")
+        for i in range(1, BORROWERS + 1)
+    )
+    db.commit()
+
+    borrow = BorrowCreate(book_id=1, due_date=date.today() + timedelta(days=14))
+    start = threading.Barrier(BORROWERS)
+
+    def attempt(user_id: int) -> int:
+        user = Principal(
+            id=user_id, name=f"User {user_id}", email=f"user{user_id}@test.com", role="borrower"
+        )
+        session = database.SessionLocal()
+        try:
+            start.wait()
+            create_borrow(borrow, user, session)
+            return 200
+        except HTTPException as e:
+            return e.status_code
+        finally:
+            session.close()
+
+    with ThreadPoolExecutor(BORROWERS) as pool:
+        outcomes = list(pool.map(attempt, range(1, BORROWERS + 1)))
+
+    db.expire_all()
+    assert db.scalar(select(Book.available_quantity).where(Book.id == 1)) == 0
+    assert db.scalar(select(func.count()).select_from(Borrows)) == COPIES
+    assert outcomes.count(200) == COPIES
+    assert outcomes.count(400) == BORROWERS - COPIES
+
+
+def test_duplicate_insert_past_the_check_is_rejected(db):
+    # The same user's other request inserts its loan between this request's
+    # duplicate check and its insert; the partial unique index catches it
+    db.add(Category(id=1, name="Fiction"))
+    db.add(
+        Book(id=1, category_id=1, title="Dune", author="Someone", year=2000, quantity=3, available_quantity=3)
+    )
+    db.add(User(id=1, name="User 1", email="user1@test.com", password="x"))
+    db.commit()
+    user = Principal(id=1, name="User 1", email="user1@test.com", role="borrower")
+    borrow = BorrowCreate(book_id=1, due_date=date.today() + timedelta(days=14))
+    state = {"raced": False}
+
+    def race(conn, cursor, statement, parameters, context, executemany):
+        if state["raced"] or not statement.startswith("UPDATE books"):
+            return
+        state["raced"] = True
+        other = database.SessionLocal()
+        try:
+            create_borrow(borrow, user, other)
+        finally:
+            other.close()
+
+    event.listen(database.engine, "before_cursor_execute", race)
+    try:
+        with pytest.raises(HTTPException) as rejected:
+            create_borrow(borrow, user, db)
+    finally:
+        event.remove(database.engine, "before_cursor_execute", race)
+
+    assert state["raced"]
+    assert rejected.value.status_code == 400
+    db.expire_all()
+    assert db.scalar(select(func.count()).select_from(Borrows)) == 1
+    assert db.scalar(select(Book.available_quantity).where(Book.id == 1)) == 2
+
+
+def test_concurrent_http_borrows_on_postgres(postgres_db, auth_headers):
+    book = Book(
+        category_id=1,
+        title="Concurrency",
+        author="Someone",
+        year=2000,
+        quantity=HTTP_COPIES,
+        available_quantity=HTTP_COPIES,
+    )
+    postgres_db.add(book)
+    postgres_db.commit()
+    book_id = book.id
+
+    def postgres_session():
+        session = database.SessionLocal(bind=postgres_db.get_bind())
+        try:
+            yield session
+        finally:
+            session.close()
+
+    # User 1 is the admin; every other seeded user may borrow
+    senders = list(range(2, HTTP_BORROWERS + 2))
+    senders += senders[:HTTP_DOUBLE_SENDERS]
+    payload = {"book_id": book_id, "due_date": str(date.today() + timedelta(days=14))}
+
+    async def storm() -> list[int]:
+        transport = httpx.ASGITransport(app=main.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            responses = await asyncio.gather(
+                *(
+                    client.post("/api/borrow/", json=payload, headers=auth_headers(user_id))
+                    for user_id in senders
+                )
+            )
+        return [response.status_code for response in responses]
+
+    main.app.dependency_overrides[get_db] = postgres_session
+    try:
+        outcomes = asyncio.run(storm())
+    finally:
+        main.app.dependency_overrides.pop(get_db)
+
+    postgres_db.expire_all()
+    available = postgres_db.scalar(select(Book.available_quantity).where(Book.id == book_id))
+    loans = postgres_db.execute(
+        select(Borrows.user_id, func.count())
+        .where(Borrows.book_id == book_id, Borrows.status != BorrowStatus.returned)
+        .group_by(Borrows.user_id)
+    ).all()
+
+    assert set(outcomes) <= {200, 400}
+    assert outcomes.count(200) == HTTP_COPIES
+    assert available == HTTP_COPIES - outcomes.count(200) == 0
+    assert len(loans) == HTTP_COPIES
+    assert all(count == 1 for _, count in loans)
@@ -0,0 +1,75 @@
+import json
+from datetime import date, timedelta
+
+import pytest
+from sqlalchemy import func, select
+
+from benchmarks.seed import seed_dataset
+from models.borrow import Borrows, BorrowStatus
+from models.user import User
+from schemas.user import Principal
+from services import borrow as services
+from services.archive import archive_borrows
+
+
+def principal(db, user_id: int) -> Principal:
+    row = db.execute(
+        select(User.id, User.name, User.email, User.role).where(User.id == user_id)
+    ).one()
+    return Principal.model_validate(row)
+
+
+def busiest_user(db) -> int:
+    return db.scalar(
+        select(Borrows.user_id)
+        .group_by(Borrows.user_id)
+        .order_by(func.count().desc(), Borrows.user_id)
+        .limit(1)
+    )
+
+
+def listing(db, name: str, user: Principal):
+    if name == "get_borrow":
+        return services.get_borrow(user, db, limit=500)
+    if name == "current_borrow":
+        return services.current_borrow(user, db)
+    return services.history_borrow(user, db, limit=500)
+
+
+@pytest.mark.parametrize("name", ["get_borrow", "current_borrow", "history_borrow"])
+@pytest.mark.parametrize("borrows", [20, 400])
+def test_listing_runs_one_statement_regardless_of_rows(db, statements, name, borrows):
+    seed_dataset(db, categories=3, books=20, users=3, borrows=borrows)
+    user = principal(db, busiest_user(db))
+    statements.clear()
+
+    response = listing(db, name, user)
+
+    assert len(json.loads(response.body)["data"]) > 0
+    assert len(statements) == 1, statements
+
+
+def test_archived_loans_stay_in_history(db, book_client, auth_headers):
+    seed_dataset(db, categories=3, books=20, users=3, borrows=400)
+    user_id = busiest_user(db)
+    returned = db.scalar(
+        select(func.count())
+        .select_from(Borrows)
+        .where(Borrows.user_id == user_id, Borrows.status == BorrowStatus.returned)
+    )
+    assert archive_borrows(db, today=date.today() + timedelta(days=3650)) > 0
+
+    current = book_client.get("/api/borrow/current_borrow", headers=auth_headers(user_id))
+    history = book_client.get(
+        "/api/borrow/history", params={"limit": 500}, headers=auth_headers(user_id)
+    )
+
+    assert all(row["status"] != "returned" for row in current.json()["data"])
+    assert len(history.json()["data"]) == returned
+
+
+def test_all_borrowed_is_admin_only(db, book_client, auth_headers):
+    seed_dataset(db, categories=1, books=5, users=2, borrows=10)
+
+    assert book_client.get("/api/borrow/all_borrowed", headers=auth_headers(2)).status_code == 403
+    assert book_client.get("/api/borrow/all_borrowed", headers=auth_headers(1)).status_code == 200
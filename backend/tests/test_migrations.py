@@ -0,0 +1,41 @@
+import os
+
+import pytest
+from alembic import command
+from alembic.autogenerate import compare_metadata
+from alembic.config import Config
+from alembic.migration import MigrationContext
+from sqlalchemy import create_engine, inspect
+
+import config.database as database
+
+# The tables Base.metadata.create_all built before the move to Alembic
+BASELINE_TABLES = {"books", "borrows", "categories", "users"}
+
+
+@pytest.fixture
+def scratch_engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'migrations.db'}")
+    yield engine
+    engine.dispose()
+
+
+def upgrade(engine, revision: str):
+    config = Config(os.path.join(database.BASE_DIR, "alembic.ini"))
+    config.attributes["configure_logger"] = False
+    with engine.begin() as connection:
+        config.attributes["connection"] = connection
+        command.upgrade(config, revision)
+
+
+def test_initial_revision_is_the_create_all_schema(scratch_engine):
+    upgrade(scratch_engine, "0001")
+
+    assert set(inspect(scratch_engine).get_table_names()) == BASELINE_TABLES | {"alembic_version"}
+
+
+def test_head_matches_the_models(scratch_engine):
+    upgrade(scratch_engine, "head")
+
+    with scratch_engine.connect() as connection:
+        assert compare_metadata(MigrationContext.configure(connection), database.Base.metadata) == []
@@ -0,0 +1,48 @@
+import time
+
+import pytest
+from sqlalchemy import delete, text, update
+
+from benchmarks.seed import seed_dataset
+from core import principal_cache as cache_module
+from core.principal_cache import principal_cache
+from models.user import User
+
+ADMIN_ONLY = "/api/borrow/all_borrowed"
+
+
+@pytest.fixture
+def library(db):
+    seed_dataset(db, categories=1, books=1, users=2, borrows=0)
+
+
+def test_bulk_role_change_is_reflected(db, library, client, auth_headers):
+    assert client.get(ADMIN_ONLY, headers=auth_headers(2)).status_code == 403
+
+    db.execute(update(User).where(User.id == 2).values(role="admin"))
+    db.commit()
+
+    assert client.get(ADMIN_ONLY, headers=auth_headers(2)).status_code == 200
+
+
+def test_bulk_delete_signs_the_user_out(db, library, client, auth_headers):
+    assert client.get("/api/borrow/current_borrow", headers=auth_headers(2)).status_code == 200
+
+    db.execute(delete(User).where(User.id == 2))
+    db.commit()
+
+    assert client.get("/api/borrow/current_borrow", headers=auth_headers(2)).status_code == 401
+
+
+def test_writes_outside_the_orm_apply_after_the_ttl(db, library, client, auth_headers, monkeypatch):
+    # What another worker's change looks like to this process
+    assert client.get(ADMIN_ONLY, headers=auth_headers(2)).status_code == 403
+    db.execute(text("UPDATE users SET role = 'admin' WHERE id = 2"))
+    db.commit()
+
+    assert client.get(ADMIN_ONLY, headers=auth_headers(2)).status_code == 403
+
+    later = time.monotonic() + principal_cache.ttl + 1
+    monkeypatch.setattr(cache_module.time, "monotonic", lambda: later)
+
+    assert client.get(ADMIN_ONLY, headers=auth_headers(2)).status_code == 200
@@ -0,0 +1,160 @@
+import re
+from datetime import date, timedelta
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import event, select
+
+import config.database as database
+from benchmarks.seed import seed_dataset
+from models.borrow import BorrowStatus
+from models.user import User
+from schemas.borrow import BorrowCreate, BulkApproveReturnRequest
+from schemas.user import Principal
+from services import borrow as services
+from services.archive import archive_borrows
+from services.book import get_books_by_query
+from services.overdue import mark_overdue
+from services.search import book_index
+
+# A plan step reading a whole table. Index scans are reported as
+# "SCAN borrows USING [COVERING] INDEX ..." and are fine.
+FULL_SCAN = re.compile(r"^SCAN (?:TABLE )?(\w+)$")
+
+# Tables bounded by design rather than by traffic (one row per category, per
+# borrow status or per cached resource), where reading them whole is the
+# cheapest plan
+LOOKUP_TABLES = {"categories", "category_stats", "borrow_status_counts", "cache_versions"}
+
+BOOK_ID = 3
+USER_ID = 2
+# Matches a handful of titles (book ids containing it) at any dataset size
+SEARCH_TERM = "1487"
+DUE_WINDOW = (date.today(), date.today() + timedelta(days=30))
+
+HOT_PATHS = {
+    "current_borrow": lambda db, user: services.current_borrow(user, db),
+    # Recent returns in borrows UNION ALL the archive
+    "history_borrow": lambda db, user: services.history_borrow(user, db),
+    "all_borrowed": lambda db, user: services.get_borrow(user, db),
+    "all_borrowed by status": lambda db, user: services.get_borrow(
+        user, db, borrow_status=BorrowStatus.borrowed
+    ),
+    "all_borrowed by user": lambda db, user: services.get_borrow(user, db, user_id=user.id),
+    "all_borrowed by book": lambda db, user: services.get_borrow(user, db, book_id=BOOK_ID),
+    "all_borrowed by due date": lambda db, user: services.get_borrow(
+        user, db, borrow_status=BorrowStatus.borrowed, due_from=DUE_WINDOW[0], due_to=DUE_WINDOW[1]
+    ),
+    "create_borrow": lambda db, user: services.create_borrow(
+        BorrowCreate(book_id=BOOK_ID, due_date=date.today() + timedelta(days=14)), user, db
+    ),
+    "bulk approve by book": lambda db, user: services.bulk_approve_return_borrow(
+        BulkApproveReturnRequest(book_ids=[BOOK_ID]), db
+    ),
+    "bulk approve by id": lambda db, user: services.bulk_approve_return_borrow(
+        BulkApproveReturnRequest(borrow_ids=[1, 2, 3]), db
+    ),
+    "overdue scan": lambda db, user: mark_overdue(db),
+    "search": lambda db, user: get_books_by_query(db, q=SEARCH_TERM),
+}
+
+
+def principal(db) -> Principal:
+    return Principal.model_validate(
+        db.execute(
+            select(User.id, User.name, User.email, User.role).where(User.id == USER_ID)
+        ).one()
+    )
+
+
+def run(path: str, db, user: Principal):
+    try:
+        HOT_PATHS[path](db, user)
+    except HTTPException:
+        # e.g. create_borrow on a book the user already holds; the lookup ran
+        pass
+
+
+def explain(statement: str, parameters) -> list[str]:
+    # On a raw DBAPI connection, so the EXPLAIN itself is not captured
+    connection = database.engine.raw_connection()
+    try:
+        plan = connection.cursor().execute(f"EXPLAIN QUERY PLAN {statement}", parameters)
+        return [detail for *_, detail in plan.fetchall()]
+    finally:
+        connection.close()
+
+
+def full_scans(statement: str, parameters) -> list[str]:
+    # Subqueries and CTEs show up as SCAN <alias>; only real tables count
+    return [
+        detail
+        for detail in explain(statement, parameters)
+        if (match := FULL_SCAN.match(detail))
+        and match.group(1) in database.Base.metadata.tables
+        and match.group(1) not in LOOKUP_TABLES
+    ]
+
+
+def seq_scans(nodes: list[dict]) -> list[str]:
+    return [
+        node["Relation Name"]
+        for node in nodes
+        if node["Node Type"] == "Seq Scan" and node["Relation Name"] not in LOOKUP_TABLES
+    ]
+
+
+@pytest.fixture
+def sqlite_library(db):
+    seed_dataset(db, categories=3, books=2000, users=5, borrows=2000)
+    # Older returns move to the archive, so history reads both tables
+    archive_borrows(db)
+    # The SQLite search index is built from one full read, once per process
+    book_index.ensure_built(db)
+
+
+@pytest.fixture
+def statements_with_parameters():
+    # (statement, parameters) of every statement the primary runs
+    executed = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if not executemany:
+            executed.append((statement, parameters))
+
+    event.listen(database.engine, "before_cursor_execute", record)
+    yield executed
+    event.remove(database.engine, "before_cursor_execute", record)
+
+
+@pytest.mark.parametrize("path", HOT_PATHS)
+def test_hot_path_does_not_scan_tables(db, sqlite_library, statements_with_parameters, path):
+    user = principal(db)
+    statements_with_parameters.clear()
+
+    run(path, db, user)
+
+    assert statements_with_parameters
+    for statement, parameters in statements_with_parameters:
+        assert full_scans(statement, parameters) == [], statement
+
+
+@pytest.mark.parametrize("path", HOT_PATHS)
+def test_hot_path_does_not_seq_scan_on_postgres(postgres_db, postgres_statements, postgres_plan, path):
+    user = principal(postgres_db)
+    postgres_statements.clear()
+
+    run(path, postgres_db, user)
+
+    assert postgres_statements
+    for statement, parameters in postgres_statements:
+        assert seq_scans(postgres_plan(statement, parameters)) == [], statement
+
+
+def test_full_scan_is_detected():
+    assert full_scans("SELECT id FROM borrows WHERE return_date = ?", (date.today(),)) == [
+        "SCAN borrows"
+    ]
+    assert full_scans("SELECT id FROM books WHERE year = ?", (2000,)) == ["SCAN books"]
+    assert full_scans("SELECT id FROM categories WHERE name = ?", ("x",)) == []
+
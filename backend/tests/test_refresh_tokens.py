@@ -0,0 +1,67 @@
+import pytest
+
+from core.token_denylist import refresh_denylist
+from models.user import User
+from services.auth import issue_tokens
+
+
+@pytest.fixture
+def user(db) -> User:
+    user = User(id=1, name="Reader", email="reader@test.com", password="x")
+    db.add(user)
+    db.commit()
+    return user
+
+
+def login(db, user: User) -> str:
+    tokens = issue_tokens(user, db)
+    db.commit()
+    return tokens["refresh_token"]
+
+
+@pytest.fixture
+def refresh_token(db, user) -> str:
+    return login(db, user)
+
+
+def refresh(client, token: str):
+    return client.post("/api/auth/refresh", json={"refresh_token": token})
+
+
+def test_refresh_rotates_the_token(client, refresh_token):
+    response = refresh(client, refresh_token)
+
+    assert response.status_code == 200
+    assert response.json()["data"]["refresh_token"] != refresh_token
+    assert refresh(client, response.json()["data"]["refresh_token"]).status_code == 200
+
+
+@pytest.mark.parametrize("same_worker", [True, False], ids=["deny-listed", "other-worker"])
+def test_replay_after_theft_revokes_the_family(client, refresh_token, same_worker):
+    # The owner rotates the token; the thief then replays the stolen original
+    rotated = refresh(client, refresh_token).json()["data"]["refresh_token"]
+    if not same_worker:
+        # A worker that never saw the rotation has no deny-list entry
+        refresh_denylist._entries.clear()
+
+    assert refresh(client, refresh_token).status_code == 401
+    # Neither the owner's nor the thief's chain can continue
+    assert refresh(client, rotated).status_code == 401
+
+
+def test_replay_keeps_other_devices_signed_in(client, db, user, refresh_token):
+    laptop = login(db, user)
+    refresh(client, refresh_token)
+
+    # The phone's stolen token is replayed; only the phone's chain is revoked
+    assert refresh(client, refresh_token).status_code == 401
+
+    rotated = refresh(client, laptop)
+    assert rotated.status_code == 200
+    assert refresh(client, rotated.json()["data"]["refresh_token"]).status_code == 200
+
+
+def test_logout_revokes_the_token(client, refresh_token):
+    assert client.post("/api/auth/logout", json={"refresh_token": refresh_token}).status_code == 200
+
+    assert refresh(client, refresh_token).status_code == 401
@@ -0,0 +1,139 @@
+import os
+import shutil
+import sqlite3
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.ext.asyncio import create_async_engine
+
+import config.database as database
+from benchmarks.seed import seed_dataset
+from config.replica import ReplicaPool
+from core.response_cache import response_cache
+from models.book import Book
+
+PRIMARY_PATH = database.engine.url.database
+TEST_DIR = os.path.dirname(PRIMARY_PATH)
+NEW_BOOK = {"title": "New", "author": "Someone", "year": 2001, "quantity": 1, "category_id": 1}
+
+
+def make_replica(name: str) -> str:
+    # A stand-in replica: a copy of the primary whose first book is renamed
+    # to `name`, so each response shows which database served it
+    path = os.path.join(TEST_DIR, f"{name}.db")
+    shutil.copyfile(PRIMARY_PATH, path)
+    with sqlite3.connect(path) as connection:
+        connection.execute("UPDATE books SET title = ? WHERE id = 1", (name,))
+    return f"sqlite:///{path}"
+
+
+@pytest.fixture
+def replica_urls(db):
+    seed_dataset(db, categories=2, books=5, users=2, borrows=10)
+    database.engine.dispose()
+    urls = [make_replica("replica-a"), make_replica("replica-b")]
+    yield urls
+    for url in urls:
+        os.remove(url.removeprefix("sqlite:///"))
+
+
+@pytest.fixture
+def replicas(monkeypatch, replica_urls):
+    # Installs a pool over the given replica URLs, both stand-ins by default
+    engines = []
+
+    def use(urls: list[str] = replica_urls) -> ReplicaPool:
+        pool = ReplicaPool([create_engine(url) for url in urls])
+        engines.extend(pool.engines)
+        monkeypatch.setattr(database, "replicas", pool)
+        return pool
+
+    yield use
+    for engine in engines:
+        engine.dispose()
+
+
+def first_title(client, **kwargs) -> str:
+    # The book list is cached by table versions, which every copy shares
+    response_cache.clear()
+    response = client.get("/api/book/", **kwargs)
+    assert response.status_code == 200
+    return next(book["title"] for book in response.json()["data"] if book["id"] == 1)
+
+
+def test_reads_round_robin_over_replicas(client, replicas):
+    replicas()
+
+    assert [first_title(client) for _ in range(4)] == [
+        "replica-a",
+        "replica-b",
+        "replica-a",
+        "replica-b",
+    ]
+
+
+def test_read_primary_header_skips_replicas(client, replicas, db):
+    replicas()
+    primary = db.get(Book, 1).title
+
+    assert first_title(client, headers={"X-Read-Primary": "1"}) == primary
+
+
+def test_writers_read_their_writes_from_the_primary(client, replicas, auth_headers):
+    replicas()
+    headers = auth_headers(1)
+
+    assert first_title(client, headers=headers) == "replica-a"
+    assert client.post("/api/book/", json=NEW_BOOK, headers=headers).status_code == 200
+
+    response_cache.clear()
+    titles = [book["title"] for book in client.get("/api/book/", headers=headers).json()["data"]]
+    assert "New" in titles
+    assert first_title(client) == "replica-b"
+
+
+def test_dead_replica_falls_through(client, replicas, replica_urls):
+    missing = f"sqlite:///{os.path.join(TEST_DIR, 'missing', 'replica.db')}"
+    pool = replicas([missing, replica_urls[1]])
+
+    assert [first_title(client) for _ in range(3)] == ["replica-b"] * 3
+    assert [replica["healthy"] for replica in pool.status()] == [False, True]
+
+
+def test_all_borrowed_reads_from_replicas(client, replicas, auth_headers):
+    pool = replicas()
+    served = []
+    for name, engine in zip(("replica-a", "replica-b"), pool.engines):
+        event.listen(engine, "before_cursor_execute", lambda *args, name=name: served.append(name))
+
+    for _ in range(2):
+        assert client.get("/api/borrow/all_borrowed", headers=auth_headers(1)).status_code == 200
+
+    assert set(served) == {"replica-a", "replica-b"}
+
+
+def test_async_reads_use_replicas(async_client, replicas, replica_urls, monkeypatch, auth_headers):
+    replicas()
+    async_engines = [create_async_engine(database.async_url(url)) for url in replica_urls]
+    monkeypatch.setattr(database, "async_replicas", async_engines)
+    served = []
+    for name, engine in zip(("replica-a", "replica-b"), async_engines):
+        event.listen(
+            engine.sync_engine,
+            "before_cursor_execute",
+            lambda *args, name=name: served.append(name),
+        )
+    try:
+        assert [first_title(async_client) for _ in range(2)] == ["replica-a", "replica-b"]
+
+        served.clear()
+        for path in (
+            "/api/borrow/history",
+            "/api/borrow/current_borrow",
+            "/api/borrow/all_borrowed",
+        ):
+            assert async_client.get(path, headers=auth_headers(1)).status_code == 200
+        assert served and set(served) == {"replica-a", "replica-b"}
+    finally:
+        for engine in async_engines:
+            async_client.portal.call(engine.dispose)
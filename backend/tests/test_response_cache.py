@@ -0,0 +1,42 @@
+import pytest
+
+from benchmarks.seed import seed_dataset
+
+
+@pytest.fixture
+def library(db):
+    seed_dataset(db, categories=2, books=10, users=2, borrows=5)
+
+
+def test_book_list_revalidates_with_etag(library, book_client):
+    first = book_client.get("/api/book/")
+    etag = first.headers["etag"]
+
+    assert first.status_code == 200
+    assert len(first.json()["data"]) == 10
+
+    revalidated = book_client.get("/api/book/", headers={"If-None-Match": etag})
+
+    assert revalidated.status_code == 304
+    assert revalidated.headers["etag"] == etag
+
+
+def test_book_write_changes_the_etag(library, book_client, client, auth_headers):
+    etag = book_client.get("/api/book/").headers["etag"]
+
+    response = client.post(
+        "/api/book/",
+        json={"title": "New", "author": "Someone", "year": 2001, "quantity": 1, "category_id": 1},
+        headers=auth_headers(1),
+    )
+    assert response.status_code == 200
+
+    fresh = book_client.get("/api/book/", headers={"If-None-Match": etag})
+
+    assert fresh.status_code == 200
+    assert fresh.headers["etag"] != etag
+    assert len(fresh.json()["data"]) == 11
+
+
+def test_sync_and_async_routes_share_entries(library, client, async_client):
+    assert client.get("/api/book/").headers["etag"] == async_client.get("/api/book/").headers["etag"]
@@ -0,0 +1,19 @@
+import config.database as database
+from core.scheduler import single_worker
+
+
+def test_other_backends_always_run_the_job():
+    with single_worker(database.engine, "borrow archive") as acquired:
+        assert acquired
+
+
+def test_only_one_worker_holds_a_job_on_postgres(postgres_engine):
+    with single_worker(postgres_engine, "borrow archive") as first:
+        with single_worker(postgres_engine, "borrow archive") as second:
+            assert first
+            assert not second
+        with single_worker(postgres_engine, "stats reconcile") as other:
+            assert other
+
+    with single_worker(postgres_engine, "borrow archive") as again:
+        assert again
@@ -0,0 +1,82 @@
+from models.book import Book
+from models.categories import Category
+from services import search
+from services.book import get_books_by_query
+
+
+def add_books(db, category_id: int, titles: list[str]):
+    for title in titles:
+        db.add(
+            Book(
+                category_id=category_id,
+                title=title,
+                author="Someone",
+                year=2000,
+                quantity=1,
+                available_quantity=1,
+            )
+        )
+    db.commit()
+
+
+def titles(response) -> list[str]:
+    return [book.title for book in response.data]
+
+
+def test_filters_apply_before_the_limit(db):
+    db.add_all([Category(id=1, name="Fiction"), Category(id=2, name="Travel")])
+    add_books(db, 1, [f"Ocean Tales {i}" for i in range(30)])
+    add_books(db, 2, ["Ocean Routes"])
+
+    # The Travel book ranks after every Fiction book and was cut by the limit
+    response = get_books_by_query(db, category_name="Travel", q="ocean", limit=5)
+
+    assert titles(response) == ["Ocean Routes"]
+
+
+def test_filtered_search_fills_the_limit_past_one_batch(db, monkeypatch):
+    monkeypatch.setattr(search, "SEARCH_BATCH_SIZE", 4)
+    db.add_all([Category(id=1, name="Fiction"), Category(id=2, name="Travel")])
+    add_books(db, 1, [f"River Song {i}" for i in range(10)])
+    add_books(db, 2, [f"River Walk {i}" for i in range(6)])
+
+    response = get_books_by_query(db, category_name="Travel", q="river", limit=5)
+
+    assert titles(response) == [f"River Walk {i}" for i in range(5)]
+
+
+def test_refresh_picks_up_books_written_by_other_workers(db):
+    db.add(Category(id=1, name="Fiction"))
+    add_books(db, 1, ["Winter Light"])
+    assert titles(get_books_by_query(db, q="winter")) == ["Winter Light"]
+
+    # Committed elsewhere, so this process's index was never upserted
+    add_books(db, 1, ["Winter Garden"])
+    assert titles(get_books_by_query(db, q="garden")) == []
+
+    search.refresh_search_index()
+
+    assert titles(get_books_by_query(db, q="garden")) == ["Winter Garden"]
+
+
+def test_name_filters_are_not_capped_by_default(db):
+    db.add(Category(id=1, name="Fiction"))
+    add_books(db, 1, [f"Harbour Lights {i}" for i in range(30)])
+
+    assert len(get_books_by_query(db, book_name="Harbour").data) == 30
+    assert len(get_books_by_query(db, category_name="Fiction").data) == 30
+    assert len(get_books_by_query(db, category_name="Fiction", limit=7).data) == 7
+
+
+def test_postgres_search_uses_the_trigram_indexes(postgres_db, postgres_statements, postgres_plan):
+    response = get_books_by_query(postgres_db, q="48213")
+    assert response.data
+
+    statement, parameters = next(
+        (statement, parameters) for statement, parameters in postgres_statements if "similarity" in statement
+    )
+    nodes = postgres_plan(statement, parameters)
+
+    index_scans = {node.get("Index Name") for node in nodes if node["Node Type"] == "Bitmap Index Scan"}
+    assert {"ix_books_title_trgm", "ix_books_author_trgm"} <= index_scans, nodes
+    assert not [node for node in nodes if node["Node Type"] == "Seq Scan" and node["Relation Name"] == "books"]
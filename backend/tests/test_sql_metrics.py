@@ -0,0 +1,42 @@
+import pytest
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.exc import OperationalError
+
+from core import sql_metrics
+from core.sql_metrics import RequestMetrics, current_metrics
+
+
+@pytest.fixture
+def engine():
+    engine = create_engine("sqlite://")
+    # instrument_engine is a no-op with SQL_METRICS=false in the tests
+    event.listen(engine, "before_cursor_execute", sql_metrics.before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", sql_metrics.after_cursor_execute)
+    yield engine
+    engine.dispose()
+
+
+def test_statements_are_counted_and_timed(engine):
+    metrics = RequestMetrics()
+    token = current_metrics.set(metrics)
+    try:
+        with engine.connect() as connection:
+            connection.execute(text("SELECT 1"))
+            connection.execute(text("SELECT 2"))
+    finally:
+        current_metrics.reset(token)
+
+    assert metrics.statements == 2
+    assert metrics.db_time > 0
+
+
+def test_failed_statements_leave_no_state_on_the_connection(engine):
+    with engine.connect() as connection:
+        before = dict(connection.info)
+        for _ in range(3):
+            with pytest.raises(OperationalError):
+                connection.execute(text("SELECT * FROM missing"))
+            connection.rollback()
+
+        assert dict(connection.info) == before
+        assert connection.execute(text("SELECT 1")).scalar() == 1
@@ -0,0 +1,122 @@
+import pytest
+
+from benchmarks.seed import user_email
+from models.book import Book
+from models.categories import Category
+from models.user import User
+from services.typeahead import TypeaheadIndex, typeahead_index
+
+BOOKS = [
+    # id, title, author, borrow_count
+    (1, "Dune", "Frank Herbert", 5),
+    (2, "Dune Messiah", "Frank Herbert", 40),
+    (3, "Children of Dune", "Frank Herbert", 40),
+    (4, "Café Society", "Dunham Reyes", 1),
+    (5, "The Left Hand of Darkness", "Ursula Le Guin", 12),
+]
+
+
+@pytest.fixture
+def catalog(db):
+    db.add(Category(id=1, name="Fiction"))
+    db.add(User(id=1, name="Admin", email=user_email(1), password="x", role="admin"))
+    for book_id, title, author, borrow_count in BOOKS:
+        db.add(
+            Book(
+                id=book_id,
+                category_id=1,
+                title=title,
+                author=author,
+                year=1970,
+                quantity=1,
+                available_quantity=1,
+                borrow_count=borrow_count,
+            )
+        )
+    db.commit()
+
+
+@pytest.fixture
+def index(db, catalog) -> TypeaheadIndex:
+    index = TypeaheadIndex()
+    index.build(db)
+    return index
+
+
+def ids(suggestions: list[dict]) -> list[int]:
+    return [suggestion["id"] for suggestion in suggestions]
+
+
+def test_prefix_matches_rank_by_popularity_then_id(index):
+    # Title and author tokens both match; ties keep id order
+    assert ids(index.suggest("dun")) == [2, 3, 1, 4]
+
+
+def test_limit_stops_after_the_top_matches(index):
+    assert ids(index.suggest("dune", limit=2)) == [2, 3]
+
+
+def test_every_word_must_match(index):
+    assert ids(index.suggest("dune mess")) == [2]
+    assert ids(index.suggest("frank child")) == [3]
+    assert ids(index.suggest("dune darkness")) == []
+
+
+def test_matching_ignores_case_and_accents(index):
+    assert ids(index.suggest("CAFE")) == [4]
+    assert ids(index.suggest("café")) == [4]
+
+
+def test_blank_or_unknown_terms_suggest_nothing(index):
+    assert index.suggest("   ") == []
+    assert index.suggest("zzz") == []
+
+
+def test_upsert_replaces_the_tokens_of_a_book(index):
+    index.upsert(1, "Sandworms", "Frank Herbert", 100)
+
+    assert ids(index.suggest("dune")) == [2, 3]
+    assert ids(index.suggest("frank")) == [1, 2, 3]
+    assert ids(index.suggest("sand")) == [1]
+
+
+def test_upsert_before_build_is_ignored():
+    index = TypeaheadIndex()
+    index.upsert(1, "Dune", "Frank Herbert", 5)
+
+    assert not index.ready
+    assert index.suggest("dune") == []
+
+
+def test_invalidate_rebuilds_on_next_use(db, index):
+    db.add(
+        Book(id=6, category_id=1, title="Dune Road", author="Someone", year=2001, quantity=1, available_quantity=1)
+    )
+    db.commit()
+    index.invalidate()
+
+    index.ensure_built(db)
+
+    assert 6 in ids(index.suggest("dune"))
+
+
+def test_autocomplete_route_follows_catalog_writes(catalog, client, auth_headers):
+    response = client.get("/api/book/autocomplete", params={"q": "left"})
+    assert response.status_code == 200
+    assert response.json()["data"] == [
+        {"id": 5, "title": "The Left Hand of Darkness", "author": "Ursula Le Guin"}
+    ]
+    assert typeahead_index.ready
+
+    created = client.post(
+        "/api/book/",
+        json={"title": "Left Behind", "author": "Someone", "year": 2001, "quantity": 1, "category_id": 1},
+        headers=auth_headers(1),
+    )
+    assert created.status_code == 200
+
+    suggestions = client.get("/api/book/autocomplete", params={"q": "left"}).json()["data"]
+    assert [suggestion["title"] for suggestion in suggestions] == [
+        "The Left Hand of Darkness",
+        "Left Behind",
+    ]
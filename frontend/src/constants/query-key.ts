@@ -6,13 +6,19 @@ const queryKeyCategory = {
   GET_ALL_CATEGORY: "GET_ALL_CATEGORY",
 };
 
+const queryKeyStats = {
+  GET_STATS: "GET_STATS",
+};
+
 const querykeyBorrow = {
   GET_ACTIVE_BORROW :"GET_ACTIVE_BORROW",
-  GET_CURRENT_BORROW: "GET_CURRENT_BORROW"
+  GET_CURRENT_BORROW: "GET_CURRENT_BORROW",
+  GET_BORROW_HISTORY: "GET_BORROW_HISTORY"
 }
 
 export const querykey = {
   ...queryKeyBook,
   ...queryKeyCategory,
-  ...querykeyBorrow
+  ...querykeyBorrow,
+  ...queryKeyStats
 };
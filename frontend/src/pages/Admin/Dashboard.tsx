@@ -11,7 +11,8 @@ import {
   TableRow,
 } from "@/components/ui/table";
 
-import { useGetAllBook } from "@/services/hooks/useBook";
+import { useBookAvailability, useGetAllBook } from "@/services/hooks/useBook";
+import { useGetStats } from "@/services/hooks/useStats";
 import { BookModal } from "@/components/modals/BookModal";
 import type { TBookRes } from "@/types/book";
 
@@ -25,6 +26,8 @@ export const Dashboard = () => {
   );
 
   const { data: books = [], isLoading: loading } = useGetAllBook();
+  useBookAvailability();
+  const { data: stats } = useGetStats();
 
   useEffect(() => {
     const filtered = books.filter(
@@ -126,7 +129,7 @@ export const Dashboard = () => {
           <div className="flex items-center justify-between">
             <div>
               <p className="text-sm font-medium text-gray-600">Total Books</p>
-              <p className="text-2xl font-bold text-gray-900">{books.length}</p>
+              <p className="text-2xl font-bold text-gray-900">{stats?.books ?? 0}</p>
             </div>
             <div className="w-12 h-12 bg-blue-100 rounded-lg flex items-center justify-center">
               <BookOpen className="h-6 w-6 text-blue-600" />
@@ -140,7 +143,7 @@ export const Dashboard = () => {
                 Available for Loan
               </p>
               <p className="text-2xl font-bold text-green-600">
-                {books.reduce((sum, book) => sum + book.available_quantity, 0)}
+                {stats?.available ?? 0}
               </p>
             </div>
             <div className="w-12 h-12 bg-green-100 rounded-lg flex items-center justify-center">
@@ -155,11 +158,7 @@ export const Dashboard = () => {
                 Currently Borrowed
               </p>
               <p className="text-2xl font-bold text-orange-600">
-                {books.reduce(
-                  (sum, book) =>
-                    sum + (book.quantity - book.available_quantity),
-                  0
-                )}
+                {stats?.on_loan ?? 0}
               </p>
             </div>
             <div className="w-12 h-12 bg-orange-100 rounded-lg flex items-center justify-center">
@@ -172,7 +171,7 @@ export const Dashboard = () => {
             <div>
               <p className="text-sm font-medium text-gray-600">Categories</p>
               <p className="text-2xl font-bold text-purple-600">
-                {new Set(books.map((book) => book.category.name)).size}
+                {stats?.category_count ?? 0}
               </p>
             </div>
             <div className="w-12 h-12 bg-purple-100 rounded-lg flex items-center justify-center">
@@ -1,4 +1,4 @@
-import React, { useEffect, useState } from "react";
+import React, { useEffect, useMemo, useState } from "react";
 import {
   BookOpen,
   Search,
@@ -22,6 +22,7 @@ import {
   useGetActiveBorrow,
   useApproveReturn,
 } from "@/services/hooks/useBorrow";
+import { useGetStats } from "@/services/hooks/useStats";
 import type { TActiveBorrowResponse } from "@/types/borrow";
 
 export const ManageBorrow = () => {
@@ -31,9 +32,34 @@ export const ManageBorrow = () => {
   >([]);
   const [selectedStatus, setSelectedStatus] = useState<string>("all");
 
-  const { data: activeBorrows = [], isLoading: loading } = useGetActiveBorrow();
+  // The overdue option is matched on the loaded rows only
+  const serverStatus = ["borrowed", "waiting_approve", "returned"].includes(
+    selectedStatus
+  )
+    ? selectedStatus
+    : undefined;
+  const {
+    data,
+    isLoading: loading,
+    fetchNextPage,
+    hasNextPage,
+    isFetchingNextPage,
+  } = useGetActiveBorrow(serverStatus);
+  const activeBorrows = useMemo(
+    () => data?.pages.flatMap((page) => page.data) ?? [],
+    [data]
+  );
   const approveReturnMutation = useApproveReturn();
 
+  // Totals across every borrow, not only the pages loaded so far
+  const { data: stats } = useGetStats();
+  const countByStatus = (status: "borrowed" | "waiting_approve" | "returned") =>
+    stats?.borrow_status[status] ??
+    activeBorrows.filter((borrow) => borrow.status === status).length;
+  const totalBorrows = stats
+    ? Object.values(stats.borrow_status).reduce((sum, count) => sum + count, 0)
+    : activeBorrows.length;
+
   useEffect(() => {
     let filtered = activeBorrows.filter(
       (borrow) =>
@@ -156,7 +182,7 @@ export const ManageBorrow = () => {
             <div>
               <p className="text-sm font-medium text-gray-600">Total Borrows</p>
               <p className="text-2xl font-bold text-gray-900">
-                {activeBorrows.length}
+                {totalBorrows}
               </p>
             </div>
             <div className="w-12 h-12 bg-blue-100 rounded-lg flex items-center justify-center">
@@ -171,10 +197,7 @@ export const ManageBorrow = () => {
                 Currently Borrowed
               </p>
               <p className="text-2xl font-bold text-blue-600">
-                {
-                  activeBorrows.filter((borrow) => borrow.status === "borrowed")
-                    .length
-                }
+                {countByStatus("borrowed")}
               </p>
             </div>
             <div className="w-12 h-12 bg-blue-100 rounded-lg flex items-center justify-center">
@@ -189,10 +212,7 @@ export const ManageBorrow = () => {
                 Waiting Approval
               </p>
               <p className="text-2xl font-bold text-yellow-600">
-                {
-                  activeBorrows.filter((borrow) => borrow.status === "waiting_approve")
-                    .length
-                }
+                {countByStatus("waiting_approve")}
               </p>
             </div>
             <div className="w-12 h-12 bg-yellow-100 rounded-lg flex items-center justify-center">
@@ -205,10 +225,7 @@ export const ManageBorrow = () => {
             <div>
               <p className="text-sm font-medium text-gray-600">Returned</p>
               <p className="text-2xl font-bold text-green-600">
-                {
-                  activeBorrows.filter((borrow) => borrow.status === "returned")
-                    .length
-                }
+                {countByStatus("returned")}
               </p>
             </div>
             <div className="w-12 h-12 bg-green-100 rounded-lg flex items-center justify-center">
@@ -242,7 +259,7 @@ export const ManageBorrow = () => {
           </h2>
           <p className="text-sm text-gray-600">
             Showing {filteredBorrows.length} items from {activeBorrows.length}{" "}
-            total items
+            loaded items
           </p>
         </div>
 
@@ -345,6 +362,17 @@ export const ManageBorrow = () => {
             )}
           </TableBody>
         </Table>
+        {hasNextPage && (
+          <div className="flex justify-center px-6 py-4 border-t border-gray-200">
+            <Button
+              variant="outline"
+              onClick={() => fetchNextPage()}
+              disabled={isFetchingNextPage}
+            >
+              {isFetchingNextPage ? "Loading..." : "Load more"}
+            </Button>
+          </div>
+        )}
       </div>
     </div>
   );
@@ -1,5 +1,5 @@
 import React, { useState, useMemo } from "react";
-import { useGetAllBook } from "@/services/hooks/useBook";
+import { useBookAvailability, useGetAllBook } from "@/services/hooks/useBook";
 import { useBorrowBook } from "@/services/hooks/useBorrow";
 import { Button } from "@/components/ui/button";
 import { Badge } from "@/components/ui/badge";
@@ -9,6 +9,7 @@ import BorrowModal from "@/components/modals/BorrowModal";
 
 const BookList: React.FC = () => {
   const { data: books, isLoading, error } = useGetAllBook();
+  useBookAvailability();
   const borrowBookMutation = useBorrowBook();
   const [selectedBook, setSelectedBook] = useState<{ id: number; title: string } | null>(null);
   const [isModalOpen, setIsModalOpen] = useState(false);
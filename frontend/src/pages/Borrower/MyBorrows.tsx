@@ -1,5 +1,9 @@
-import React, { useState } from "react";
-import { useGetCurrentBorrow, useReturnBook } from "@/services/hooks/useBorrow";
+import React, { useMemo, useState } from "react";
+import {
+  useGetCurrentBorrow,
+  useGetHistory,
+  useReturnBook,
+} from "@/services/hooks/useBorrow";
 import { Badge } from "@/components/ui/badge";
 import { Button } from "@/components/ui/button";
 import {
@@ -20,7 +24,22 @@ import {
 import ReturnModal from "@/components/modals/ReturnModal";
 
 const MyBorrows: React.FC = () => {
-  const { data: borrows, isLoading, error } = useGetCurrentBorrow();
+  const { data: current, isLoading, error } = useGetCurrentBorrow();
+  // Returned loans come from the paged history, which also reads the archive
+  const {
+    data: history,
+    isLoading: historyLoading,
+    fetchNextPage,
+    hasNextPage,
+    isFetchingNextPage,
+  } = useGetHistory();
+  const borrows = useMemo(
+    () => [
+      ...(current ?? []),
+      ...(history?.pages.flatMap((page) => page.data) ?? []),
+    ],
+    [current, history]
+  );
   const returnBookMutation = useReturnBook();
   const [selectedBorrow, setSelectedBorrow] = useState<{
     id: string;
@@ -83,7 +102,7 @@ const MyBorrows: React.FC = () => {
     });
   };
 
-  if (isLoading) {
+  if (isLoading || historyLoading) {
     return (
       <div className="flex items-center justify-center min-h-screen">
         <Loader2 className="h-8 w-8 animate-spin" />
@@ -222,6 +241,17 @@ const MyBorrows: React.FC = () => {
             )}
           </TableBody>
         </Table>
+        {hasNextPage && (
+          <div className="flex justify-center px-6 py-4 border-t border-gray-200">
+            <Button
+              variant="outline"
+              onClick={() => fetchNextPage()}
+              disabled={isFetchingNextPage}
+            >
+              {isFetchingNextPage ? "Loading..." : "Load more"}
+            </Button>
+          </div>
+        )}
       </div>
 
       <ReturnModal
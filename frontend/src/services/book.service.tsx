@@ -1,12 +1,34 @@
 import axiosInstance from "./axios-instance";
 import type { TypeDataAPI } from "../types/api";
 
-import type { TBookRes, TBookCreate, TBookUpdate } from "@/types/book";
+import type {
+  TBookRes,
+  TBookCreate,
+  TBookUpdate,
+  TBookAvailability,
+} from "@/types/book";
 
 const APIPages = {
   GetAllBook: "/book",
   CreateBook: "/book",
   UpdateBook: "/book",
+  AvailabilityStream: "/book/availability/stream",
+};
+
+// Server-Sent Events stream of availability changes. "ready" fires on every
+// (re)connect; the caller should refetch then, since deltas may have been missed.
+export const subscribeBookAvailability = (handlers: {
+  onReady: () => void;
+  onChange: (changes: TBookAvailability[]) => void;
+}): EventSource => {
+  const source = new EventSource(
+    `${import.meta.env.VITE_BASE_URL}${APIPages.AvailabilityStream}`
+  );
+  source.addEventListener("ready", handlers.onReady);
+  source.addEventListener("availability", (event) => {
+    handlers.onChange(JSON.parse((event as MessageEvent).data));
+  });
+  return source;
 };
 
 export const fetchGetBookList: () => Promise<
@@ -1,5 +1,5 @@
 import axiosInstance from "./axios-instance";
-import type { TypeDataAPI } from "../types/api";
+import type { TypeDataAPI, TypePaginatedDataAPI } from "../types/api";
 import type {
   TActiveBorrowResponse,
   TReturnBorrowResponse,
@@ -13,19 +13,27 @@ import type {
 const APIPages = {
   GetActiveBorrow: "/borrow/all_borrowed",
   GetCurrentBorrow: "/borrow/current_borrow",
+  GetHistory: "/borrow/history",
   ApproveReturn: "/borrow/approve_return",
   BorrowBook: "/borrow",
   ReturnBook: "/borrow/return",
 };
 
-export const fetchGetActiveBorrowList: () => Promise<
-  TypeDataAPI<TActiveBorrowResponse[]>
-> = async () => {
+// One page, newest first; pass the previous page's next_cursor to continue
+export const fetchGetActiveBorrowList: (
+  cursor?: string,
+  status?: string
+) => Promise<TypePaginatedDataAPI<TActiveBorrowResponse[]>> = async (
+  cursor,
+  status
+) => {
   try {
-    const { data } = await axiosInstance.get(APIPages.GetActiveBorrow);
-    return data ?? { data: [] as TActiveBorrowResponse[] };
+    const { data } = await axiosInstance.get(APIPages.GetActiveBorrow, {
+      params: { cursor, status },
+    });
+    return data ?? { data: [] as TActiveBorrowResponse[], next_cursor: null };
   } catch (error) {
-    return { data: [] as TActiveBorrowResponse[] };
+    return { data: [] as TActiveBorrowResponse[], next_cursor: null };
   }
 };
 
@@ -40,6 +48,20 @@ export const fetchGetCurrentBorrow: () => Promise<
   }
 };
 
+// The user's returned loans, archived ones included, one page at a time
+export const fetchGetHistory: (
+  cursor?: string
+) => Promise<TypePaginatedDataAPI<TActiveBorrowResponse[]>> = async (cursor) => {
+  try {
+    const { data } = await axiosInstance.get(APIPages.GetHistory, {
+      params: { cursor },
+    });
+    return data ?? { data: [] as TActiveBorrowResponse[], next_cursor: null };
+  } catch (error) {
+    return { data: [] as TActiveBorrowResponse[], next_cursor: null };
+  }
+};
+
 export const fetchPutApproveReturn: (
   borrow_id: string
 ) => Promise<TypeDataAPI<TReturnBorrowResponse>> = async (borrow_id) => {
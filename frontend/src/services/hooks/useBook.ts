@@ -1,4 +1,5 @@
 // 1. Third-party libraries
+import { useEffect } from "react";
 import { useMutation, useQuery, useQueryClient } from "@tanstack/react-query";
 import { useNavigate } from "react-router-dom";
 
@@ -14,6 +15,7 @@ import {
   fetchGetBookList,
   fetchCreateBook,
   fetchUpdateBook,
+  subscribeBookAvailability,
 } from "../book.service";
 
 // 6. Constants
@@ -32,11 +34,38 @@ export const useGetAllBook = () => {
       }
       throw new Error(response.message || "Failed to fetch book list");
     },
-    staleTime: 60000,
+    // Kept fresh by useBookAvailability instead of refetching
+    staleTime: Infinity,
     refetchOnWindowFocus: false,
   });
 };
 
+// Patches available_quantity in the cached book list as changes are pushed
+export const useBookAvailability = () => {
+  const queryClient = useQueryClient();
+
+  useEffect(() => {
+    const source = subscribeBookAvailability({
+      onReady: () => {
+        queryClient.invalidateQueries({ queryKey: [querykey.GET_ALL_BOOK] });
+      },
+      onChange: (changes) => {
+        const available = new Map(
+          changes.map((change) => [change.book_id, change.available_quantity])
+        );
+        queryClient.setQueryData<TBookRes[]>([querykey.GET_ALL_BOOK], (books) =>
+          books?.map((book) =>
+            available.has(book.id)
+              ? { ...book, available_quantity: available.get(book.id)! }
+              : book
+          )
+        );
+      },
+    });
+    return () => source.close();
+  }, [queryClient]);
+};
+
 export const useCreateBook = () => {
   const queryClient = useQueryClient();
   const { setToastAlert } = useToast();
@@ -48,6 +77,7 @@ export const useCreateBook = () => {
       if (response.status === "success") {
         setToastAlert({ type: "success", message: "Book added successfully" });
         queryClient.invalidateQueries({ queryKey: [querykey.GET_ALL_BOOK] });
+        queryClient.invalidateQueries({ queryKey: [querykey.GET_STATS] });
       } else {
         // Check if it's an access denied error
         if (response.message === "Access denied") {
@@ -91,6 +121,7 @@ export const useUpdateBook = () => {
           message: "Book updated successfully",
         });
         queryClient.invalidateQueries({ queryKey: [querykey.GET_ALL_BOOK] });
+        queryClient.invalidateQueries({ queryKey: [querykey.GET_STATS] });
       } else {
         // Check if it's an access denied error
         if (response.message === "Access denied") {
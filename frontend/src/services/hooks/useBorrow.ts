@@ -1,5 +1,10 @@
 // 1. Third-party libraries
-import { useQuery, useMutation, useQueryClient } from "@tanstack/react-query";
+import {
+  useInfiniteQuery,
+  useQuery,
+  useMutation,
+  useQueryClient,
+} from "@tanstack/react-query";
 import { useNavigate } from "react-router-dom";
 
 // 2. Custom hooks
@@ -23,24 +28,28 @@ import {
   fetchBorrowBook,
   fetchReturnBook,
   fetchGetCurrentBorrow,
+  fetchGetHistory,
 } from "../borrow.service";
 
 // 6. Constants
 import { querykey } from "@/constants/query-key";
 
-export const useGetActiveBorrow = () => {
+// Pages of /borrow/all_borrowed; fetchNextPage follows next_cursor
+export const useGetActiveBorrow = (status?: string) => {
   const navigate = useNavigate();
-  return useQuery<TActiveBorrowResponse[], Error>({
-    queryKey: [querykey.GET_ACTIVE_BORROW],
-    queryFn: async () => {
-      const response = await fetchGetActiveBorrowList();
+  return useInfiniteQuery({
+    queryKey: [querykey.GET_ACTIVE_BORROW, status],
+    queryFn: async ({ pageParam }: { pageParam?: string }) => {
+      const response = await fetchGetActiveBorrowList(pageParam, status);
       if (response.status === "success") {
-        return response.data;
+        return response;
       } else {
         navigate("/");
       }
       throw new Error(response.message || "Failed to fetch active borrow list");
     },
+    initialPageParam: undefined as string | undefined,
+    getNextPageParam: (lastPage) => lastPage.next_cursor ?? undefined,
     staleTime: 60000,
     refetchOnWindowFocus: false,
   });
@@ -64,6 +73,27 @@ export const useGetCurrentBorrow = () => {
   });
 };
 
+// Pages of /borrow/history; fetchNextPage follows next_cursor
+export const useGetHistory = () => {
+  const navigate = useNavigate();
+  return useInfiniteQuery({
+    queryKey: [querykey.GET_BORROW_HISTORY],
+    queryFn: async ({ pageParam }: { pageParam?: string }) => {
+      const response = await fetchGetHistory(pageParam);
+      if (response.status === "success") {
+        return response;
+      } else {
+        navigate("/");
+      }
+      throw new Error(response.message || "Failed to fetch borrow history");
+    },
+    initialPageParam: undefined as string | undefined,
+    getNextPageParam: (lastPage) => lastPage.next_cursor ?? undefined,
+    staleTime: 60000,
+    refetchOnWindowFocus: false,
+  });
+};
+
 export const useApproveReturn = () => {
   const queryClient = useQueryClient();
   const { setToastAlert } = useToast();
@@ -80,6 +110,9 @@ export const useApproveReturn = () => {
         queryClient.invalidateQueries({
           queryKey: [querykey.GET_ACTIVE_BORROW],
         });
+        queryClient.invalidateQueries({
+          queryKey: [querykey.GET_STATS],
+        });
       } else {
         setToastAlert({
           type: "error",
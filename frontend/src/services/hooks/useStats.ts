@@ -0,0 +1,30 @@
+// 1. Third-party libraries
+import { useQuery } from "@tanstack/react-query";
+import { useNavigate } from "react-router-dom";
+
+// 4. Type
+import type { TStatsRes } from "@/types/stats";
+
+// 5. API functions
+import { fetchGetStats } from "../stats.service";
+
+// 6. Constants
+import { querykey } from "@/constants/query-key";
+
+export const useGetStats = () => {
+  const navigate = useNavigate();
+  return useQuery<TStatsRes | null, Error>({
+    queryKey: [querykey.GET_STATS],
+    queryFn: async () => {
+      const response = await fetchGetStats();
+      if (response.status === "success") {
+        return response.data;
+      } else {
+        navigate("/");
+      }
+      throw new Error(response.message || "Failed to fetch stats");
+    },
+    staleTime: 60000,
+    refetchOnWindowFocus: false,
+  });
+};
@@ -0,0 +1,19 @@
+import axiosInstance from "./axios-instance";
+import type { TypeDataAPI } from "../types/api";
+
+import type { TStatsRes } from "@/types/stats";
+
+const APIPages = {
+  GetStats: "/stats",
+};
+
+export const fetchGetStats: () => Promise<
+  TypeDataAPI<TStatsRes | null>
+> = async () => {
+  try {
+    const { data } = await axiosInstance.get(APIPages.GetStats);
+    return data ?? { data: null };
+  } catch (error) {
+    return { data: null };
+  }
+};
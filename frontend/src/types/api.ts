@@ -2,4 +2,8 @@ export interface TypeDataAPI<T> {
     status: 'success' | 'error';
     message: string,
     data: T
-}
\ No newline at end of file
+}
+
+export interface TypePaginatedDataAPI<T> extends TypeDataAPI<T> {
+    next_cursor: string | null
+}
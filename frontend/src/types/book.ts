@@ -21,6 +21,11 @@ export interface TBookRes {
     category_id: number
   }
 
+  export interface TBookAvailability {
+    book_id: number
+    available_quantity: number
+  }
+
   export interface TBookUpdate {
     id: number
     title: string
@@ -0,0 +1,25 @@
+export interface TCategoryStats {
+    category_id: number
+    name: string
+    books: number
+    copies: number
+    on_loan: number
+    available: number
+  }
+
+  export interface TTopBook {
+    id: number
+    title: string
+    borrow_count: number
+  }
+
+  export interface TStatsRes {
+    books: number
+    copies: number
+    on_loan: number
+    available: number
+    category_count: number
+    categories: TCategoryStats[]
+    borrow_status: Record<"returned" | "borrowed" | "waiting_approve", number>
+    top_books: TTopBook[]
+  }